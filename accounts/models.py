@@ -44,36 +44,10 @@ class User(AbstractUser):
         """Doğum tarihine göre burç hesapla"""
         if not self.birth_date:
             return None
-            
-        month = self.birth_date.month
-        day = self.birth_date.day
         
-        if (month == 3 and day >= 21) or (month == 4 and day <= 19):
-            return "aries"
-        elif (month == 4 and day >= 20) or (month == 5 and day <= 20):
-            return "taurus"
-        elif (month == 5 and day >= 21) or (month == 6 and day <= 20):
-            return "gemini"
-        elif (month == 6 and day >= 21) or (month == 7 and day <= 22):
-            return "cancer"
-        elif (month == 7 and day >= 23) or (month == 8 and day <= 22):
-            return "leo"
-        elif (month == 8 and day >= 23) or (month == 9 and day <= 22):
-            return "virgo"
-        elif (month == 9 and day >= 23) or (month == 10 and day <= 22):
-            return "libra"
-        elif (month == 10 and day >= 23) or (month == 11 and day <= 21):
-            return "scorpio"
-        elif (month == 11 and day >= 22) or (month == 12 and day <= 21):
-            return "sagittarius"
-        elif (month == 12 and day >= 22) or (month == 1 and day <= 19):
-            return "capricorn"
-        elif (month == 1 and day >= 20) or (month == 2 and day <= 18):
-            return "aquarius"
-        elif (month == 2 and day >= 19) or (month == 3 and day <= 20):
-            return "pisces"
-        
-        return None
+        from zodiac.sign_table import sign_for
+        sign = sign_for(self.birth_date.month, self.birth_date.day)
+        return sign.name_en.lower() if sign else None
 
     def get_daily_readings_count(self):
         """Bugünkü okuma sayısını döndür"""
@@ -0,0 +1,13 @@
+"""
+Blog arka plan görevleri (run_jobs worker'ı tarafından yürütülür)
+"""
+from tarot.jobs import register
+
+from .youtube_service import YouTubeService
+
+
+@register('blog.refresh_youtube_videos')
+def refresh_youtube_videos(max_results=6):
+    """YouTube video cache'ini API'den yenile"""
+    videos = YouTubeService().get_latest_videos(max_results=max_results)
+    return {'count': len(videos)}
@@ -72,8 +72,9 @@ class YouTubeService:
                 }
                 videos.append(video)
             
-            # Cache'e kaydet (1 saat)
+            # Cache'e kaydet (1 saat) - süresi dolmuş kopya 1 gün daha saklanır
             cache.set(cache_key, videos, 3600)
+            cache.set(f'{cache_key}_stale', videos, 86400)
             logger.info(f"{len(videos)} YouTube videosu getirildi")
             
             return videos
@@ -85,6 +86,22 @@ class YouTubeService:
             logger.error(f"YouTube servisi hatası: {str(e)}")
             return []
     
+    def get_cached_videos(self, max_results=6):
+        """
+        Videoları sadece cache'den getir, API çağrısı yapmaz
+        
+        Returns:
+            (videos, is_fresh) tuple - cache'de hiç yoksa (None, False)
+        """
+        if not self.api_key or not self.channel_id:
+            return [], True
+        
+        cache_key = f'youtube_videos_{self.channel_id}_{max_results}'
+        videos = cache.get(cache_key)
+        if videos:
+            return videos, True
+        return cache.get(f'{cache_key}_stale'), False
+    
     def get_channel_info(self):
         """Kanal bilgilerini getir"""
         if not self.api_key or not self.channel_id:
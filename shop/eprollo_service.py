@@ -21,6 +21,8 @@ import os
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
 
+from tarot.http_session import get_vendor_session
+
 
 class EprolloAPIService:
     """EPROLO API Integration - Complete Implementation"""
@@ -95,9 +97,9 @@ class EprolloAPIService:
         
         try:
             if method == 'GET':
-                response = requests.get(url, params=data, headers=headers, timeout=30)
+                response = get_vendor_session().get(url, params=data, headers=headers, timeout=30)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
+                response = get_vendor_session().post(url, json=data, headers=headers, timeout=30)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -14,6 +14,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.utils.text import slugify
 from django.db import transaction
 from decimal import Decimal
+from tarot import rate_limit
 from shop.models import Category, Product
 from shop.eprollo_service import EprolloAPIService
 import time
@@ -81,6 +82,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
         self.stdout.write("=" * 80)
         self.stdout.write(self.style.SUCCESS("🛍️  EPROLO PRODUCT IMPORT SYSTEM"))
         self.stdout.write("=" * 80)
@@ -3,6 +3,7 @@ Printify ürünlerini senkronize etme management command'ı
 """
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
+from tarot import rate_limit
 from shop.printify_service import PrintifyService
 from shop.models import Category, PrintifySettings
 
@@ -29,6 +30,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
         service = PrintifyService()
         
         # Bağlantı testi
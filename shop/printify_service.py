@@ -1,12 +1,12 @@
 """
 Printify API entegrasyon servisi
 """
-import requests
 import json
 from datetime import datetime, timezone
 from decimal import Decimal
 from django.conf import settings
 from django.utils import timezone as django_timezone
+from tarot.http_session import get_vendor_session
 from .models import PrintifySettings, PrintifySyncLog, Product, Category
 
 
@@ -24,11 +24,13 @@ class PrintifyAPI:
             'Content-Type': 'application/json',
             'User-Agent': 'DjTarot/1.0'
         }
+        # Bağlantı havuzu + Printify hız sınırı (tarot.rate_limit)
+        self.session = get_vendor_session()
     
     def test_connection(self):
         """API bağlantısını test et"""
         try:
-            response = requests.get(f"{self.base_url}/shops.json", headers=self.headers, timeout=30)
+            response = self.session.get(f"{self.base_url}/shops.json", headers=self.headers, timeout=30)
             return response.status_code == 200
         except Exception as e:
             print(f"Printify API bağlantı hatası: {e}")
@@ -37,7 +39,7 @@ class PrintifyAPI:
     def get_shops(self):
         """Mağazaları getir"""
         try:
-            response = requests.get(f"{self.base_url}/shops.json", headers=self.headers, timeout=30)
+            response = self.session.get(f"{self.base_url}/shops.json", headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -51,7 +53,7 @@ class PrintifyAPI:
         
         try:
             params = {'page': page, 'limit': limit}
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/shops/{shop_id}/products.json",
                 headers=self.headers,
                 params=params,
@@ -66,7 +68,7 @@ class PrintifyAPI:
     def get_product_details(self, shop_id, product_id):
         """Ürün detaylarını getir"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/shops/{shop_id}/products/{product_id}.json",
                 headers=self.headers,
                 timeout=30
@@ -80,7 +82,7 @@ class PrintifyAPI:
     def create_product(self, shop_id, product_data):
         """Yeni ürün oluştur"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/shops/{shop_id}/products.json",
                 headers=self.headers,
                 json=product_data,
@@ -95,7 +97,7 @@ class PrintifyAPI:
     def update_product(self, shop_id, product_id, product_data):
         """Ürünü güncelle"""
         try:
-            response = requests.put(
+            response = self.session.put(
                 f"{self.base_url}/shops/{shop_id}/products/{product_id}.json",
                 headers=self.headers,
                 json=product_data,
@@ -110,7 +112,7 @@ class PrintifyAPI:
     def publish_product(self, shop_id, product_id):
         """Ürünü yayınla"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/shops/{shop_id}/products/{product_id}/publish.json",
                 headers=self.headers,
                 json={"title": True, "description": True, "images": True, "variants": True, "tags": True, "keyFeatures": True, "shipping_template": True},
@@ -125,7 +127,7 @@ class PrintifyAPI:
     def get_blueprints(self):
         """Mevcut blueprint'leri getir"""
         try:
-            response = requests.get(f"{self.base_url}/catalog/blueprints.json", headers=self.headers, timeout=30)
+            response = self.session.get(f"{self.base_url}/catalog/blueprints.json", headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -135,7 +137,7 @@ class PrintifyAPI:
     def get_print_providers(self, blueprint_id):
         """Blueprint için print provider'ları getir"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/catalog/blueprints/{blueprint_id}/print_providers.json",
                 headers=self.headers,
                 timeout=30
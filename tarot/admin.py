@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django import forms
-from .models import TarotCard, TarotSpread, TarotReading, DailyCard, SiteSettings, HeroSection
+from .models import TarotCard, TarotSpread, TarotReading, DailyCard, SiteSettings, HeroSection, AIJob, CardMeaning, DailyCardInterpretation
+from . import jobs
 
 
 @admin.register(HeroSection)
@@ -196,6 +197,41 @@ class DailyCardAdmin(admin.ModelAdmin):
             'fields': ('user', 'card', 'date', 'is_reversed')
         }),
         ('Yorum', {
-            'fields': ('interpretation', 'ai_provider')
+            'fields': ('shared_interpretation', 'interpretation', 'ai_provider')
         }),
     )
+    raw_id_fields = ('shared_interpretation',)
+
+
+@admin.register(DailyCardInterpretation)
+class DailyCardInterpretationAdmin(admin.ModelAdmin):
+    """Kullanıcılar arasında paylaşılan günlük kart yorumları"""
+    list_display = ('card', 'is_reversed', 'language', 'date', 'ai_provider', 'created_at')
+    list_filter = ('language', 'is_reversed', 'date')
+    search_fields = ('card__name', 'interpretation')
+    date_hierarchy = 'date'
+    list_select_related = ('card',)
+
+
+@admin.register(CardMeaning)
+class CardMeaningAdmin(admin.ModelAdmin):
+    """Kart yorum kütüphanesi - build_card_meanings komutuyla üretilir"""
+    list_display = ('card', 'is_reversed', 'position', 'language', 'source', 'updated_at')
+    list_filter = ('language', 'is_reversed', 'source', 'card__suit')
+    search_fields = ('card__name', 'position', 'text')
+    list_select_related = ('card',)
+
+
+@admin.register(AIJob)
+class AIJobAdmin(admin.ModelAdmin):
+    """Arka plan AI işleri - dead-letter kayıtları buradan yeniden kuyruğa alınır"""
+    list_display = ('task', 'status', 'attempts', 'max_attempts', 'user', 'locked_by', 'run_after', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'key', 'last_error')
+    readonly_fields = ('id', 'created_at', 'updated_at', 'finished_at', 'locked_by', 'locked_at')
+    actions = ['requeue_jobs']
+    
+    @admin.action(description="🔁 Seçili başarısız işleri yeniden kuyruğa al")
+    def requeue_jobs(self, request, queryset):
+        count = jobs.requeue_dead(queryset)
+        self.message_user(request, f"{count} iş yeniden kuyruğa alındı.")
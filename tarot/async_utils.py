@@ -0,0 +1,31 @@
+"""
+Async view yardımcıları
+Django 5.0'da login_required async view'ları desteklemediği için
+AI çağrısı yapan async view'larda bu yardımcılar kullanılır.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import render
+
+
+def async_login_required(view_func):
+    """
+    Async view'lar için login_required
+
+    Kullanıcıyı async olarak yükler ve request.user'a atar; böylece view ve
+    template içinde request.user senkron DB sorgusu tetiklemez.
+    """
+    @wraps(view_func)
+    async def _wrapped_view(request, *args, **kwargs):
+        user = await request.auser()
+        request.user = user
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+# Template'ler lazy queryset/ilişki alanlarına eriştiği için render thread'de çalışır
+arender = sync_to_async(render)
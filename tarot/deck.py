@@ -0,0 +1,139 @@
+"""
+Süreç içi, salt okunur tarot destesi
+78 kart süreç başına bir kez yüklenir; kart çekimi ve prompt hazırlığı veritabanına
+gitmez. TarotCard kaydedildiğinde/silindiğinde paylaşılan cache'deki sürüm
+artırılır ve tüm worker'lar desteyi bir sonraki erişimde yeniden yükler.
+"""
+import threading
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'tarot:deck:version'
+
+
+class Card:
+    """TarotCard'ın değiştirilemez, hafif kopyası"""
+
+    __slots__ = (
+        'id', 'name', 'name_en', 'suit', 'number',
+        'upright_meaning', 'reversed_meaning', 'description', 'image_url',
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Card nesneleri değiştirilemez')
+
+    def __delattr__(self, name):
+        raise AttributeError('Card nesneleri değiştirilemez')
+
+    def __reduce__(self):
+        return (_rebuild_card, (tuple(getattr(self, name) for name in self.__slots__),))
+
+    def __eq__(self, other):
+        return isinstance(other, Card) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<Card {self.id}: {self.name}>"
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def pk(self):
+        return self.id
+
+    def meaning(self, is_reversed=False):
+        return self.reversed_meaning if is_reversed else self.upright_meaning
+
+
+def _rebuild_card(values):
+    return Card(**dict(zip(Card.__slots__, values)))
+
+
+class Deck:
+    """Kartlara id ve takım bazında erişim (salt okunur)"""
+
+    __slots__ = ('cards', 'by_id', 'by_suit', 'version')
+
+    def __init__(self, cards, version):
+        self.cards = tuple(cards)
+        self.by_id = {card.id: card for card in self.cards}
+        by_suit = {}
+        for card in self.cards:
+            by_suit.setdefault(card.suit, []).append(card)
+        self.by_suit = {suit: tuple(items) for suit, items in by_suit.items()}
+        self.version = version
+
+    def __len__(self):
+        return len(self.cards)
+
+    def get(self, card_id):
+        return self.by_id.get(int(card_id))
+
+    def suit(self, suit):
+        return self.by_suit.get(suit, ())
+
+
+_deck = None
+_lock = threading.Lock()
+
+
+def _current_version():
+    return cache.get(VERSION_KEY) or 0
+
+
+def _load(version):
+    from .models import TarotCard
+
+    rows = TarotCard.objects.order_by('suit', 'number', 'id').values(*Card.__slots__)
+    deck = Deck((Card(**row) for row in rows), version)
+    logger.info(f"🃏 Deste yüklendi: {len(deck)} kart (sürüm {version})")
+    return deck
+
+
+def get_deck():
+    """Süreç içi desteyi getir; sürüm değiştiyse yeniden yükle"""
+    global _deck
+
+    version = _current_version()
+    deck = _deck
+    if deck is not None and deck.version == version:
+        return deck
+
+    with _lock:
+        if _deck is None or _deck.version != version:
+            _deck = _load(version)
+        return _deck
+
+
+async def aget_deck():
+    """get_deck'in async versiyonu; yükleme gerekmedikçe thread'e geçmez"""
+    from asgiref.sync import sync_to_async
+
+    version = await cache.aget(VERSION_KEY) or 0
+    deck = _deck
+    if deck is not None and deck.version == version:
+        return deck
+    return await sync_to_async(get_deck)()
+
+
+def invalidate():
+    """Desteyi tüm süreçlerde geçersiz kıl (TarotCard.save/delete çağırır)"""
+    global _deck
+
+    if not cache.add(VERSION_KEY, 1, None):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+    with _lock:
+        _deck = None
@@ -0,0 +1,277 @@
+"""
+Paylaşımlı HTTP oturumu (connection pooling + keep-alive)
+Her istekte yeni TCP+TLS bağlantısı açmak yerine süreç genelinde tek bir
+requests.Session kullanılır. 429/5xx yanıtlarında ve bağlantı hatalarında
+retry/backoff yapılır; her deneme hız sınırlayıcıdan (rate_limit) yeniden token alır.
+Async view'lar için aynı davranışa sahip httpx.AsyncClient de sağlanır.
+"""
+import os
+import asyncio
+import threading
+import time
+import weakref
+import logging
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from decouple import config
+
+from .rate_limit import RateLimitedSession, httpx_request_hook, httpx_response_hook
+
+logger = logging.getLogger(__name__)
+
+# Bağlantı havuzu ayarları
+POOL_SIZE = config('OPENROUTER_POOL_SIZE', default=10, cast=int)
+MAX_RETRIES = config('OPENROUTER_MAX_RETRIES', default=3, cast=int)
+BACKOFF_FACTOR = config('OPENROUTER_BACKOFF_FACTOR', default=0.5, cast=float)
+CONNECT_TIMEOUT = config('OPENROUTER_CONNECT_TIMEOUT', default=5, cast=float)
+READ_TIMEOUT = config('OPENROUTER_READ_TIMEOUT', default=30, cast=float)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Bağlantı kurulum süresi thread bazında tutulur (connect() -> send() arası)
+_timing_local = threading.local()
+
+
+class _TimedConnectionMixin:
+    """connect() süresini ölçen urllib3 bağlantı mixin'i"""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _timing_local.connect = time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Bağlantı süresini ölçen connection pool adapter'ı"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def _build_session():
+    """
+    Havuzlu yeni bir Session oluştur
+
+    Adapter'da urllib3 Retry yoktur: adapter seviyesindeki tekrarlar hız
+    sınırlayıcıyı atlardı. Tekrarlar timed_request'te, her biri token alarak yapılır.
+    """
+    adapter = TimedHTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+    )
+
+    # Sağlayıcı kotaları (rate_limit) her istekte otomatik uygulanır
+    session = RateLimitedSession()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Süreç genelinde paylaşılan Session'ı getir
+
+    Gunicorn fork sonrası soketler paylaşılmasın diye PID değişince
+    yeni bir Session oluşturulur.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+                logger.info(f"🔌 Paylaşımlı HTTP session oluşturuldu (pool={POOL_SIZE}, retries={MAX_RETRIES})")
+    return _session
+
+
+_vendor_session = None
+_vendor_session_pid = None
+
+
+def get_vendor_session():
+    """
+    Mağaza/sosyal medya API'leri (EPROLO, Printify, Instagram) için paylaşılan Session
+
+    Otomatik retry yoktur (sipariş/ürün oluşturma gibi POST'lar tekrarlanmamalı);
+    yalnızca connection pooling ve sağlayıcı hız sınırı uygulanır.
+    """
+    global _vendor_session, _vendor_session_pid
+
+    pid = os.getpid()
+    if _vendor_session is None or _vendor_session_pid != pid:
+        with _session_lock:
+            if _vendor_session is None or _vendor_session_pid != pid:
+                session = RateLimitedSession()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _vendor_session = session
+                _vendor_session_pid = pid
+    return _vendor_session
+
+
+def timed_request(method, url, timeout=None, **kwargs):
+    """
+    Paylaşımlı session ile istek at, 429/5xx'te retry yap ve süreleri ölç
+
+    Returns:
+        (response, timing) tuple. timing: connect, ttfb ve total (saniye).
+        Bağlantı havuzdan yeniden kullanıldıysa connect 0.0 olur.
+    """
+    session = get_session()
+
+    for attempt in range(MAX_RETRIES + 1):
+        _timing_local.connect = 0.0
+        start = time.perf_counter()
+        try:
+            # RateLimitedSession.request her denemede sağlayıcıdan token alır
+            response = session.request(
+                method,
+                url,
+                timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT),
+                stream=True,
+                **kwargs
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt >= MAX_RETRIES:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            continue
+        # stream=True: header'lar okunduğunda döner -> ilk bayta kadar geçen süre
+        ttfb = time.perf_counter() - start
+        response.content  # gövdeyi oku, bağlantı havuza geri dönsün
+        total = time.perf_counter() - start
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+            time.sleep(_retry_delay(response, attempt))
+            continue
+
+        timing = {
+            'connect': round(_timing_local.connect, 4),
+            'ttfb': round(ttfb, 4),
+            'total': round(total, 4),
+            'reused_connection': _timing_local.connect == 0.0,
+        }
+        return response, timing
+
+
+# ============================================
+# Async istemci (ASGI view'ları için)
+# ============================================
+
+ASYNC_POOL_SIZE = config('OPENROUTER_ASYNC_POOL_SIZE', default=100, cast=int)
+
+# httpx.AsyncClient event loop'a bağlıdır; loop başına bir istemci tutulur
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """Çalışan event loop için paylaşılan httpx.AsyncClient'ı getir"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=ASYNC_POOL_SIZE,
+                max_keepalive_connections=ASYNC_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            http2=False,
+            event_hooks={
+                'request': [httpx_request_hook],
+                'response': [httpx_response_hook],
+            },
+        )
+        _async_clients[loop] = client
+        logger.info(f"🔌 Async HTTP client oluşturuldu (pool={ASYNC_POOL_SIZE})")
+    return client
+
+
+def _retry_delay(response, attempt):
+    """Retry-After header'ı varsa onu, yoksa üstel backoff süresini döndür"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return BACKOFF_FACTOR * (2 ** attempt)
+
+
+async def async_timed_request(method, url, timeout=None, **kwargs):
+    """
+    Paylaşılan AsyncClient ile istek at, 429/5xx'te retry yap ve süreleri ölç
+
+    Returns:
+        (response, timing) tuple - timed_request ile aynı format
+    """
+    client = get_async_client()
+    if timeout is not None:
+        kwargs['timeout'] = timeout
+
+    for attempt in range(MAX_RETRIES + 1):
+        connect = {'start': None, 'duration': 0.0}
+
+        async def trace(event_name, info):
+            # httpcore trace olayları: TCP + TLS kurulum süresi
+            if event_name == 'connection.connect_tcp.started':
+                connect['start'] = time.perf_counter()
+            elif event_name in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+                if connect['start'] is not None:
+                    connect['duration'] = time.perf_counter() - connect['start']
+
+        start = time.perf_counter()
+        try:
+            async with client.stream(method, url, extensions={'trace': trace}, **kwargs) as response:
+                ttfb = time.perf_counter() - start
+                await response.aread()
+        except httpx.TransportError:
+            if attempt >= MAX_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(None, attempt))
+            continue
+        total = time.perf_counter() - start
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+            await asyncio.sleep(_retry_delay(response, attempt))
+            continue
+
+        timing = {
+            'connect': round(connect['duration'], 4),
+            'ttfb': round(ttfb, 4),
+            'total': round(total, 4),
+            'reused_connection': connect['start'] is None,
+        }
+        return response, timing
@@ -0,0 +1,314 @@
+"""
+Arka plan iş kuyruğu
+Web istekleri AI işlerini AIJob tablosuna yazıp hemen döner; işleri
+`python manage.py run_jobs` worker süreçleri yürütür. Böylece web worker
+kapasitesi model gecikmesinden bağımsız olur.
+
+Görevler her uygulamanın tasks.py modülünde @register ile tanımlanır:
+
+    @register('zodiac.compatibility')
+    def compatibility(user_id, sign1_id, sign2_id):
+        ...
+        return {'redirect_url': ...}
+
+Görev fonksiyonu JSON'a çevrilebilir bir sonuç döndürür; hata fırlatırsa iş
+üstel backoff ile yeniden denenir, max_attempts aşılınca 'dead' olur.
+Yeniden denemenin anlamsız olduğu hatalar (ör. yetersiz bakiye) PermanentError
+ile fırlatılır; iş beklemeden 'dead' olur ve mesajı kullanıcıya gösterilir.
+"""
+import os
+import random
+import socket
+import time
+import logging
+import traceback
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan deneme sayısı ve backoff ayarları
+MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=3, cast=int)
+RETRY_BACKOFF = config('JOBS_RETRY_BACKOFF', default=10, cast=float)
+RETRY_BACKOFF_MAX = config('JOBS_RETRY_BACKOFF_MAX', default=600, cast=float)
+# Bu süreden uzun 'running' kalan iş (worker çökmüş) yeniden kuyruğa alınır
+LOCK_TIMEOUT = config('JOBS_LOCK_TIMEOUT', default=600, cast=int)
+# Worker yoksa (geliştirme ortamı) işleri enqueue anında çalıştır
+RUN_INLINE = config('JOBS_RUN_INLINE', default=False, cast=bool)
+
+_registry = {}
+_discovered = False
+
+
+class PermanentError(Exception):
+    """Yeniden denense de düzelmeyecek görev hatası; mesajı kullanıcıya gösterilir"""
+
+
+def register(name):
+    """Görev fonksiyonunu kuyruğa alınabilir olarak kaydet"""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    """Kayıtlı görevi getir; gerekirse tüm uygulamaların tasks.py'sini yükle"""
+    global _discovered
+    if name not in _registry and not _discovered:
+        autodiscover_modules('tasks')
+        _discovered = True
+    return _registry[name]
+
+
+def enqueue(task, payload=None, key='', user=None, max_attempts=None, delay=0, throttle=None):
+    """
+    İşi kuyruğa al
+
+    Args:
+        task: Kayıtlı görev adı (ör. 'tarot.create_reading')
+        payload: Görev fonksiyonuna keyword argüman olarak geçilecek dict (JSON)
+        key: Tekil anahtar - aynı anahtarlı bekleyen/çalışan iş varsa o döndürülür
+        user: İşin sahibi (durum sorgusu yalnızca sahibine açıktır)
+        delay: İşin en erken kaç saniye sonra çalışacağı
+        throttle: Verilirse aynı anahtar bu kadar saniye içinde bir kez kuyruğa
+            alınır (sık çağrılan sayfalarda her istekte DB'ye gitmemek için)
+
+    Returns:
+        AIJob veya throttle nedeniyle atlandıysa None
+    """
+    from .models import AIJob
+
+    if key and throttle and not cache.add(f"jobs:throttle:{key}", 1, throttle):
+        return None
+
+    if key:
+        existing = AIJob.objects.filter(key=key, status__in=AIJob.ACTIVE_STATUSES).first()
+        if existing:
+            return existing
+
+    try:
+        with transaction.atomic():
+            job = AIJob.objects.create(
+                task=task,
+                key=key,
+                payload=payload or {},
+                user=user,
+                max_attempts=max_attempts or MAX_ATTEMPTS,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        # Eşzamanlı bir istek aynı anahtarlı işi araya girip oluşturdu
+        # (tarot_aijob_active_key_uniq); onun işi döndürülür
+        existing = AIJob.objects.filter(key=key, status__in=AIJob.ACTIVE_STATUSES).first() if key else None
+        if existing is None:
+            raise
+        return existing
+
+    logger.info(f"📥 İş kuyruğa alındı: {task} ({job.id})")
+
+    if RUN_INLINE:
+        run_job(job, worker_id='inline')
+        job.refresh_from_db()
+    return job
+
+
+aenqueue = sync_to_async(enqueue)
+
+
+def _retry_delay(attempts):
+    """Üstel backoff + jitter (saniye)"""
+    delay = min(RETRY_BACKOFF * (2 ** (attempts - 1)), RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_next(worker_id):
+    """
+    Çalışma zamanı gelmiş bir işi atomik olarak sahiplen
+
+    Sahiplenme koşullu UPDATE ile yapılır; iki worker aynı işi seçse bile
+    yalnızca biri günceller. SQLite dahil tüm veritabanlarında çalışır.
+    """
+    from .models import AIJob
+
+    now = timezone.now()
+    candidates = AIJob.objects.filter(
+        status='pending',
+        run_after__lte=now
+    ).order_by('run_after').values_list('pk', flat=True)[:10]
+
+    for pk in candidates:
+        claimed = AIJob.objects.filter(pk=pk, status='pending').update(
+            status='running',
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AIJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job, worker_id):
+    """Sahiplenilmiş işi çalıştır ve sonucunu kaydet"""
+    from .models import AIJob
+
+    if job.status == 'pending':
+        # Inline çalıştırma: sahiplenme adımı atlanır
+        AIJob.objects.filter(pk=job.pk).update(
+            status='running', locked_by=worker_id, locked_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        job.refresh_from_db()
+
+    start = time.perf_counter()
+    try:
+        func = get_task(job.task)
+        result = func(**job.payload)
+    except PermanentError as e:
+        AIJob.objects.filter(pk=job.pk).update(
+            status='dead', result={'error': str(e)}, last_error=f"{e.__class__.__name__}: {e}",
+            locked_by='', locked_at=None, finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+        logger.warning(f"⛔ İş kalıcı hatayla sonlandı, yeniden denenmeyecek: {job.task} ({job.id}) - {e}")
+        return False
+    except Exception as e:
+        duration = time.perf_counter() - start
+        error = f"{e.__class__.__name__}: {e}\n{traceback.format_exc()}"
+
+        if job.attempts >= job.max_attempts:
+            AIJob.objects.filter(pk=job.pk).update(
+                status='dead', last_error=error, locked_by='', locked_at=None,
+                finished_at=timezone.now(), updated_at=timezone.now(),
+            )
+            logger.error(f"💀 İş dead-letter'a düştü: {job.task} ({job.id}) - {e}")
+        else:
+            delay = _retry_delay(job.attempts)
+            AIJob.objects.filter(pk=job.pk).update(
+                status='pending', last_error=error, locked_by='', locked_at=None,
+                run_after=timezone.now() + timedelta(seconds=delay), updated_at=timezone.now(),
+            )
+            logger.warning(
+                f"🔁 İş hatası, {delay:.0f}s sonra tekrar denenecek "
+                f"({job.attempts}/{job.max_attempts}): {job.task} ({job.id}) - {e} [{duration:.2f}s]"
+            )
+        return False
+
+    AIJob.objects.filter(pk=job.pk).update(
+        status='succeeded', result=result, locked_by='', locked_at=None,
+        finished_at=timezone.now(), updated_at=timezone.now(),
+    )
+    logger.info(f"✅ İş tamamlandı: {job.task} ({job.id}) [{time.perf_counter() - start:.2f}s]")
+    return True
+
+
+def requeue_stale():
+    """
+    Kilit süresi dolmuş 'running' işleri (çöken worker) kuyruğa geri al
+
+    Deneme hakkı bitmiş iş (ör. worker'ı her seferinde çökerten iş) kuyruğa
+    dönmez, 'dead' olur.
+    """
+    from .models import AIJob
+
+    now = timezone.now()
+    stale = AIJob.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT))
+
+    dead = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='dead', last_error='Worker iş bitmeden durdu (kilit süresi doldu)',
+        locked_by='', locked_at=None, finished_at=now, updated_at=now,
+    )
+    if dead:
+        logger.error(f"💀 {dead} takılı iş deneme hakkı bittiği için dead-letter'a düştü")
+
+    count = stale.filter(attempts__lt=F('max_attempts')).update(
+        status='pending', locked_by='', locked_at=None, run_after=now, updated_at=now,
+    )
+    if count:
+        logger.warning(f"⏰ {count} takılı iş yeniden kuyruğa alındı")
+    return count
+
+
+def requeue_dead(queryset):
+    """
+    Dead-letter işlerini deneme sayacını sıfırlayarak yeniden kuyruğa al
+
+    Aynı anahtarla aktif iş varsa o kayıt atlanır (tarot_aijob_active_key_uniq).
+    """
+    count = 0
+    for job in queryset.filter(status='dead'):
+        try:
+            with transaction.atomic():
+                count += type(job).objects.filter(pk=job.pk, status='dead').update(
+                    status='pending', attempts=0, last_error='', result=None, finished_at=None,
+                    run_after=timezone.now(),
+                )
+        except IntegrityError:
+            logger.warning(f"⚠️ Aynı anahtarlı aktif iş var, yeniden kuyruğa alınmadı: {job.task} ({job.id})")
+    return count
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def work(worker_id=None, poll_interval=1.0, burst=False, max_jobs=None):
+    """
+    Worker döngüsü
+
+    Args:
+        burst: Kuyruk boşalınca çık
+        max_jobs: Bu kadar iş işledikten sonra çık (bellek sızıntılarına karşı)
+
+    Returns:
+        int: İşlenen iş sayısı
+    """
+    worker_id = worker_id or default_worker_id()
+    autodiscover_modules('tasks')
+    processed = 0
+    last_stale_check = 0.0
+
+    logger.info(f"👷 Worker başladı: {worker_id} (görevler: {', '.join(sorted(_registry))})")
+
+    while max_jobs is None or processed < max_jobs:
+        close_old_connections()
+
+        if time.monotonic() - last_stale_check > 60:
+            requeue_stale()
+            last_stale_check = time.monotonic()
+
+        job = claim_next(worker_id)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job, worker_id)
+        processed += 1
+
+    close_old_connections()
+    return processed
+
+
+def job_status(job):
+    """Durum sorgusu (polling) yanıtı"""
+    data = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+    }
+    if job.status == 'succeeded':
+        data['result'] = job.result
+    elif job.status == 'dead':
+        # Kalıcı hatalarda (PermanentError) görevin mesajı, diğerlerinde genel mesaj
+        data['error'] = (job.result or {}).get('error') or 'İşlem tamamlanamadı. Lütfen daha sonra tekrar deneyin.'
+    return data
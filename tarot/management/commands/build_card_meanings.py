@@ -0,0 +1,189 @@
+"""
+Kart yorum kütüphanesini (CardMeaning) yeniden üret
+
+Örnekler:
+    python manage.py build_card_meanings                      # Türkçe şablon parçaları
+    python manage.py build_card_meanings --use-llm --languages tr,en,de,fr --concurrency 4
+    python manage.py build_card_meanings --use-llm --force    # mevcut parçaların üzerine yaz
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from tarot import rate_limit
+from tarot.meaning_library import library_positions, template_fragment, LIBRARY_MAX_CARDS
+from tarot.models import TarotCard, CardMeaning
+from tarot.openrouter_service import OpenRouterService, DEFAULT_TAROT_PROMPT
+from zodiac.schemas import SchemaError, extract_json, validate_text
+from zodiac.services import LANGUAGE_INSTRUCTIONS
+
+# Parça uzunluk sınırları (karakter)
+FRAGMENT_MIN_LENGTH = 40
+FRAGMENT_MAX_LENGTH = 1200
+
+
+class Command(BaseCommand):
+    help = 'Kart × yön × pozisyon × dil yorum kütüphanesini üret (küçük yayılımlar LLM çağrısız yorumlanır)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--languages',
+            type=str,
+            default='tr',
+            help='Virgülle ayrılmış dil kodları (ör. tr,en,de,fr). Varsayılan: tr',
+        )
+        parser.add_argument(
+            '--use-llm',
+            action='store_true',
+            help='Parçaları LLM ile üret (şablon yalnızca Türkçe için kullanılabilir)',
+        )
+        parser.add_argument(
+            '--all-spreads',
+            action='store_true',
+            help=f'{LIBRARY_MAX_CARDS} karttan büyük yayılımların pozisyonlarını da kapsa',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Eşzamanlı LLM isteği sayısı. Varsayılan: 4',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Mevcut parçaların üzerine yaz',
+        )
+
+    def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
+
+        languages = [code.strip() for code in options['languages'].split(',') if code.strip()]
+        supported = {code for code, _ in settings.LANGUAGES}
+        unknown = [code for code in languages if code not in supported]
+        if unknown:
+            raise CommandError(f"Desteklenmeyen dil: {', '.join(unknown)}")
+        if not options['use_llm'] and languages != ['tr']:
+            raise CommandError('Şablon parçaları yalnızca Türkçe üretilebilir; diğer diller için --use-llm kullanın')
+
+        cards = list(TarotCard.objects.order_by('suit', 'number'))
+        positions = library_positions(include_all=options['all_spreads'])
+        if not cards:
+            raise CommandError('Kart bulunamadı')
+
+        tasks = [
+            (card, is_reversed, language)
+            for language in languages
+            for card in cards
+            for is_reversed in (False, True)
+        ]
+        if not options['force']:
+            existing = set(
+                CardMeaning.objects.filter(language__in=languages, position='')
+                .values_list('card_id', 'is_reversed', 'language')
+            )
+            tasks = [task for task in tasks if (task[0].pk, task[1], task[2]) not in existing]
+
+        self.stdout.write(
+            f"📚 {len(cards)} kart, {len(positions)} pozisyon, {len(languages)} dil: "
+            f"{len(tasks)} kart/yön/dil üretilecek ({'LLM' if options['use_llm'] else 'şablon'})"
+        )
+        if not tasks:
+            self.stdout.write(self.style.SUCCESS('✅ Kütüphane güncel'))
+            return
+
+        start = time.perf_counter()
+        saved = failed = 0
+
+        if options['use_llm']:
+            service = OpenRouterService()
+            with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as executor:
+                futures = {
+                    executor.submit(self._generate_llm, service, card, is_reversed, language, positions): (card, is_reversed, language)
+                    for card, is_reversed, language in tasks
+                }
+                for future in as_completed(futures):
+                    card, is_reversed, language = futures[future]
+                    try:
+                        fragments = future.result()
+                    except Exception as e:
+                        failed += 1
+                        self.stdout.write(self.style.ERROR(f"  ❌ {card.name} {'(Ters)' if is_reversed else ''} [{language}]: {e}"))
+                        continue
+                    saved += self._save(card, is_reversed, language, fragments, service.model, options['force'])
+        else:
+            for card, is_reversed, language in tasks:
+                fragments = {'': template_fragment(card, is_reversed)}
+                fragments.update({position: template_fragment(card, is_reversed, position) for position in positions})
+                saved += self._save(card, is_reversed, language, fragments, 'template', options['force'])
+
+        duration = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {saved} parça kaydedildi, {failed} hata ({duration:.1f}s)"
+        ))
+
+    def _generate_llm(self, service, card, is_reversed, language, positions):
+        """Bir kart/yön/dil için genel ve pozisyon parçalarını tek JSON isteğinde üret"""
+        close_old_connections()
+        try:
+            orientation = 'Ters' if is_reversed else 'Düz'
+            meaning = card.reversed_meaning if is_reversed else card.upright_meaning
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
+            example = json.dumps({'general': '...', 'positions': {label: '...' for label in positions[:2]}}, ensure_ascii=False)
+
+            prompt = f"""Tarot kartı: {card.name} ({card.name_en}) - {orientation}
+Temel anlam: {meaning}
+
+Bu kart için her okumada kullanılabilecek, soruya özel olmayan yorum parçaları yaz.
+"general" alanına kartın bu yöndeki genel yorumunu (3-4 cümle), "positions" altına
+aşağıdaki her pozisyon için kartın o pozisyondaki yorumunu (2-3 cümle) yaz:
+
+{chr(10).join(f'- {label}' for label in positions)}
+
+Pozisyon adlarını anahtar olarak aynen kullan. Yanıtın yalnızca şu yapıda bir JSON nesnesi olsun:
+{example}"""
+
+            response = service.generate_response(
+                prompt=prompt,
+                system_prompt=f"{lang_instruction}{DEFAULT_TAROT_PROMPT} Yanıtını yalnızca geçerli JSON olarak verirsin.",
+                max_tokens=250 * (len(positions) + 1) + 200,
+                temperature=0.7,
+                language=language,
+                json_mode=True,
+            )
+            document = extract_json(response)
+            fragments = {'': validate_text(document.get('general'), 'general', FRAGMENT_MIN_LENGTH, FRAGMENT_MAX_LENGTH)}
+
+            position_texts = document.get('positions') or {}
+            if not isinstance(position_texts, dict):
+                raise SchemaError('"positions" nesne olmalı')
+            for label in positions:
+                # Eksik veya geçersiz pozisyonda composer genel parçaya düşer
+                try:
+                    fragments[label] = validate_text(position_texts.get(label), label, FRAGMENT_MIN_LENGTH, FRAGMENT_MAX_LENGTH)
+                except SchemaError:
+                    continue
+            return fragments
+        finally:
+            close_old_connections()
+
+    def _save(self, card, is_reversed, language, fragments, source, force):
+        """Parçaları toplu yaz; force ise mevcutları güncelle"""
+        objects = [
+            CardMeaning(card=card, is_reversed=is_reversed, position=position, language=language, text=text, source=source)
+            for position, text in fragments.items()
+        ]
+        if force:
+            CardMeaning.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=['card', 'is_reversed', 'position', 'language'],
+                update_fields=['text', 'source', 'updated_at'],
+            )
+        else:
+            CardMeaning.objects.bulk_create(objects, ignore_conflicts=True)
+        return len(objects)
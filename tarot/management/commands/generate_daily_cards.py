@@ -0,0 +1,111 @@
+"""
+Ortak günlük kart yorumlarını önceden üret (78 kart × 2 yön × dil)
+Cron ile gece çalıştırılırsa günlük kart sayfası hiç AI beklemez.
+
+Örnekler:
+    python manage.py generate_daily_cards
+    python manage.py generate_daily_cards --date 2025-01-01 --languages tr,en --concurrency 8
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from tarot import rate_limit
+from tarot.models import TarotCard, DailyCardInterpretation
+from tarot.services import get_daily_card_interpretation
+
+
+class Command(BaseCommand):
+    help = 'Ortak günlük kart yorumlarını (kart × yön × dil) önceden üret'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            default=None,
+            help='Tarih (YYYY-MM-DD). Varsayılan: bugün',
+        )
+        parser.add_argument(
+            '--languages',
+            type=str,
+            default=None,
+            help='Virgülle ayrılmış dil kodları. Varsayılan: tüm diller',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Eşzamanlı AI isteği sayısı. Varsayılan: 4',
+        )
+
+    def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
+
+        if options['date']:
+            try:
+                target_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Geçersiz tarih: {options['date']} (YYYY-MM-DD bekleniyor)")
+        else:
+            target_date = timezone.now().date()
+
+        supported = [code for code, _ in settings.LANGUAGES]
+        if options['languages']:
+            languages = [code.strip() for code in options['languages'].split(',') if code.strip()]
+            unknown = [code for code in languages if code not in supported]
+            if unknown:
+                raise CommandError(f"Desteklenmeyen dil: {', '.join(unknown)}")
+        else:
+            languages = supported
+
+        existing = set(
+            DailyCardInterpretation.objects.filter(date=target_date, language__in=languages)
+            .values_list('card_id', 'is_reversed', 'language')
+        )
+        tasks = [
+            (card, is_reversed, language)
+            for language in languages
+            for card in TarotCard.objects.all()
+            for is_reversed in (False, True)
+            if (card.pk, is_reversed, language) not in existing
+        ]
+
+        self.stdout.write(f"🃏 {target_date}: {len(existing)} yorum hazır, {len(tasks)} üretilecek")
+        if not tasks:
+            return
+
+        start = time.perf_counter()
+        created = failed = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as executor:
+            futures = {
+                executor.submit(self._generate, card, is_reversed, target_date, language): (card, is_reversed, language)
+                for card, is_reversed, language in tasks
+            }
+            for future in as_completed(futures):
+                card, is_reversed, language = futures[future]
+                if future.result():
+                    created += 1
+                else:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(
+                        f"  ❌ {card.name} {'(Ters)' if is_reversed else ''} [{language}]"
+                    ))
+
+        duration = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {created} yorum üretildi, {failed} hata ({duration:.1f}s)"
+        ))
+
+    def _generate(self, card, is_reversed, target_date, language):
+        close_old_connections()
+        try:
+            return get_daily_card_interpretation(card, is_reversed, target_date, language) is not None
+        finally:
+            close_old_connections()
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from tarot import reuse
+
+
+class Command(BaseCommand):
+    help = 'Tarot yorumu yeniden kullanım (normalize soru / MinHash) isabet oranlarını göster'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Gösterdikten sonra sayaçları sıfırla',
+        )
+
+    def handle(self, *args, **options):
+        stats = reuse.stats(reset=options['reset'])
+
+        self.stdout.write(self.style.SUCCESS('♻️ Tarot yorumu yeniden kullanımı'))
+        self.stdout.write(
+            f"   Eşikler: yeniden kullanım >= {reuse.REUSE_THRESHOLD}, few-shot >= {reuse.FEW_SHOT_THRESHOLD}"
+        )
+        for outcome in reuse.OUTCOMES:
+            self.stdout.write(f"   {outcome:<9} {stats[outcome]}")
+        self.stdout.write(f"   Toplam    {stats['total']}")
+        self.stdout.write(
+            f"   Yeniden kullanım oranı: {stats['reuse_rate']:.1%}, few-shot oranı: {stats['few_shot_rate']:.1%}"
+        )
+        if options['reset']:
+            self.stdout.write('   Sayaçlar sıfırlandı')
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from tarot import jobs
+
+
+class Command(BaseCommand):
+    help = 'Arka plan AI işlerini (AIJob kuyruğu) yürüten worker süreci'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--worker-id',
+            type=str,
+            default=None,
+            help='Worker adı. Varsayılan: host:pid',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Kuyruk boşken sorgulama aralığı (saniye). Varsayılan: 1',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Kuyruk boşalınca çık (cron ile kullanım için)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Bu kadar iş işledikten sonra çık (systemd yeniden başlatır)',
+        )
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or jobs.default_worker_id()
+
+        self.stdout.write(self.style.SUCCESS(f'👷 Worker başlatılıyor: {worker_id}'))
+
+        try:
+            processed = jobs.work(
+                worker_id=worker_id,
+                poll_interval=options['poll_interval'],
+                burst=options['burst'],
+                max_jobs=options['max_jobs'],
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\n⏹️ Worker durduruldu'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Worker tamamlandı: {processed} iş işlendi'))
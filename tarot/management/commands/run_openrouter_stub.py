@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tarot.openrouter_stub import StubConfig, StubServer, LATENCY_DISTRIBUTIONS
+
+
+class Command(BaseCommand):
+    help = 'Yük testi ve ağsız benchmark için yerel OpenRouter taklit sunucusunu çalıştır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Dinlenecek adres. Varsayılan: 127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001, help='Dinlenecek port. Varsayılan: 8001')
+        parser.add_argument(
+            '--latency',
+            choices=LATENCY_DISTRIBUTIONS,
+            default='lognormal',
+            help='Yanıt gecikmesi dağılımı. Varsayılan: lognormal',
+        )
+        parser.add_argument('--latency-mean', type=float, default=1200, help='Ortalama gecikme (ms). Varsayılan: 1200')
+        parser.add_argument('--latency-sd', type=float, default=400, help='Gecikme standart sapması (ms). Varsayılan: 400')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='503 döndürülecek istek oranı (0-1)')
+        parser.add_argument('--throttle-rate', type=float, default=0.0, help='429 döndürülecek istek oranı (0-1)')
+        parser.add_argument('--chunk-delay', type=float, default=20, help='Stream parçaları arası bekleme (ms). Varsayılan: 20')
+        parser.add_argument('--seed', type=int, default=None, help='Tekrarlanabilir çalıştırmalar için rastgelelik tohumu')
+
+    def handle(self, *args, **options):
+        for name in ('error_rate', 'throttle_rate'):
+            if not 0.0 <= options[name] <= 1.0:
+                raise CommandError(f"--{name.replace('_', '-')} 0 ile 1 arasında olmalı")
+
+        stub_config = StubConfig(
+            latency=options['latency'],
+            latency_mean=options['latency_mean'],
+            latency_sd=options['latency_sd'],
+            error_rate=options['error_rate'],
+            throttle_rate=options['throttle_rate'],
+            chunk_delay=options['chunk_delay'],
+            seed=options['seed'],
+        )
+        server = StubServer((options['host'], options['port']), stub_config)
+        base_url = f"http://{options['host']}:{options['port']}/api/v1"
+
+        self.stdout.write(self.style.SUCCESS(f"🧪 OpenRouter taklit sunucusu çalışıyor: {base_url}"))
+        self.stdout.write(
+            f"   Gecikme: {options['latency']} ort={options['latency_mean']:.0f}ms sd={options['latency_sd']:.0f}ms, "
+            f"hata={options['error_rate']:.0%}, 429={options['throttle_rate']:.0%}"
+        )
+        self.stdout.write(f"   Kullanım: OPENROUTER_BASE_URL={base_url}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            stats = server.stats
+            self.stdout.write(
+                f"\n📊 {stats['requests']} istek, {stats['errors']} hata, {stats['throttled']} 429"
+            )
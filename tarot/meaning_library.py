@@ -0,0 +1,148 @@
+"""
+Önceden üretilmiş kart yorum kütüphanesi
+Küçük yayılımlarda (TAROT_LIBRARY_MAX_CARDS kart ve altı) okuma, CardMeaning
+tablosundaki kart × yön × pozisyon × dil parçalarından birleştirilir; tek bir
+sorgu ile milisaniyeler içinde hazırlanır. LLM yorumu isteğe bağlı "derin yorum"
+olarak kalır. Kütüphane `python manage.py build_card_meanings` ile yeniden üretilir.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from decouple import config
+
+from .models import CardMeaning, TarotSpread
+
+logger = logging.getLogger(__name__)
+
+# Bu kart sayısına kadar olan yayılımlar kütüphaneden yorumlanır
+LIBRARY_MAX_CARDS = config('TAROT_LIBRARY_MAX_CARDS', default=3, cast=int)
+
+# Birleştirilen okumanın dil bazlı kalıpları
+PHRASES = {
+    'tr': {
+        'title': '## {spread} Yorumu',
+        'question': '**Sorunuz:** {question}',
+        'card': '### {position}. {label} - {card}{orientation}',
+        'reversed': ' (Ters)',
+        'closing_reversed': 'Kartlarınızın çoğu ters geldi: içe dönüp engelleri fark etmek için uygun bir dönemdesiniz.',
+        'closing_upright': 'Kartlarınızın çoğu düz geldi: enerji akıyor, niyetlerinizi harekete geçirmek için uygun bir dönem.',
+    },
+    'en': {
+        'title': '## {spread} Reading',
+        'question': '**Your question:** {question}',
+        'card': '### {position}. {label} - {card}{orientation}',
+        'reversed': ' (Reversed)',
+        'closing_reversed': 'Most of your cards came up reversed: a good time to turn inward and notice what is blocking you.',
+        'closing_upright': 'Most of your cards came up upright: energy is flowing, a good time to act on your intentions.',
+    },
+    'de': {
+        'title': '## {spread} Deutung',
+        'question': '**Ihre Frage:** {question}',
+        'card': '### {position}. {label} - {card}{orientation}',
+        'reversed': ' (Umgekehrt)',
+        'closing_reversed': 'Die meisten Karten liegen umgekehrt: eine gute Zeit, nach innen zu schauen und Blockaden zu erkennen.',
+        'closing_upright': 'Die meisten Karten liegen aufrecht: die Energie fließt, eine gute Zeit, Ihre Absichten umzusetzen.',
+    },
+    'fr': {
+        'title': '## Lecture {spread}',
+        'question': '**Votre question :** {question}',
+        'card': '### {position}. {label} - {card}{orientation}',
+        'reversed': ' (Renversée)',
+        'closing_reversed': "La plupart de vos cartes sont renversées : le moment de vous tourner vers l'intérieur et de repérer les blocages.",
+        'closing_upright': "La plupart de vos cartes sont droites : l'énergie circule, le moment d'agir selon vos intentions.",
+    },
+}
+
+
+def library_available(spread):
+    """Yayılım kütüphaneden yorumlanabilecek kadar küçük mü?"""
+    return spread.card_count <= LIBRARY_MAX_CARDS
+
+
+def library_positions(include_all=False):
+    """Kütüphanenin kapsadığı pozisyon adları (aktif küçük yayılımlardan)"""
+    spreads = TarotSpread.objects.filter(is_active=True)
+    if not include_all:
+        spreads = spreads.filter(card_count__lte=LIBRARY_MAX_CARDS)
+
+    positions = []
+    for spread_positions in spreads.values_list('positions', flat=True):
+        for label in (spread_positions or {}).values():
+            if label and label not in positions:
+                positions.append(label)
+    return positions
+
+
+def template_fragment(card, is_reversed, position=''):
+    """
+    Kart anlamından şablon yorum parçası (Türkçe)
+
+    Kart anlamları veritabanında Türkçe tutulduğundan diğer diller LLM ile üretilir.
+    """
+    meaning = (card.reversed_meaning if is_reversed else card.upright_meaning).strip()
+    orientation = 'ters' if is_reversed else 'düz'
+
+    if not position:
+        description = card.description.strip().split('. ')[0].rstrip('.')
+        return f"{card.name} {orientation} geldi. {meaning} {description}.".strip()
+
+    return f"{position} pozisyonunda {card.name} {orientation} geldi. {meaning}"
+
+
+def compose_reading(spread, question, cards_data, language='tr'):
+    """
+    Çekilen kartlar için okumayı kütüphaneden birleştir
+
+    Args:
+        cards_data: _prepare_reading'in ürettiği kart listesi (id, name, position,
+            position_meaning, is_reversed)
+
+    Returns:
+        str: Markdown yorum; yayılım büyükse veya eksik parça varsa None (LLM'e düşülür)
+    """
+    if not library_available(spread):
+        return None
+
+    phrases = PHRASES.get(language)
+    if phrases is None:
+        return None
+
+    labels = {card['position_meaning'] for card in cards_data}
+    fragments = {
+        (card_id, is_reversed, position): text
+        for card_id, is_reversed, position, text in CardMeaning.objects.filter(
+            card_id__in=[card['id'] for card in cards_data],
+            language=language,
+            position__in=[*labels, ''],
+        ).values_list('card_id', 'is_reversed', 'position', 'text')
+    }
+
+    parts = [
+        phrases['title'].format(spread=spread.name),
+        phrases['question'].format(question=question),
+    ]
+    for card in cards_data:
+        text = (
+            fragments.get((card['id'], card['is_reversed'], card['position_meaning']))
+            or fragments.get((card['id'], card['is_reversed'], ''))
+        )
+        if not text:
+            logger.info(f"📚 Kütüphanede eksik parça: {card['name']} / {card['position_meaning']} [{language}]")
+            return None
+
+        parts.append(phrases['card'].format(
+            position=card['position'],
+            label=card['position_meaning'],
+            card=card['name'],
+            orientation=phrases['reversed'] if card['is_reversed'] else '',
+        ))
+        parts.append(text)
+
+    reversed_count = sum(1 for card in cards_data if card['is_reversed'])
+    closing = 'closing_reversed' if reversed_count * 2 > len(cards_data) else 'closing_upright'
+    parts.append(phrases[closing])
+
+    return '\n\n'.join(parts)
+
+
+acompose_reading = sync_to_async(compose_reading)
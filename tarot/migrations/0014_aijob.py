@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-18 10:00
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0013_tarotspread_is_premium_only_tarotspread_token_cost'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('task', models.CharField(db_index=True, max_length=100, verbose_name='Görev')),
+                ('key', models.CharField(blank=True, db_index=True, help_text='Aynı anahtarlı aktif iş varsa yenisi oluşturulmaz', max_length=255, verbose_name='Tekil Anahtar')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Parametreler')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Çalışıyor'), ('succeeded', 'Tamamlandı'), ('dead', 'Başarısız (Dead-letter)')], db_index=True, default='pending', max_length=20, verbose_name='Durum')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Deneme')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='En Fazla Deneme')),
+                ('run_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Çalışma Zamanı')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='Kilit Zamanı')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Sonuç')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ai_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'AI İşi',
+                'verbose_name_plural': 'AI İşleri',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='tarot_aijob_status_run_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0014_aijob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardMeaning',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_reversed', models.BooleanField(default=False, verbose_name='Ters')),
+                ('position', models.CharField(blank=True, max_length=100, verbose_name='Pozisyon')),
+                ('language', models.CharField(choices=[('tr', 'Türkçe'), ('en', 'English'), ('de', 'Deutsch'), ('fr', 'Français')], default='tr', max_length=10, verbose_name='Dil')),
+                ('text', models.TextField(verbose_name='Yorum')),
+                ('source', models.CharField(default='template', help_text='template veya üreten model adı', max_length=100, verbose_name='Kaynak')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meanings', to='tarot.tarotcard', verbose_name='Kart')),
+            ],
+            options={
+                'verbose_name': 'Kart Yorum Parçası',
+                'verbose_name_plural': 'Kart Yorum Kütüphanesi',
+                'unique_together': {('card', 'is_reversed', 'position', 'language')},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0015_cardmeaning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCardInterpretation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_reversed', models.BooleanField(default=False, verbose_name='Ters')),
+                ('language', models.CharField(choices=[('tr', 'Türkçe'), ('en', 'English'), ('de', 'Deutsch'), ('fr', 'Français')], default='tr', max_length=10, verbose_name='Dil')),
+                ('date', models.DateField(verbose_name='Tarih')),
+                ('interpretation', models.TextField(verbose_name='Günlük Yorum')),
+                ('ai_provider', models.CharField(default='openrouter', max_length=100, verbose_name='AI Sağlayıcı')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_interpretations', to='tarot.tarotcard', verbose_name='Kart')),
+            ],
+            options={
+                'verbose_name': 'Ortak Günlük Kart Yorumu',
+                'verbose_name_plural': 'Ortak Günlük Kart Yorumları',
+                'unique_together': {('card', 'is_reversed', 'language', 'date')},
+            },
+        ),
+        migrations.AlterField(
+            model_name='dailycard',
+            name='interpretation',
+            field=models.TextField(blank=True, help_text='Yalnızca ortak yorum yoksa kullanılır (eski kayıtlar, AI hatası)', verbose_name='Günlük Yorum'),
+        ),
+        migrations.AddField(
+            model_name='dailycard',
+            name='shared_interpretation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='draws', to='tarot.dailycardinterpretation', verbose_name='Ortak Yorum'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0016_dailycardinterpretation'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='aijob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running']), models.Q(('key', ''), _negated=True)), fields=('key',), name='tarot_aijob_active_key_uniq'),
+        ),
+    ]
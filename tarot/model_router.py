@@ -0,0 +1,344 @@
+"""
+Model yönlendirme katmanı
+Sıralı bir model listesi (OPENROUTER_MODEL_CHAIN) üzerinden istek atar:
+- Circuit breaker: Art arda hata veren model bir süre devre dışı kalır,
+  süre dolunca tek bir deneme isteğiyle (half-open) tekrar açılır.
+- Hedged request: Birincil model kendi p95 gecikmesi içinde yanıt vermezse
+  sıradaki model de çağrılır; hangisi önce yanıt verirse o kullanılır.
+Gecikme örnekleri ve devre durumu paylaşılan cache'de tutulur; böylece tüm
+gunicorn worker'ları ve management komutları aynı sağlık bilgisini görür.
+"""
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from asgiref.sync import sync_to_async
+from decouple import config, Csv
+from django.core.cache import caches
+
+from .rate_limit import RateLimited
+
+logger = logging.getLogger(__name__)
+
+# Sıralı model listesi; boşsa yalnızca OPENROUTER_MODEL kullanılır
+MODEL_CHAIN = config('OPENROUTER_MODEL_CHAIN', default='', cast=Csv())
+# Art arda bu kadar hata devreyi açar
+BREAKER_FAILURE_THRESHOLD = config('ROUTER_FAILURE_THRESHOLD', default=3, cast=int)
+# Açık devrenin kapalı kalacağı süre (saniye)
+BREAKER_COOLDOWN = config('ROUTER_COOLDOWN', default=60, cast=int)
+# Hedge için p95 hesaplanırken tutulan son gecikme örneği sayısı
+LATENCY_WINDOW = config('ROUTER_LATENCY_WINDOW', default=50, cast=int)
+MIN_SAMPLES = 10
+# Yeterli örnek yokken kullanılan hedge eşiği (saniye)
+DEFAULT_HEDGE_DELAY = config('ROUTER_DEFAULT_HEDGE_DELAY', default=8.0, cast=float)
+HEDGING_ENABLED = config('ROUTER_HEDGING', default=True, cast=bool)
+# Hedge edilen senkron istekler için thread sayısı; eşzamanlı istek × 2 kadar olmalı
+HEDGE_POOL_SIZE = config('ROUTER_HEDGE_POOL_SIZE', default=32, cast=int)
+
+STATE_TIMEOUT = 24 * 3600
+
+# Hedge edilen senkron istekler için paylaşılan thread havuzu
+_executor = ThreadPoolExecutor(max_workers=HEDGE_POOL_SIZE, thread_name_prefix='model-hedge')
+# Redis yokken (süreç içi backend) gecikme listesinin oku-değiştir-yaz kilidi
+_samples_lock = threading.Lock()
+
+
+class AllModelsFailed(Exception):
+    """Zincirdeki hiçbir model yanıt veremedi"""
+
+
+def _shared_cache():
+    # L1 (süreç içi) katmanı atlanır; worker'lar aynı devre/gecikme durumunu görmeli
+    return caches['shared']
+
+
+class ModelHealth:
+    """Bir modelin paylaşılan cache'deki gecikme/hata durumu"""
+
+    def __init__(self, model):
+        self.model = model
+        self._prefix = f"router:{model}"
+
+    @property
+    def cache(self):
+        return _shared_cache()
+
+    def _key(self, name):
+        return f"{self._prefix}:{name}"
+
+    # Circuit breaker
+
+    def is_open(self):
+        return self.cache.get(self._key('open')) is not None
+
+    def allow_request(self):
+        """
+        Devre kapalıysa True; açıksa False. Soğuma süresi dolduktan sonra
+        (half-open) tüm worker'lar arasında yalnızca bir deneme isteğine izin verilir.
+        Deneme hakkını tükettiği için yalnızca istek gerçekten gönderilecekken
+        çağrılmalıdır (bkz. ModelRouter.take).
+        """
+        if self.is_open():
+            return False
+        if self.cache.get(self._key('tripped')) is None:
+            return True
+        # Half-open: ilk gelen deneme hakkını alır
+        return self.cache.add(self._key('probe'), 1, BREAKER_COOLDOWN)
+
+    def record_success(self, latency=None):
+        """Devreyi kapat; latency verilmişse gecikme örneği olarak ekle"""
+        self.cache.delete_many([self._key('failures'), self._key('tripped'), self._key('probe')])
+        if latency is not None:
+            self._add_sample(round(latency, 3))
+
+    def release_probe(self):
+        """Sonuçsuz kalan (istemcinin kestiği) half-open denemenin hakkını geri bırak"""
+        self.cache.delete(self._key('probe'))
+
+    def record_failure(self):
+        self.cache.add(self._key('failures'), 0, BREAKER_COOLDOWN * 5)
+        try:
+            failures = self.cache.incr(self._key('failures'))
+        except ValueError:
+            failures = 1
+
+        if failures >= BREAKER_FAILURE_THRESHOLD or self.cache.get(self._key('tripped')) is not None:
+            self.cache.set(self._key('open'), 1, BREAKER_COOLDOWN)
+            self.cache.set(self._key('tripped'), 1, STATE_TIMEOUT)
+            self.cache.delete(self._key('probe'))
+            logger.warning(f"🔌 Devre açıldı: {self.model} ({failures} hata, {BREAKER_COOLDOWN}s)")
+
+    # Gecikme
+
+    def _redis(self):
+        client = getattr(self.cache, 'client', None)
+        if client is not None and hasattr(client, 'get_client'):
+            return client
+        return None
+
+    def _add_sample(self, latency):
+        client = self._redis()
+        if client is None:
+            # Süreç içi backend (geliştirme): liste yalnızca bu süreçte, kilit yeterli
+            with _samples_lock:
+                samples = self.cache.get(self._key('latencies')) or []
+                samples.append(latency)
+                self.cache.set(self._key('latencies'), samples[-LATENCY_WINDOW:], STATE_TIMEOUT)
+            return
+
+        # django-redis: worker'lar aynı anda yazsa da örnek kaybolmasın diye atomik RPUSH + LTRIM
+        key = client.make_key(self._key('latency_samples'))
+        try:
+            pipe = client.get_client(write=True).pipeline()
+            pipe.rpush(key, latency)
+            pipe.ltrim(key, -LATENCY_WINDOW, -1)
+            pipe.expire(key, STATE_TIMEOUT)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Gecikme örneği yazılamadı ({self.model}): {e}")
+
+    def samples(self):
+        client = self._redis()
+        if client is None:
+            return self.cache.get(self._key('latencies')) or []
+        try:
+            raw = client.get_client(write=False).lrange(client.make_key(self._key('latency_samples')), 0, -1)
+        except Exception as e:
+            logger.warning(f"⚠️ Gecikme örnekleri okunamadı ({self.model}): {e}")
+            return []
+        return [float(value) for value in raw]
+
+    def p95(self):
+        """Son gecikmelerin 95. yüzdeliği; yeterli örnek yoksa None"""
+        samples = sorted(self.samples())
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def hedge_delay(self):
+        return self.p95() or DEFAULT_HEDGE_DELAY
+
+    def snapshot(self):
+        samples = self.samples()
+        return {
+            'model': self.model,
+            'open': self.is_open(),
+            'tripped': self.cache.get(self._key('tripped')) is not None,
+            'failures': self.cache.get(self._key('failures')) or 0,
+            'samples': len(samples),
+            'p95': self.p95(),
+        }
+
+    # Event loop'u bloklamamak için async view'larda kullanılan sürümler
+    # (paylaşılan cache Redis'e ağ üzerinden gider)
+
+    async def arecord_success(self, latency=None):
+        await sync_to_async(self.record_success, thread_sensitive=False)(latency)
+
+    async def arecord_failure(self):
+        await sync_to_async(self.record_failure, thread_sensitive=False)()
+
+    async def arelease_probe(self):
+        await sync_to_async(self.release_probe, thread_sensitive=False)()
+
+    async def ahedge_delay(self):
+        return await sync_to_async(self.hedge_delay, thread_sensitive=False)()
+
+
+class ModelRouter:
+    """
+    Sıralı model zinciri üzerinde yönlendirme
+
+    send(model) tek bir modele istek atıp sonucu döndüren fonksiyondur;
+    hata durumunda exception fırlatmalıdır.
+    """
+
+    def __init__(self, models):
+        self.models = list(dict.fromkeys(m for m in models if m))
+        self.health = {model: ModelHealth(model) for model in self.models}
+
+    def available_models(self):
+        """Devresi açık olmayan modeller, zincir sırasıyla (half-open deneme hakkı alınmaz)"""
+        return [model for model in self.models if not self.health[model].is_open()]
+
+    def take(self, candidates, fallback=False):
+        """
+        Adaylardan ilk gönderilebilecek modeli listeden çıkarıp döndür
+
+        Half-open modelin deneme hakkı burada, istek gönderilmeden hemen önce
+        alınır; hakkı başka worker almışsa sıradaki adaya geçilir. Uygun model
+        yoksa None döner; fallback=True ise kullanıcı boş dönmesin diye zincirin
+        başı yine de denenir.
+        """
+        while candidates:
+            model = candidates.pop(0)
+            if self.health[model].allow_request():
+                return model
+        if fallback:
+            logger.warning("⚠️ İstek kabul eden model yok, zincirin başı deneniyor")
+            return self.models[0]
+        return None
+
+    async def aavailable_models(self):
+        return await sync_to_async(self.available_models, thread_sensitive=False)()
+
+    async def atake(self, candidates, fallback=False):
+        return await sync_to_async(self.take, thread_sensitive=False)(candidates, fallback)
+
+    def _timed(self, model, send, started=None):
+        if started is not None:
+            started.set()
+        start = time.perf_counter()
+        try:
+            result = send(model)
+        except RateLimited:
+            # Yerel kota beklemesi modelin sağlığıyla ilgili değil
+            raise
+        except Exception:
+            self.health[model].record_failure()
+            raise
+        self.health[model].record_success(time.perf_counter() - start)
+        return result
+
+    def run(self, send):
+        """
+        İsteği zincir üzerinden çalıştır (senkron)
+
+        Returns:
+            (model, sonuç) tuple
+        """
+        candidates = self.available_models()
+        errors = []
+        primary = self.take(candidates, fallback=True)
+
+        while primary:
+            started = threading.Event()
+            pending = {_executor.submit(self._timed, primary, send, started): primary}
+
+            if HEDGING_ENABLED and candidates:
+                delay = self.health[primary].hedge_delay()
+                # Hedge süresi istek havuzda sıra beklerken değil, gerçekten başladığında işlemeye başlar
+                started.wait()
+                done, _ = wait(pending, timeout=delay)
+                backup = None if done else self.take(candidates)
+                if backup:
+                    logger.info(f"🏁 Hedge: {primary} gecikti, {backup} de çağrılıyor")
+                    pending[_executor.submit(self._timed, backup, send)] = backup
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    model = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(f"{model}: {e}")
+                        logger.warning(f"⚠️ Model hatası, sıradakine geçiliyor: {model} - {e}")
+                        continue
+                    # Kaybeden istek arka planda tamamlanır, sonucu yalnızca istatistiğe yazılır
+                    return model, result
+
+            primary = self.take(candidates)
+
+        raise AllModelsFailed('; '.join(errors) or 'Kullanılabilir model yok')
+
+    async def _atimed(self, model, send):
+        start = time.perf_counter()
+        try:
+            result = await send(model)
+        except RateLimited:
+            # Yerel kota beklemesi modelin sağlığıyla ilgili değil
+            raise
+        except Exception:
+            await self.health[model].arecord_failure()
+            raise
+        await self.health[model].arecord_success(time.perf_counter() - start)
+        return result
+
+    async def arun(self, send):
+        """run'ın async versiyonu; send(model) bir coroutine döndürür. Kaybeden istek iptal edilir."""
+        candidates = await self.aavailable_models()
+        errors = []
+        primary = await self.atake(candidates, fallback=True)
+
+        while primary:
+            pending = {asyncio.ensure_future(self._atimed(primary, send)): primary}
+
+            if HEDGING_ENABLED and candidates:
+                delay = await self.health[primary].ahedge_delay()
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                backup = None if done else await self.atake(candidates)
+                if backup:
+                    logger.info(f"🏁 Hedge: {primary} gecikti, {backup} de çağrılıyor")
+                    pending[asyncio.ensure_future(self._atimed(backup, send))] = backup
+
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        model = pending.pop(task)
+                        try:
+                            result = task.result()
+                        except Exception as e:
+                            errors.append(f"{model}: {e}")
+                            logger.warning(f"⚠️ Model hatası, sıradakine geçiliyor: {model} - {e}")
+                            continue
+                        return model, result
+            finally:
+                for task in pending:
+                    task.cancel()
+
+            primary = await self.atake(candidates)
+
+        raise AllModelsFailed('; '.join(errors) or 'Kullanılabilir model yok')
+
+    def status(self):
+        """Admin/izleme için model sağlık özeti"""
+        return [self.health[model].snapshot() for model in self.models]
+
+
+def get_router(primary_model):
+    """primary_model ile başlayan, ardından MODEL_CHAIN'i izleyen router"""
+    return ModelRouter([primary_model, *MODEL_CHAIN])
@@ -1,4 +1,5 @@
 import uuid
+from django.conf import settings
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -218,6 +219,18 @@ class TarotCard(models.Model):
         
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Süreç içi desteyi (tarot.deck) tüm worker'larda yenile
+        from .deck import invalidate
+        invalidate()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .deck import invalidate
+        invalidate()
+        return result
 
 
 class TarotSpread(models.Model):
@@ -291,13 +304,49 @@ class TarotReading(models.Model):
         return f"{self.user.username} - {self.spread.name} - {self.created_at.strftime('%d/%m/%Y')}"
 
 
+class DailyCardInterpretation(models.Model):
+    """
+    Ortak günlük kart yorumu (kart × yön × dil × tarih)
+    Aynı gün aynı kartı çeken tüm kullanıcılar bu kaydı paylaşır; günlük LLM
+    çağrısı kullanıcı sayısından bağımsız olarak en fazla 78 × 2 × dil sayısıdır.
+    """
+    card = models.ForeignKey(TarotCard, on_delete=models.CASCADE, related_name='daily_interpretations', verbose_name="Kart")
+    is_reversed = models.BooleanField(default=False, verbose_name="Ters")
+    language = models.CharField(max_length=10, choices=settings.LANGUAGES, default='tr', verbose_name="Dil")
+    date = models.DateField(verbose_name="Tarih")
+    interpretation = models.TextField(verbose_name="Günlük Yorum")
+    ai_provider = models.CharField(max_length=100, default='openrouter', verbose_name="AI Sağlayıcı")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Ortak Günlük Kart Yorumu"
+        verbose_name_plural = "Ortak Günlük Kart Yorumları"
+        unique_together = ['card', 'is_reversed', 'language', 'date']
+    
+    def __str__(self):
+        orientation = 'Ters' if self.is_reversed else 'Düz'
+        return f"{self.card.name} ({orientation}) - {self.date} [{self.language}]"
+
+
 class DailyCard(models.Model):
     """Günlük kart modeli"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Kullanıcı")
     card = models.ForeignKey(TarotCard, on_delete=models.CASCADE, verbose_name="Kart")
     date = models.DateField(verbose_name="Tarih")
     is_reversed = models.BooleanField(default=False, verbose_name="Ters Çekildi")
-    interpretation = models.TextField(verbose_name="Günlük Yorum")
+    shared_interpretation = models.ForeignKey(
+        DailyCardInterpretation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='draws',
+        verbose_name="Ortak Yorum"
+    )
+    interpretation = models.TextField(
+        blank=True,
+        verbose_name="Günlük Yorum",
+        help_text="Yalnızca ortak yorum yoksa kullanılır (eski kayıtlar, AI hatası)"
+    )
     ai_provider = models.CharField(
         max_length=100,
         default='openrouter',
@@ -313,3 +362,108 @@ class DailyCard(models.Model):
         
     def __str__(self):
         return f"{self.user.username} - {self.card.name} - {self.date}"
+    
+    @property
+    def text(self):
+        """Gösterilecek yorum: ortak kayıt varsa o, yoksa kullanıcıya yazılan metin"""
+        if self.shared_interpretation_id:
+            return self.shared_interpretation.interpretation
+        return self.interpretation
+
+
+class CardMeaning(models.Model):
+    """
+    Önceden üretilmiş kart yorum parçası (kart × yön × pozisyon × dil)
+    Küçük yayılımlarda okuma bu parçalardan birleştirilir; LLM çağrısı gerekmez.
+    position boşsa parça pozisyondan bağımsız genel yorumdur.
+    """
+    card = models.ForeignKey(TarotCard, on_delete=models.CASCADE, related_name='meanings', verbose_name="Kart")
+    is_reversed = models.BooleanField(default=False, verbose_name="Ters")
+    position = models.CharField(max_length=100, blank=True, verbose_name="Pozisyon")
+    language = models.CharField(max_length=10, choices=settings.LANGUAGES, default='tr', verbose_name="Dil")
+    text = models.TextField(verbose_name="Yorum")
+    source = models.CharField(
+        max_length=100,
+        default='template',
+        verbose_name="Kaynak",
+        help_text="template veya üreten model adı"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Kart Yorum Parçası"
+        verbose_name_plural = "Kart Yorum Kütüphanesi"
+        unique_together = ['card', 'is_reversed', 'position', 'language']
+    
+    def __str__(self):
+        orientation = 'Ters' if self.is_reversed else 'Düz'
+        return f"{self.card.name} ({orientation}) - {self.position or 'Genel'} [{self.language}]"
+
+
+class AIJob(models.Model):
+    """
+    Arka plan AI işi
+    Web istekleri işi kuyruğa alıp hemen döner; işi `run_jobs` worker'ları yürütür.
+    max_attempts denemenin sonunda başarısız olan işler 'dead' durumuna düşer
+    (dead-letter) ve admin panelinden yeniden kuyruğa alınabilir.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('running', 'Çalışıyor'),
+        ('succeeded', 'Tamamlandı'),
+        ('dead', 'Başarısız (Dead-letter)'),
+    ]
+    ACTIVE_STATUSES = ('pending', 'running')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=100, verbose_name="Görev", db_index=True)
+    key = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        verbose_name="Tekil Anahtar",
+        help_text="Aynı anahtarlı aktif iş varsa yenisi oluşturulmaz"
+    )
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Parametreler")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='ai_jobs',
+        verbose_name="Kullanıcı"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True, verbose_name="Durum")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Deneme")
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name="En Fazla Deneme")
+    run_after = models.DateTimeField(default=timezone.now, db_index=True, verbose_name="Çalışma Zamanı")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Kilit Zamanı")
+    result = models.JSONField(null=True, blank=True, verbose_name="Sonuç")
+    last_error = models.TextField(blank=True, verbose_name="Son Hata")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş")
+    
+    class Meta:
+        verbose_name = "AI İşi"
+        verbose_name_plural = "AI İşleri"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='tarot_aijob_status_run_idx'),
+        ]
+        constraints = [
+            # Aynı anahtarla yalnızca bir aktif iş (eşzamanlı enqueue yarışına karşı)
+            models.UniqueConstraint(
+                fields=['key'],
+                condition=models.Q(status__in=['pending', 'running']) & ~models.Q(key=''),
+                name='tarot_aijob_active_key_uniq',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} [{self.get_status_display()}] - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'dead')
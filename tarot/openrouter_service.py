@@ -4,10 +4,40 @@ Tek API key ile tüm AI modellere erişim
 """
 
 import os
+import json
+import hashlib
+import time
+import logging
+import httpx
 import requests
 from decouple import config
 from django.core.cache import cache
 
+from .http_session import timed_request, async_timed_request, get_async_client
+from .model_router import get_router, AllModelsFailed
+from .singleflight import single_flight, async_single_flight
+
+logger = logging.getLogger(__name__)
+
+# API kök adresi; yük testlerinde yerel taklit sunucuya yönlendirilebilir (run_openrouter_stub)
+BASE_URL = config('OPENROUTER_BASE_URL', default='https://openrouter.ai/api/v1').rstrip('/')
+
+# Cache anahtar formatı değişirse artırılır (eski kayıtlar kendiliğinden geçersiz olur)
+CACHE_KEY_VERSION = 1
+
+
+def build_cache_key(prefix, **fields):
+    """
+    İçerik adresli, süreçler arası kararlı cache anahtarı üret
+    
+    Python'un hash() fonksiyonu PYTHONHASHSEED ile her süreçte farklı sonuç
+    verdiğinden gunicorn worker'ları ve management komutları aynı prompt için
+    farklı anahtar üretiyordu. Alanlar sıralı JSON'a çevrilip SHA-256 alınır.
+    """
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return f"{prefix}:v{CACHE_KEY_VERSION}:{digest}"
+
 
 class OpenRouterService:
     """OpenRouter.ai entegrasyon servisi"""
@@ -20,12 +50,73 @@ class OpenRouterService:
         """
         self.api_key = config('OPENROUTER_API_KEY', default='')
         self.model = model or config('OPENROUTER_MODEL', default='anthropic/claude-3.5-sonnet')
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.base_url = f"{BASE_URL}/chat/completions"
+        # Birincil model + OPENROUTER_MODEL_CHAIN yedekleri (circuit breaker + hedging)
+        self.router = get_router(self.model)
+        # Son isteğin süre ölçümleri (connect, ttfb, total)
+        self.last_timing = None
         
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable gerekli!")
     
-    def generate_response(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7):
+    def _build_messages(self, prompt, system_prompt=None):
+        """Sohbet mesaj listesini hazırla"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _build_headers(self):
+        """API isteği header'ları"""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": config('SITE_URL', default='https://tarot-yorum.fun'),
+            "X-Title": "AstroTarot",
+            "Content-Type": "application/json"
+        }
+    
+    def _build_payload(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7, json_mode=False):
+        """Chat completion isteği gövdesi"""
+        payload = {
+            "model": self.model,
+            "messages": self._build_messages(prompt, system_prompt),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if json_mode:
+            # Destekleyen modeller yalnızca geçerli bir JSON nesnesi döndürür
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+    
+    def _cache_key(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7, language=None, json_mode=False):
+        """Yanıt cache anahtarı (model + promptlar + üretim parametreleri)"""
+        return build_cache_key(
+            'openrouter',
+            model=self.model,
+            system_prompt=system_prompt or '',
+            prompt=prompt,
+            temperature=float(temperature),
+            max_tokens=int(max_tokens),
+            language=language,
+            json_mode=bool(json_mode),
+        )
+    
+    def _extract_content(self, result):
+        """API yanıtından model çıktısını al"""
+        return result['choices'][0]['message']['content']
+    
+    def _log_timing(self, timing, model=None):
+        """İstek sürelerini kaydet ve logla"""
+        self.last_timing = timing
+        logger.info(
+            f"⏱️ OpenRouter {model or self.model}: connect={timing['connect']}s "
+            f"ttfb={timing['ttfb']}s total={timing['total']}s "
+            f"reused={timing['reused_connection']}"
+        )
+    
+    def generate_response(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7, language=None,
+                          json_mode=False, validate=None):
         """
         OpenRouter API kullanarak AI yanıtı üret
         
@@ -34,53 +125,65 @@ class OpenRouterService:
             system_prompt: Sistem mesajı (opsiyonel)
             max_tokens: Maksimum token sayısı
             temperature: Yaratıcılık seviyesi (0.0-2.0)
+            language: Yanıt dili (sadece cache anahtarında kullanılır)
+            json_mode: Modelden JSON nesnesi iste (response_format)
+            validate: Yanıtı kontrol eden fonksiyon; False döner veya ValueError
+                (ör. SchemaError) fırlatırsa yanıt cache'ten silinir, aynı prompt'la
+                yapılan yeniden deneme yeni bir istek atar
             
         Returns:
-            str: AI yanıtı
+            str: AI yanıtı (geçersiz olsa da döndürülür; kısmi sonuçları çağıran ayıklar)
         """
         # Cache kontrolü
-        cache_key = f"openrouter_{hash(prompt)}_{self.model}"
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, language, json_mode)
         cached_response = cache.get(cache_key)
         if cached_response:
             return cached_response
         
-        # Mesajları hazırla
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        # API isteği
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "HTTP-Referer": config('SITE_URL', default='https://tarot-yorum.fun'),
-            "X-Title": "AstroTarot",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-        }
+        payload = self._build_payload(prompt, system_prompt, max_tokens, temperature, json_mode)
         
+        # Aynı prompt için eşzamanlı istekler tek API çağrısını paylaşır (sonuç 1 saat cache'lenir)
+        response = single_flight(cache_key, lambda: self._request_completion(payload), result_timeout=3600)
+        if not self._is_valid(response, validate):
+            cache.delete(cache_key)
+        return response
+    
+    def _is_valid(self, response, validate):
+        """Yanıt cache'te kalabilir mi (validate verilmediyse her yanıt geçerlidir)"""
+        if validate is None:
+            return True
+        try:
+            if validate(response):
+                return True
+        except ValueError as e:
+            logger.warning(f"⚠️ Geçersiz yanıt cache'lenmedi: {e}")
+            return False
+        logger.warning("⚠️ Geçersiz yanıt cache'lenmedi")
+        return False
+    
+    def _request_completion(self, payload):
+        """Chat completion isteğini model zinciri üzerinden gönder ve model çıktısını döndür"""
         try:
-            response = requests.post(
+            model, content = self.router.run(lambda model: self._send_completion(payload, model))
+        except AllModelsFailed as e:
+            raise Exception(f"Tüm modeller başarısız: {str(e)}")
+        if model != self.model:
+            logger.info(f"🔀 Yanıt yedek modelden geldi: {model}")
+        return content
+    
+    def _send_completion(self, payload, model):
+        """Chat completion isteğini tek bir modele gönder"""
+        try:
+            response, timing = timed_request(
+                'POST',
                 self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=30
+                headers=self._build_headers(),
+                json={**payload, 'model': model},
             )
+            self._log_timing(timing, model)
             response.raise_for_status()
             
-            result = response.json()
-            ai_response = result['choices'][0]['message']['content']
-            
-            # Cache'e kaydet (1 saat)
-            cache.set(cache_key, ai_response, 3600)
-            
-            return ai_response
+            return self._extract_content(response.json())
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"OpenRouter API hatası: {str(e)}")
@@ -90,8 +193,9 @@ class OpenRouterService:
     def get_available_models(self):
         """Kullanılabilir modelleri listele"""
         try:
-            response = requests.get(
-                "https://openrouter.ai/api/v1/models",
+            response, _ = timed_request(
+                'GET',
+                f"{BASE_URL}/models",
                 headers={"Authorization": f"Bearer {self.api_key}"},
                 timeout=10
             )
@@ -107,6 +211,151 @@ class OpenRouterService:
         return f"openrouter:{self.model}"
 
 
+
+class AsyncOpenRouterService(OpenRouterService):
+    """
+    OpenRouter.ai async istemcisi
+    ASGI view'larında worker'ı bloklamadan yüzlerce LLM çağrısı bekletilebilir
+    """
+    
+    async def generate_response(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7, language=None,
+                                json_mode=False, validate=None):
+        """
+        OpenRouter API kullanarak AI yanıtı üret (async)
+        
+        Args ve dönüş değeri OpenRouterService.generate_response ile aynıdır.
+        """
+        # Cache kontrolü
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, language, json_mode)
+        cached_response = await cache.aget(cache_key)
+        if cached_response:
+            return cached_response
+        
+        payload = self._build_payload(prompt, system_prompt, max_tokens, temperature, json_mode)
+        
+        # Aynı prompt için eşzamanlı istekler tek API çağrısını paylaşır (sonuç 1 saat cache'lenir)
+        response = await async_single_flight(
+            cache_key, lambda: self._arequest_completion(payload), result_timeout=3600
+        )
+        if not self._is_valid(response, validate):
+            await cache.adelete(cache_key)
+        return response
+    
+    async def _arequest_completion(self, payload):
+        """Chat completion isteğini model zinciri üzerinden gönder (async)"""
+        try:
+            model, content = await self.router.arun(lambda model: self._asend_completion(payload, model))
+        except AllModelsFailed as e:
+            raise Exception(f"Tüm modeller başarısız: {str(e)}")
+        if model != self.model:
+            logger.info(f"🔀 Yanıt yedek modelden geldi: {model}")
+        return content
+    
+    async def _asend_completion(self, payload, model):
+        """Chat completion isteğini tek bir modele gönder (async)"""
+        try:
+            response, timing = await async_timed_request(
+                'POST',
+                self.base_url,
+                headers=self._build_headers(),
+                json={**payload, 'model': model},
+            )
+            self._log_timing(timing, model)
+            response.raise_for_status()
+            
+            return self._extract_content(response.json())
+            
+        except httpx.HTTPError as e:
+            raise Exception(f"OpenRouter API hatası: {str(e)}")
+        except (KeyError, IndexError) as e:
+            raise Exception(f"OpenRouter yanıt formatı hatası: {str(e)}")
+    
+    async def stream_response(self, prompt, system_prompt=None, max_tokens=1000, temperature=0.7, language=None):
+        """
+        OpenRouter yanıtını token token akıt (stream: true, SSE)
+        
+        Yields:
+            str: Model çıktısının bir sonraki parçası
+        """
+        # Cache'de varsa tek parça halinde döndür
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, language)
+        cached_response = await cache.aget(cache_key)
+        if cached_response:
+            yield cached_response
+            return
+        
+        # Akışta hedge yapılmaz: devresi kapalı ilk model seçilir, sonucu kaydedilir
+        model = await self.router.atake(await self.router.aavailable_models(), fallback=True)
+        health = self.router.health[model]
+        
+        payload = self._build_payload(prompt, system_prompt, max_tokens, temperature)
+        payload['model'] = model
+        payload['stream'] = True
+        
+        client = get_async_client()
+        chunks = []
+        start = time.perf_counter()
+        ttft = None
+        completed = failed = False
+        
+        try:
+            try:
+                async with client.stream('POST', self.base_url, headers=self._build_headers(), json=payload) as response:
+                    response.raise_for_status()
+                    ttfb = time.perf_counter() - start
+                
+                    async for line in response.aiter_lines():
+                        # SSE yorum satırları (": OPENROUTER PROCESSING") ve boş satırlar atlanır
+                        if not line.startswith('data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == '[DONE]':
+                            break
+                    
+                        delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                        if not delta:
+                            continue
+                        if ttft is None:
+                            ttft = time.perf_counter() - start
+                        chunks.append(delta)
+                        yield delta
+                completed = True
+            except httpx.HTTPError as e:
+                failed = True
+                raise Exception(f"OpenRouter API hatası: {str(e)}")
+            except (KeyError, IndexError, ValueError) as e:
+                failed = True
+                raise Exception(f"OpenRouter yanıt formatı hatası: {str(e)}")
+        finally:
+            # İstemci bağlantıyı kestiğinde (GeneratorExit/iptal) de sonuç kaydedilir;
+            # aksi halde half-open deneme hakkı soğuma süresi boyunca kilitli kalır
+            if failed:
+                await health.arecord_failure()
+            elif not completed:
+                if chunks:
+                    # Model yanıt veriyordu: devre kapanır, yarım süre gecikme örneği sayılmaz
+                    await health.arecord_success()
+                else:
+                    await health.arelease_probe()
+        
+        total = time.perf_counter() - start
+        # Hedge eşiği tam yanıt süresine göre hesaplandığından toplam süre kaydedilir
+        await health.arecord_success(total)
+        self.last_timing = {
+            'ttfb': round(ttfb, 4),
+            'ttft': round(ttft, 4) if ttft is not None else None,
+            'total': round(total, 4),
+        }
+        logger.info(
+            f"⏱️ OpenRouter stream {model}: ttfb={self.last_timing['ttfb']}s "
+            f"ttft={self.last_timing['ttft']}s total={self.last_timing['total']}s"
+        )
+        
+        # Tam yanıtı cache'e kaydet (1 saat)
+        ai_response = ''.join(chunks)
+        if ai_response:
+            await cache.aset(cache_key, ai_response, 3600)
+
 # Varsayılan sistem promptları
 DEFAULT_TAROT_PROMPT = """Sen uzman bir tarot yorumcususun. Kartların anlamlarını detaylı, anlayışlı 
 ve empatik bir şekilde açıkla. Yorumların pozitif ama gerçekçi olsun. Türkçe yaz."""
@@ -0,0 +1,280 @@
+"""
+Yerel OpenRouter (OpenAI uyumlu) taklit sunucusu
+Yük testleri ve ağsız ortamda tekrarlanabilir benchmark için kullanılır.
+Gerçek model yerine ayarlanabilir gecikme dağılımıyla, burç/tarot bölüm
+formatında hazır yanıtlar döndürür; stream (SSE), 5xx ve 429 hataları desteklenir.
+
+Kullanım:
+    python manage.py run_openrouter_stub --port 8001 --latency lognormal --latency-mean 1500
+    OPENROUTER_BASE_URL=http://127.0.0.1:8001/api/v1 python manage.py batch_generate_horoscopes --force
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+# Prompttaki "1. GENEL: ..." biçimli başlıklar
+_SECTION_RE = re.compile(r'^\s*\d+\.\s*([A-ZÇĞİÖŞÜ][A-ZÇĞİÖŞÜ ]+?)\s*:', re.MULTILINE)
+# Toplu JSON promptundaki "- aries: Koç (...)" satırları
+_SIGN_KEY_RE = re.compile(r'^-\s*([a-z0-9_-]+):', re.MULTILINE)
+# JSON metin alanlarına yazılan cümle sayısı; en uzun en az uzunluğu (doğum haritası
+# kişilik bölümü, 200 karakter) karşılar, en kısa en fazla uzunluğu aşmaz
+JSON_SENTENCES = 5
+
+SENTENCES = [
+    "Bugün enerjiniz yüksek ve çevrenizdekilere ilham veriyorsunuz.",
+    "Uzun süredir ertelediğiniz bir konuyu ele almak için doğru zaman.",
+    "İç sesinize kulak verin; sezgileriniz sizi doğru yöne götürecek.",
+    "Küçük adımlar büyük değişimlerin habercisi olabilir.",
+    "Sabırlı olmanız, beklediğiniz fırsatın kapınızı çalmasını sağlayacak.",
+    "Yakınlarınızla yapacağınız açık bir konuşma ilişkilerinizi güçlendirecek.",
+    "Planlarınızı gözden geçirip önceliklerinizi netleştirmeniz faydalı olur.",
+    "Kendinize ayıracağınız kısa bir mola zihninizi tazeleyecek.",
+]
+
+
+class StubConfig:
+    """Taklit sunucunun davranış ayarları"""
+
+    def __init__(self, latency='lognormal', latency_mean=1200.0, latency_sd=400.0,
+                 error_rate=0.0, throttle_rate=0.0, chunk_delay=20.0, seed=None):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Geçersiz gecikme dağılımı: {latency}")
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_sd = latency_sd
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.chunk_delay = chunk_delay
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self, func, *args):
+        # random.Random thread-safe değil; seed ile tekrarlanabilirlik için kilitle
+        with self._lock:
+            return func(*args)
+
+    def sample_latency(self):
+        """Tam yanıt gecikmesi (saniye)"""
+        mean, sd = self.latency_mean, self.latency_sd
+        if self.latency == 'fixed':
+            value = mean
+        elif self.latency == 'uniform':
+            value = self._draw(self.random.uniform, max(0.0, mean - sd), mean + sd)
+        elif self.latency == 'normal':
+            value = self._draw(self.random.gauss, mean, sd)
+        else:
+            # Ortalama ve standart sapması verilen değerlere eşit lognormal
+            sigma2 = math.log(1 + (sd / mean) ** 2) if mean > 0 else 0.0
+            mu = math.log(mean) - sigma2 / 2 if mean > 0 else 0.0
+            value = self._draw(self.random.lognormvariate, mu, math.sqrt(sigma2))
+        return max(0.0, value) / 1000.0
+
+    def sample_failure(self):
+        """Bu istek için döndürülecek hata kodu; hata yoksa None"""
+        roll = self._draw(self.random.random)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+    def sentences(self, count):
+        return ' '.join(self._draw(self.random.sample, SENTENCES, min(count, len(SENTENCES))))
+
+
+def _example_document(prompt):
+    """Promptun sonundaki örnek JSON yapısı (json.dumps ile tek satır); yoksa None"""
+    for line in reversed(prompt.splitlines()):
+        line = line.strip()
+        if line.startswith('{'):
+            try:
+                document = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(document, dict):
+                return document
+    return None
+
+
+def _fill(value, key, config):
+    """Örnek yapıdaki yer tutucuları doğrulamayı geçecek değerlerle doldur"""
+    if isinstance(value, dict):
+        return {name: _fill(item, name, config) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, key, config) for item in value]
+    if isinstance(value, int) or key.endswith('_score'):
+        return config._draw(config.random.randint, 4, 9)
+    return config.sentences(JSON_SENTENCES)
+
+
+def build_json_document(prompt, config):
+    """
+    JSON modundaki istekler için promptta istenen yapıda belge üret
+
+    Tek burç/ürün istekleri düz alan anahtarlarını ('general', 'love', ...) alır;
+    toplu burç isteğinde örnek yalnızca ilk burcu gösterdiğinden yapısı promptta
+    listelenen tüm burç kodlarına uygulanır.
+    """
+    example = _example_document(prompt)
+    if example is None:
+        example = {'signs': {'sign': {'general': '...', 'mood_score': 7}}}
+
+    signs = example.get('signs')
+    if isinstance(signs, dict) and signs:
+        template = next(iter(signs.values()))
+        keys = _SIGN_KEY_RE.findall(prompt) or list(signs)
+        return {'signs': {key: _fill(template, key, config) for key in keys}}
+    return _fill(example, '', config)
+
+
+def build_content(messages, json_mode, config):
+    """Prompta uygun hazır yanıt metni üret"""
+    prompt = '\n'.join(str(m.get('content', '')) for m in messages if m.get('role') == 'user')
+
+    if json_mode:
+        return json.dumps(build_json_document(prompt, config), ensure_ascii=False)
+
+    sections = list(dict.fromkeys(_SECTION_RE.findall(prompt)))
+    if not sections:
+        # Tarot yorumu gibi serbest metin istekleri
+        return '\n\n'.join(config.sentences(4) for _ in range(3))
+
+    return '\n\n'.join(
+        f"{index}. {name}:\n{config.sentences(3)}"
+        for index, name in enumerate(sections, start=1)
+    )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI uyumlu /chat/completions ve /models uç noktaları"""
+
+    server_version = 'OpenRouterStub/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def config(self):
+        return self.server.stub_config
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'data': [{'id': 'stub/horoscope', 'name': 'Stub'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'Invalid JSON'}})
+            return
+
+        latency = self.config.sample_latency()
+        failure = self.config.sample_failure()
+        self.server.record(failure)
+
+        if failure:
+            time.sleep(latency * 0.2)
+            headers = {'Retry-After': '1'} if failure == 429 else None
+            self._send_json(failure, {'error': {'message': 'Stub hata', 'code': failure}}, headers)
+            return
+
+        json_mode = (payload.get('response_format') or {}).get('type') == 'json_object'
+        content = build_content(payload.get('messages') or [], json_mode, self.config)
+        model = payload.get('model') or 'stub/horoscope'
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+        if payload.get('stream'):
+            self._stream(completion_id, model, content, latency)
+            return
+
+        time.sleep(latency)
+        self._send_json(200, {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': length // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (length + len(content)) // 4,
+            },
+        })
+
+    def _stream(self, completion_id, model, content, latency):
+        """SSE akışı: gecikmenin tamamı ilk parçadan önce, sonra kelime kelime"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        time.sleep(latency)
+        self.wfile.write(b': OPENROUTER PROCESSING\n\n')
+
+        for word in re.findall(r'\S+\s*', content):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(self.config.chunk_delay / 1000.0)
+
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    """İstek/hata sayaçlarını tutan çok thread'li taklit sunucu"""
+
+    daemon_threads = True
+
+    def __init__(self, address, stub_config):
+        super().__init__(address, StubHandler)
+        self.stub_config = stub_config
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+
+    def record(self, failure):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            if failure == 429:
+                self.stats['throttled'] += 1
+            elif failure:
+                self.stats['errors'] += 1
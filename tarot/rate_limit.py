@@ -0,0 +1,304 @@
+"""
+Dış API'ler için küme genelinde hız sınırlayıcı (token bucket)
+OpenRouter, EPROLO, Printify ve Instagram Graph API çağrıları sağlayıcı bazında
+bir token kovasından geçer. Kova durumu paylaşılan cache'de (Redis) tutulur;
+tüm gunicorn worker'ları, job worker'ları ve management komutları aynı kotayı
+paylaşır.
+
+Öncelik sınıfları:
+- interactive: Web istekleri ve kullanıcının beklediği işler. Kovanın tamamını kullanabilir.
+- batch: Toplu komutlar. Kovada RATE_LIMIT_BATCH_RESERVE oranında token
+  interaktif trafiğe ayrılır; batch istekleri bu seviyenin altına inemez.
+
+HTTP istemcileri (http_session) sağlayıcıyı URL'den bulur ve sınırlayıcıyı
+otomatik kullanır; çağıran kodun bir şey yapması gerekmez.
+
+Paylaşılan cache erişilemezse (Redis kapalı) süreç içi kovaya düşülür: kota
+küme genelinde değil süreç başına uygulanır, ama dış çağrılar durmaz.
+"""
+import asyncio
+import contextvars
+import random
+import threading
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.cache import caches
+
+from .singleflight import release_lock
+
+logger = logging.getLogger(__name__)
+
+# Sağlayıcı bütçeleri: "dakikadaki istek/kova kapasitesi"
+PROVIDER_BUDGETS = {
+    'openrouter': config('RATE_LIMIT_OPENROUTER', default='120/20'),
+    'eprolo': config('RATE_LIMIT_EPROLO', default='60/10'),
+    'printify': config('RATE_LIMIT_PRINTIFY', default='500/50'),
+    'instagram': config('RATE_LIMIT_INSTAGRAM', default='3/5'),
+    'nominatim': config('RATE_LIMIT_NOMINATIM', default='60/1'),
+}
+
+# URL host'u -> sağlayıcı
+PROVIDER_HOSTS = {
+    'openrouter.ai': 'openrouter',
+    'api-b2b.eprolo.com': 'eprolo',
+    'api.printify.com': 'printify',
+    'graph.facebook.com': 'instagram',
+    'nominatim.openstreetmap.org': 'nominatim',
+}
+
+PRIORITIES = ('interactive', 'batch')
+# Batch isteklerinin dokunamayacağı kova oranı
+BATCH_RESERVE = config('RATE_LIMIT_BATCH_RESERVE', default=0.5, cast=float)
+# Token beklenecek en uzun süre (saniye); aşılırsa RateLimited fırlatılır
+MAX_WAIT = {
+    'interactive': config('RATE_LIMIT_INTERACTIVE_WAIT', default=10, cast=float),
+    'batch': config('RATE_LIMIT_BATCH_WAIT', default=300, cast=float),
+}
+ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+
+LOCK_TIMEOUT = 2
+STATE_TIMEOUT = 3600
+
+# Süreç varsayılanı (management komutları 'batch' yapar) ve bağlam bazında geçersiz kılma.
+# ThreadPoolExecutor thread'leri contextvar'ları devralmadığı için süreç varsayılanı da tutulur.
+_default_priority = 'interactive'
+_priority = contextvars.ContextVar('rate_limit_priority', default=None)
+
+# Paylaşılan cache erişilemezken kullanılan süreç içi kovalar: sağlayıcı -> (token, zaman)
+_local_buckets = {}
+_local_lock = threading.Lock()
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """Sağlayıcı kotası izin verilen bekleme süresi içinde açılmadı"""
+
+
+def _shared_cache():
+    # L1 (süreç içi) katmanı atlanır; kova durumu her zaman Redis'ten okunmalı
+    return caches['shared']
+
+
+def parse_budget(value):
+    """'120/20' -> (saniyedeki token, kapasite)"""
+    per_minute, _, burst = str(value).partition('/')
+    per_minute = float(per_minute)
+    return per_minute / 60.0, float(burst or max(1.0, per_minute / 6))
+
+
+def provider_for_url(url):
+    """URL'nin ait olduğu sağlayıcı; sınırlanmayan host'lar için None"""
+    host = (urlsplit(str(url)).hostname or '').lower()
+    return PROVIDER_HOSTS.get(host)
+
+
+def set_default_priority(name):
+    """Süreç genelindeki varsayılan öncelik (ör. toplu komutlarda 'batch')"""
+    global _default_priority
+    if name not in PRIORITIES:
+        raise ValueError(f"Geçersiz öncelik: {name}")
+    _default_priority = name
+
+
+def current_priority():
+    return _priority.get() or _default_priority
+
+
+@contextmanager
+def priority(name):
+    """Blok içindeki istekleri verilen öncelik sınıfıyla çalıştır"""
+    if name not in PRIORITIES:
+        raise ValueError(f"Geçersiz öncelik: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _key(provider, name):
+    return f"ratelimit:{provider}:{name}"
+
+
+def try_acquire(provider, priority_name=None):
+    """
+    Kovadan bir token almayı dene
+
+    Returns:
+        0.0 token alındıysa; aksi halde tekrar denemeden önce beklenecek süre (saniye)
+    """
+    if not ENABLED or provider not in PROVIDER_BUDGETS:
+        return 0.0
+
+    shared = _shared_cache()
+    rate, capacity = parse_budget(PROVIDER_BUDGETS[provider])
+    priority_name = priority_name or current_priority()
+    # Ayrılan pay en fazla kapasite - 1 olabilir; aksi halde kapasitesi küçük
+    # kovalarda (ör. nominatim 60/1) batch istekleri hiç token alamaz
+    floor = max(0.0, min(capacity * BATCH_RESERVE, capacity - 1)) if priority_name == 'batch' else 0.0
+
+    # Sağlayıcı 429 döndürdüyse Retry-After süresince kimse istek atmaz
+    blocked_until = shared.get(_key(provider, 'blocked'))
+    now = time.time()
+    if blocked_until and blocked_until > now:
+        return blocked_until - now
+
+    # Okuma-hesaplama-yazma adımı tüm süreçlerde tek seferde bir kişi tarafından yapılır.
+    # Kilidin değeri sahibinin token'ıdır; süresi dolup başkasına geçen kilit silinmez.
+    lock_key = _key(provider, 'lock')
+    token = uuid.uuid4().hex
+    added = shared.add(lock_key, token, LOCK_TIMEOUT)
+    if added is None:
+        # django-redis IGNORE_EXCEPTIONS: Redis erişilemiyor
+        return _local_try_acquire(provider, rate, capacity, floor)
+    if not added:
+        return 0.05 + random.random() * 0.05
+
+    try:
+        bucket = shared.get(_key(provider, 'bucket'))
+        tokens, delay, now = _take(bucket, rate, capacity, floor)
+        shared.set(_key(provider, 'bucket'), (tokens, now), STATE_TIMEOUT)
+        return delay
+    finally:
+        release_lock(lock_key, token)
+
+
+def _take(bucket, rate, capacity, floor):
+    """
+    Kovayı doldur ve mümkünse bir token düş
+
+    Returns:
+        (kalan token, bekleme süresi - alındıysa 0.0, şimdiki zaman)
+    """
+    now = time.time()
+    tokens, updated_at = bucket or (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+    if tokens - 1 >= floor:
+        return tokens - 1, 0.0, now
+    return tokens, (floor + 1 - tokens) / rate, now
+
+
+def _local_try_acquire(provider, rate, capacity, floor):
+    """Paylaşılan cache yokken süreç içi kovadan token al (fail-open yerine süreç başına kota)"""
+    with _local_lock:
+        if provider not in _local_buckets:
+            logger.warning(f"⚠️ Hız sınırlayıcı: paylaşılan cache erişilemiyor, {provider} için süreç içi kova kullanılıyor")
+        tokens, delay, now = _take(_local_buckets.get(provider), rate, capacity, floor)
+        _local_buckets[provider] = (tokens, now)
+        return delay
+
+
+def acquire(provider, priority_name=None):
+    """
+    Token alınana kadar bekle
+
+    Returns:
+        float: Beklenen süre (saniye)
+
+    Raises:
+        RateLimited: Öncelik sınıfının bekleme süresi aşıldıysa
+    """
+    priority_name = priority_name or current_priority()
+    deadline = time.monotonic() + MAX_WAIT[priority_name]
+    start = time.monotonic()
+
+    while True:
+        delay = try_acquire(provider, priority_name)
+        if delay == 0.0:
+            return _log_wait(provider, priority_name, time.monotonic() - start)
+        if time.monotonic() + delay > deadline:
+            raise RateLimited(f"{provider} hız sınırı aşıldı ({priority_name})")
+        time.sleep(min(delay, 1.0))
+
+
+async def aacquire(provider, priority_name=None):
+    """acquire'ın async versiyonu; Redis çağrıları thread'de yapılır, event loop bloklanmaz"""
+    priority_name = priority_name or current_priority()
+    deadline = time.monotonic() + MAX_WAIT[priority_name]
+    start = time.monotonic()
+
+    while True:
+        delay = await atry_acquire(provider, priority_name)
+        if delay == 0.0:
+            return _log_wait(provider, priority_name, time.monotonic() - start)
+        if time.monotonic() + delay > deadline:
+            raise RateLimited(f"{provider} hız sınırı aşıldı ({priority_name})")
+        await asyncio.sleep(min(delay, 1.0))
+
+
+def _log_wait(provider, priority_name, waited):
+    if waited >= 1.0:
+        logger.info(f"🚦 Hız sınırı: {provider} ({priority_name}) {waited:.1f}s beklendi")
+    return waited
+
+
+def penalize(provider, response):
+    """429 yanıtında tüm küme için Retry-After süresi kadar (varsayılan 30s) istekleri durdur"""
+    try:
+        retry_after = float(response.headers.get('Retry-After', 30))
+    except (TypeError, ValueError):
+        retry_after = 30.0
+
+    shared = _shared_cache()
+    shared.set(_key(provider, 'blocked'), time.time() + retry_after, int(retry_after) + 1)
+    # Kova boşaltılır; dolum ancak bekleme bittikten sonra başlar
+    shared.set(_key(provider, 'bucket'), (0.0, time.time() + retry_after), STATE_TIMEOUT)
+    with _local_lock:
+        if provider in _local_buckets:
+            _local_buckets[provider] = (0.0, time.time() + retry_after)
+    logger.warning(f"🚦 {provider} 429 döndürdü, {retry_after:.0f}s duraklatıldı")
+
+
+# Yalnızca cache'e dokunur (veritabanı yok); isteğin thread'ine bağlanması gerekmez
+atry_acquire = sync_to_async(try_acquire, thread_sensitive=False)
+apenalize = sync_to_async(penalize, thread_sensitive=False)
+
+
+class RateLimitedSession(requests.Session):
+    """İstek göndermeden önce URL'nin sağlayıcısından token alan Session"""
+
+    def request(self, method, url, *args, **kwargs):
+        provider = provider_for_url(url)
+        if provider:
+            acquire(provider)
+        response = super().request(method, url, *args, **kwargs)
+        if provider and response.status_code == 429:
+            penalize(provider, response)
+        return response
+
+
+async def httpx_request_hook(request):
+    """httpx.AsyncClient 'request' event hook'u"""
+    provider = provider_for_url(request.url)
+    if provider:
+        await aacquire(provider)
+
+
+async def httpx_response_hook(response):
+    """httpx.AsyncClient 'response' event hook'u"""
+    provider = provider_for_url(response.request.url)
+    if provider and response.status_code == 429:
+        await apenalize(provider, response)
+
+
+def status():
+    """Admin/izleme için sağlayıcıların anlık kova durumu"""
+    shared = _shared_cache()
+    result = {}
+    for provider, budget in PROVIDER_BUDGETS.items():
+        rate, capacity = parse_budget(budget)
+        tokens, updated_at = shared.get(_key(provider, 'bucket')) or (capacity, time.time())
+        tokens = min(capacity, tokens + max(0.0, time.time() - updated_at) * rate)
+        result[provider] = {
+            'per_minute': round(rate * 60, 2),
+            'capacity': capacity,
+            'tokens': round(tokens, 2),
+            'blocked': bool(shared.get(_key(provider, 'blocked'))),
+        }
+    return result
@@ -0,0 +1,309 @@
+"""
+Benzer sorular için tarot yorumu yeniden kullanımı
+Soru metni normalize edilir (Türkçe büyük/küçük harf, aksan katlama, dolgu
+kelimeleri; kelime sırası korunur) ve aynı kart/yön/pozisyon dizilimi için
+önceki yorumlar küçük bir MinHash indeksinde (kelime + sıralı kelime ikilisi)
+tutulur:
+
+- Normalize edilmiş soru birebir aynıysa: önceki yorum döndürülür (exact)
+- Benzerlik >= TAROT_REUSE_THRESHOLD: önceki yorum döndürülür (near)
+- Benzerlik >= TAROT_FEW_SHOT_THRESHOLD: önceki yorum prompt'a üslup örneği olarak eklenir (few_shot)
+
+Yorumlar kişiseldir: exact/near yalnızca aynı kullanıcının önceki yorumu veya
+orijinal soru metni birebir aynı olan yorum için geçerlidir. Diğer
+kullanıcıların yorumları yalnızca anonimleştirilerek few-shot örneği olur.
+
+İndeks ve isabet sayaçları doğrudan paylaşılan cache'de tutulur (tüm worker'lar
+ortak; süreç içi L1 katmanı atlanır). Redis'te kova atomik RPUSH + LTRIM ile
+yazılır, sayaçlar INCR ile artar; eşzamanlı yazımlar birbirini ezmez.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import unicodedata
+import logging
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.cache import caches
+
+from .openrouter_service import build_cache_key
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config('TAROT_REUSE_ENABLED', default=True, cast=bool)
+REUSE_THRESHOLD = config('TAROT_REUSE_THRESHOLD', default=0.85, cast=float)
+FEW_SHOT_THRESHOLD = config('TAROT_FEW_SHOT_THRESHOLD', default=0.5, cast=float)
+# Aynı kart dizilimi için tutulan en fazla önceki soru
+BUCKET_SIZE = config('TAROT_REUSE_BUCKET_SIZE', default=20, cast=int)
+REUSE_TTL = config('TAROT_REUSE_TTL', default=86400, cast=int)
+
+NUM_PERM = 64
+_PRIME = (1 << 61) - 1
+# Sabit tohum: imzalar süreçler ve yeniden başlatmalar arasında karşılaştırılabilir
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+OUTCOMES = ('exact', 'near', 'few_shot', 'miss')
+
+# Soru anlamını değiştirmeyen dolgu kelimeleri (aksanları katlanmış halde).
+# "is" (iş) ve "on" gibi katlanınca Türkçe kelimeyle çakışan İngilizce kelimeler dahil edilmez.
+STOPWORDS = frozenset("""
+acaba ama ancak bana bazi ben beni benim bir biraz bu bunu bunun da de daha diye en gibi
+hangi hem icin ile ise iste kadar ki mi mu ne neden neler nasil o olan olarak olur olacak
+sey simdi su sunu ve veya ya yani yine
+a an and are do does for how in it me my of or the to what when will with you
+""".split())
+
+# Türkçe'ye özgü harfler ASCII karşılıklarına katlanır ("ask" ile "aşk" eşleşsin)
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_NON_WORD_RE = re.compile(r'[^\w\s]+')
+# Few-shot örneğinden çıkarılan kişisel ayrıntılar (e-posta, telefon/tarih gibi sayılar)
+_PERSONAL_RE = re.compile(r'\S+@\S+|\+?\d[\d\s./-]{3,}\d')
+
+# Redis yokken (süreç içi backend) kovanın oku-değiştir-yaz kilidi
+_bucket_lock = threading.Lock()
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harfe çevir (I -> ı, İ -> i)"""
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def normalize_question(text):
+    """
+    Soruyu karşılaştırma için kanonik biçime getir
+
+    'Aşkta beni NELER bekliyor?' -> 'askta bekliyor'
+    """
+    text = unicodedata.normalize('NFC', text or '')
+    text = turkish_lower(text).translate(_FOLD)
+    # Kalan birleşik aksan işaretlerini at
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    words = _NON_WORD_RE.sub(' ', text).split()
+    # Sıra korunur: "A mı B mi" ile "B mi A mı" aynı soru sayılmamalı
+    return ' '.join(word for word in words if word not in STOPWORDS and len(word) > 1)
+
+
+def shingles(normalized):
+    """
+    Kelimeler ve sıralı kelime ikilileri
+
+    Karakter trigramlarının aksine yer değiştiren kelimeler ve olumsuzluk eki
+    ('gitmeli' / 'gitmemeli') benzerliği belirgin biçimde düşürür.
+    """
+    words = normalized.split()
+    if not words:
+        return {''}
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+def _shingle_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(normalized):
+    """Kelime ve kelime ikilisi kümesinin (bkz. shingles) MinHash imzası (NUM_PERM tamsayı)"""
+    hashes = [_shingle_hash(shingle) for shingle in shingles(normalized)]
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(signature1, signature2):
+    """İki MinHash imzasından tahmini Jaccard benzerliği"""
+    matches = sum(1 for x, y in zip(signature1, signature2) if x == y)
+    return matches / NUM_PERM
+
+
+def cards_signature(cards):
+    """Pozisyona göre sıralı (kart, pozisyon, ters mi) dizilimi"""
+    signature = []
+    for card_data in cards:
+        card_obj = card_data.get('card', {})
+        card_name = card_obj.get('name', '') if isinstance(card_obj, dict) else getattr(card_obj, 'name', '')
+        signature.append((str(card_data.get('position', '')), card_name, bool(card_data.get('is_reversed', False))))
+    return sorted(signature)
+
+
+def _shared_cache():
+    # L1 (süreç içi, 30 sn) katmanı atlanır; yeni yorum ve sayaçlar tüm worker'lara hemen görünmeli
+    return caches['shared']
+
+
+def _redis(shared):
+    client = getattr(shared, 'client', None)
+    if client is not None and hasattr(client, 'get_client'):
+        return client
+    return None
+
+
+def _bucket_key(cards, spread_name, language, model):
+    return build_cache_key(
+        'tarot_reuse', cards=cards_signature(cards), spread_name=spread_name, language=language, model=model,
+    )
+
+
+def _read_bucket(key):
+    """Kovadaki kayıtlar (eskiden yeniye); aynı (soru, kullanıcı) için yalnızca en yenisi"""
+    shared = _shared_cache()
+    client = _redis(shared)
+    if client is None:
+        return shared.get(key) or []
+    try:
+        raw = client.get_client(write=False).lrange(client.make_key(key), 0, -1)
+    except Exception as e:
+        logger.warning(f"⚠️ Yeniden kullanım kovası okunamadı: {e}")
+        return []
+    entries = {}
+    for value in raw:
+        entry = json.loads(value)
+        entries.pop((entry['question'], entry.get('user_id')), None)
+        entries[(entry['question'], entry.get('user_id'))] = entry
+    return list(entries.values())
+
+
+def _append_to_bucket(key, entry):
+    shared = _shared_cache()
+    client = _redis(shared)
+    if client is None:
+        # Süreç içi backend (geliştirme): kova yalnızca bu süreçte, kilit yeterli
+        with _bucket_lock:
+            entries = [
+                previous for previous in (shared.get(key) or [])
+                if (previous['question'], previous.get('user_id')) != (entry['question'], entry['user_id'])
+            ]
+            entries.append(entry)
+            shared.set(key, entries[-BUCKET_SIZE:], REUSE_TTL)
+        return
+
+    # Aynı (soru, kullanıcı) tekrarları okurken elenir; eski kopyalar LTRIM ile düşer
+    redis_key = client.make_key(key)
+    try:
+        pipe = client.get_client(write=True).pipeline()
+        pipe.rpush(redis_key, json.dumps(entry, ensure_ascii=False))
+        pipe.ltrim(redis_key, -BUCKET_SIZE, -1)
+        pipe.expire(redis_key, REUSE_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Yeniden kullanım kovasına yazılamadı: {e}")
+
+
+def _record(outcome):
+    shared = _shared_cache()
+    key = f"tarot_reuse:stats:{outcome}"
+    shared.add(key, 0, None)
+    try:
+        shared.incr(key)
+    except ValueError:
+        shared.set(key, 1, None)
+
+
+def anonymize(interpretation, question):
+    """Başka kullanıcının yorumunu few-shot örneği için kişisel ayrıntılardan arındır"""
+    text = interpretation
+    question = (question or '').strip()
+    if question:
+        text = text.replace(question, '…')
+    text = _PERSONAL_RE.sub('…', text)
+    # Soruya doğrudan atıf yapan satırlar (ör. "Sorunuz: ...") örnekte gerekmez
+    lines = [line for line in text.splitlines() if not line.lower().lstrip('#* ').startswith(('soru', 'question'))]
+    return '\n'.join(lines).strip()
+
+
+def _is_reusable(entry, question, user_id):
+    """Yorum aynen döndürülebilir mi: aynı kullanıcı veya birebir aynı soru metni"""
+    if entry.get('text') == question.strip():
+        return True
+    return user_id is not None and entry.get('user_id') == user_id
+
+
+def lookup(question, cards, spread_name, language, model, user_id=None):
+    """
+    Önceki yorumlar arasında benzer soruyu ara
+
+    Args:
+        user_id: Soruyu soran kullanıcı; yalnızca onun yorumları (ve orijinal
+            metni birebir aynı sorular) aynen yeniden kullanılır
+
+    Returns:
+        (outcome, interpretation) - outcome: 'exact', 'near', 'few_shot' veya 'miss'.
+        'few_shot' durumunda interpretation prompt'a örnek olarak eklenecek yorumdur
+        (başka kullanıcıya aitse anonimleştirilmiş).
+    """
+    if not ENABLED:
+        return 'miss', None
+
+    question = question or ''
+    normalized = normalize_question(question)
+    entries = _read_bucket(_bucket_key(cards, spread_name, language, model))
+
+    signature = minhash(normalized) if entries else None
+    best_score, best_entry = 0.0, None
+    own_score, own_entry = 0.0, None
+    for entry in entries:
+        score = 1.0 if entry['question'] == normalized else similarity(signature, entry['minhash'])
+        if score > best_score:
+            best_score, best_entry = score, entry
+        if score > own_score and _is_reusable(entry, question, user_id):
+            own_score, own_entry = score, entry
+
+    if own_entry is not None and own_entry['question'] == normalized:
+        outcome, best_score, best_entry = 'exact', own_score, own_entry
+    elif own_score >= REUSE_THRESHOLD:
+        outcome, best_score, best_entry = 'near', own_score, own_entry
+    elif best_entry is not None and best_score >= FEW_SHOT_THRESHOLD:
+        outcome = 'few_shot'
+    else:
+        outcome = 'miss'
+
+    _record(outcome)
+    if outcome == 'miss':
+        return outcome, None
+
+    logger.info(f"♻️ Yorum yeniden kullanımı: {outcome} (benzerlik={best_score:.2f})")
+    interpretation = best_entry['interpretation']
+    if not _is_reusable(best_entry, question, user_id):
+        interpretation = anonymize(interpretation, best_entry.get('text'))
+    return outcome, interpretation
+
+
+def remember(question, cards, spread_name, language, model, interpretation, user_id=None):
+    """Üretilen yorumu kart dizilimi kovasına ekle (en yeni BUCKET_SIZE kayıt tutulur)"""
+    if not ENABLED or not interpretation:
+        return
+
+    question = (question or '').strip()
+    normalized = normalize_question(question)
+    _append_to_bucket(_bucket_key(cards, spread_name, language, model), {
+        'question': normalized,
+        'text': question,
+        'user_id': user_id,
+        'minhash': list(minhash(normalized)),
+        'interpretation': interpretation,
+    })
+
+
+alookup = sync_to_async(lookup)
+aremember = sync_to_async(remember)
+
+
+def stats(reset=False):
+    """Sonuç sayaçları ve isabet oranları (tüm worker'lar)"""
+    keys = [f"tarot_reuse:stats:{outcome}" for outcome in OUTCOMES]
+    shared = _shared_cache()
+    values = shared.get_many(keys)
+    counts = {outcome: values.get(key, 0) for outcome, key in zip(OUTCOMES, keys)}
+    total = sum(counts.values())
+
+    result = dict(counts)
+    result['total'] = total
+    result['reuse_rate'] = round((counts['exact'] + counts['near']) / total, 4) if total else 0.0
+    result['few_shot_rate'] = round(counts['few_shot'] / total, 4) if total else 0.0
+
+    if reset:
+        shared.delete_many(keys)
+    return result
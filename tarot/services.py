@@ -4,7 +4,14 @@ Tek bir API ile tüm AI modellerine erişim
 """
 import logging
 from django.core.cache import cache
-from .openrouter_service import OpenRouterService, DEFAULT_TAROT_PROMPT, DEFAULT_ZODIAC_PROMPT
+from django.db import IntegrityError
+from .models import DailyCardInterpretation
+from .openrouter_service import (
+    OpenRouterService, AsyncOpenRouterService, DEFAULT_TAROT_PROMPT, DEFAULT_ZODIAC_PROMPT,
+    build_cache_key
+)
+from .singleflight import single_flight, async_single_flight
+from . import reuse
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -26,35 +33,165 @@ class AIService:
         except Exception as e:
             logger.error(f"❌ AI Service başlatılamadı: {str(e)}")
             raise
+        self._async_openrouter = None
     
-    def generate_interpretation(self, question, cards, spread_name, language='tr'):
-        """Tarot yorumu üret"""
+    @property
+    def async_openrouter(self):
+        """Async view'lar için aynı modele bağlı AsyncOpenRouterService"""
+        if self._async_openrouter is None:
+            self._async_openrouter = AsyncOpenRouterService(model=self.openrouter.model)
+        return self._async_openrouter
+    
+    def _cards_signature(self, cards):
+        """Kart listesinin kararlı gösterimi: (kart adı, pozisyon, ters mi)"""
+        signature = []
+        for card_data in cards:
+            card_obj = card_data.get('card', {})
+            card_name = card_obj.get('name', '') if isinstance(card_obj, dict) else getattr(card_obj, 'name', '')
+            signature.append([card_name, str(card_data.get('position', '')), bool(card_data.get('is_reversed', False))])
+        return signature
+    
+    def _cache_key(self, question, cards, spread_name, language):
+        """Yorum cache anahtarı - worker'lar ve yeniden başlatmalar arasında kararlı"""
+        return build_cache_key(
+            'tarot',
+            model=self.openrouter.model,
+            system_prompt=DEFAULT_TAROT_PROMPT,
+            question=question,
+            cards=self._cards_signature(cards),
+            spread_name=spread_name,
+            temperature=0.8,
+            max_tokens=1000,
+            language=language,
+        )
+    
+    def generate_interpretation(self, question, cards, spread_name, language='tr', user_id=None):
+        """
+        Tarot yorumu üret
+        
+        user_id: Soruyu soran kullanıcı; benzer sorulardaki önceki yorumlar yalnızca
+        ona aitse aynen yeniden kullanılır (bkz. reuse)
+        """
         logger.info(f"🎴 Yorum oluşturuluyor - Yayılım: {spread_name}")
         
         # Cache kontrolü
-        cache_key = f"tarot_{hash(question)}_{hash(str(cards))}_{spread_name}_{language}"
+        cache_key = self._cache_key(question, cards, spread_name, language)
         cached_result = cache.get(cache_key)
         if cached_result:
             return cached_result
         
+        # Aynı kartlarla benzer bir soru daha önce yorumlandıysa yeniden kullan
+        outcome, previous = reuse.lookup(question, cards, spread_name, language, self.openrouter.model, user_id)
+        if outcome in ('exact', 'near'):
+            return previous
+        
         # Prompt oluştur
-        prompt = self._create_prompt(question, cards, spread_name, language)
+        prompt = self._create_prompt(question, cards, spread_name, language, example=previous)
         
         try:
             result = self.openrouter.generate_response(
                 prompt=prompt,
                 system_prompt=DEFAULT_TAROT_PROMPT,
                 max_tokens=1000,
-                temperature=0.8
+                temperature=0.8,
+                language=language
             )
             cache.set(cache_key, result, 3600)
+            reuse.remember(question, cards, spread_name, language, self.openrouter.model, result, user_id)
             return result
         except Exception as e:
             logger.error(f"❌ AI hatası: {str(e)}")
             return self._generate_fallback_interpretation(question, cards, spread_name, language)
     
-    def _create_prompt(self, question, cards, spread_name, language='tr'):
-        """Prompt oluştur"""
+    async def agenerate_interpretation(self, question, cards, spread_name, language='tr', user_id=None):
+        """Tarot yorumu üret (async)"""
+        logger.info(f"🎴 Yorum oluşturuluyor (async) - Yayılım: {spread_name}")
+        
+        # Cache kontrolü
+        cache_key = self._cache_key(question, cards, spread_name, language)
+        cached_result = await cache.aget(cache_key)
+        if cached_result:
+            return cached_result
+        
+        outcome, previous = await reuse.alookup(question, cards, spread_name, language, self.openrouter.model, user_id)
+        if outcome in ('exact', 'near'):
+            return previous
+        
+        # Prompt oluştur
+        prompt = self._create_prompt(question, cards, spread_name, language, example=previous)
+        
+        try:
+            result = await self.async_openrouter.generate_response(
+                prompt=prompt,
+                system_prompt=DEFAULT_TAROT_PROMPT,
+                max_tokens=1000,
+                temperature=0.8,
+                language=language
+            )
+            await cache.aset(cache_key, result, 3600)
+            await reuse.aremember(question, cards, spread_name, language, self.openrouter.model, result, user_id)
+            return result
+        except Exception as e:
+            logger.error(f"❌ AI hatası: {str(e)}")
+            return self._generate_fallback_interpretation(question, cards, spread_name, language)
+    
+    async def astream_interpretation(self, question, cards, spread_name, language='tr', user_id=None):
+        """
+        Tarot yorumunu token token üret (SSE akışı için)
+        
+        Yields:
+            str: Yorumun bir sonraki parçası
+        
+        Raises:
+            Akış en az bir parça gönderildikten sonra koparsa sağlayıcı hatası
+            yeniden fırlatılır (yarım yorum kaydedilmemeli)
+        """
+        logger.info(f"🎴 Yorum akışı başlatılıyor - Yayılım: {spread_name}")
+        
+        # Cache kontrolü
+        cache_key = self._cache_key(question, cards, spread_name, language)
+        cached_result = await cache.aget(cache_key)
+        if cached_result:
+            yield cached_result
+            return
+        
+        outcome, previous = await reuse.alookup(question, cards, spread_name, language, self.openrouter.model, user_id)
+        if outcome in ('exact', 'near'):
+            yield previous
+            return
+        
+        prompt = self._create_prompt(question, cards, spread_name, language, example=previous)
+        chunks = []
+        
+        try:
+            async for chunk in self.async_openrouter.stream_response(
+                prompt=prompt,
+                system_prompt=DEFAULT_TAROT_PROMPT,
+                max_tokens=1000,
+                temperature=0.8,
+                language=language
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            logger.error(f"❌ AI akış hatası: {str(e)}")
+            # Yarıda kesilen yorum tamamlanmış gibi gösterilmesin: çağıran hatayı görür
+            if chunks:
+                raise
+            # Hiç token gelmediyse fallback yorumu gönder
+            yield self._generate_fallback_interpretation(question, cards, spread_name, language)
+            return
+        
+        await cache.aset(cache_key, ''.join(chunks), 3600)
+        await reuse.aremember(question, cards, spread_name, language, self.openrouter.model, ''.join(chunks), user_id)
+    
+    def _create_prompt(self, question, cards, spread_name, language='tr', example=None):
+        """
+        Prompt oluştur
+        
+        example: Aynı kartlarla benzer bir soruya yapılmış önceki yorum (few-shot üslup
+        örneği; başka kullanıcıya aitse reuse tarafından anonimleştirilmiştir)
+        """
         prompt = f"Tarot okuma yapıyoruz. Yayılım: {spread_name}\n\n"
         prompt += f"Soru: {question}\n\nÇekilen Kartlar:\n"
         
@@ -69,6 +206,12 @@ class AIService:
                 prompt += " (Ters)"
             prompt += "\n"
         
+        if example:
+            prompt += (
+                "\nAynı kartlarla benzer bir soruya daha önce yapılan yorum (yalnızca üslup ve "
+                f"tutarlılık için örnek, aynen kopyalama):\n{example[:1500]}\n"
+            )
+        
         prompt += "\nLütfen detaylı, anlayışlı ve içgörü dolu bir yorum yaz."
         return prompt
     
@@ -95,11 +238,11 @@ class DailyCardService:
     def __init__(self, provider_name=None, model=None):
         self.ai_service = AIService(provider_name=provider_name, model=model)
     
-    def generate_daily_interpretation(self, card, is_reversed=False, language='tr'):
-        """Günlük kart yorumu üret"""
+    def _create_daily_prompt(self, card, is_reversed):
+        """Günlük kart prompt'u oluştur"""
         meaning = card.reversed_meaning if is_reversed else card.upright_meaning
         
-        prompt = f"""Sen profesyonel bir tarot yorumcususun. Günün kartı için ilham verici bir yorum yap.
+        return f"""Sen profesyonel bir tarot yorumcususun. Günün kartı için ilham verici bir yorum yap.
 
 Günün Kartı: {card.name} ({'Ters' if is_reversed else 'Düz'})
 Temel Anlam: {meaning}
@@ -110,18 +253,127 @@ Lütfen bu kart için:
 3. Pozitif ve motive edici bir dil kullan
 4. Kısa ve öz tut (3-4 paragraf)
 """
+    
+    def _fallback_daily_interpretation(self, card, is_reversed):
+        """AI başarısız olursa kartın temel anlamı"""
+        meaning = card.reversed_meaning if is_reversed else card.upright_meaning
+        return f"## Günün Kartı: {card.name}\n\n{'Ters' if is_reversed else 'Düz'} Pozisyon\n\n{meaning}"
+    
+    def _daily_system_prompt(self, language):
+        """Dil talimatlı sistem promptu (ortak yorumlar her dil için ayrı üretilir)"""
+        from zodiac.services import LANGUAGE_INSTRUCTIONS
         
+        return LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr']) + DEFAULT_TAROT_PROMPT
+    
+    def request_daily_interpretation(self, card, is_reversed=False, language='tr'):
+        """Günlük kart yorumunu AI'dan iste; hata durumunda exception fırlatır"""
+        return self.ai_service.openrouter.generate_response(
+            prompt=self._create_daily_prompt(card, is_reversed),
+            system_prompt=self._daily_system_prompt(language),
+            max_tokens=800,
+            temperature=0.8,
+            language=language
+        )
+    
+    def generate_daily_interpretation(self, card, is_reversed=False, language='tr'):
+        """Günlük kart yorumu üret"""
         try:
-            result = self.ai_service.openrouter.generate_response(
-                prompt=prompt,
-                system_prompt=DEFAULT_TAROT_PROMPT,
-                max_tokens=800,
-                temperature=0.8
-            )
-            return result
+            return self.request_daily_interpretation(card, is_reversed, language)
         except Exception as e:
             logger.error(f"❌ Daily card AI error: {str(e)}")
-            return f"## Günün Kartı: {card.name}\n\n{'Ters' if is_reversed else 'Düz'} Pozisyon\n\n{meaning}"
+            return self._fallback_daily_interpretation(card, is_reversed)
+    
+    async def arequest_daily_interpretation(self, card, is_reversed=False, language='tr'):
+        """request_daily_interpretation'ın async versiyonu"""
+        return await self.ai_service.async_openrouter.generate_response(
+            prompt=self._create_daily_prompt(card, is_reversed),
+            system_prompt=self._daily_system_prompt(language),
+            max_tokens=800,
+            temperature=0.8,
+            language=language
+        )
+
+
+def daily_card_flight_key(card, is_reversed, date, language):
+    return f"daily_card_interpretation:{card.id}:{int(bool(is_reversed))}:{language}:{date}"
+
+
+def get_daily_card_interpretation(card, is_reversed, date, language='tr'):
+    """
+    Ortak günlük kart yorumunu getir; yoksa bir kez üret ve kaydet
+    
+    Aynı (kart, yön, dil, tarih) için eşzamanlı istekler tek AI çağrısını paylaşır.
+    
+    Returns:
+        DailyCardInterpretation veya AI yanıt veremediyse None
+    """
+    lookup = {'card_id': card.id, 'is_reversed': is_reversed, 'language': language, 'date': date}
+    existing = DailyCardInterpretation.objects.filter(**lookup).first()
+    if existing:
+        return existing
+    
+    def compute():
+        service = DailyCardService()
+        interpretation = service.request_daily_interpretation(card, is_reversed, language)
+        try:
+            shared, _ = DailyCardInterpretation.objects.get_or_create(
+                **lookup,
+                defaults={
+                    'interpretation': interpretation,
+                    'ai_provider': service.ai_service.provider_name,
+                }
+            )
+        except IntegrityError:
+            shared = DailyCardInterpretation.objects.get(**lookup)
+        logger.info(f"🃏 Ortak günlük kart yorumu hazır: {card.name} ({'Ters' if is_reversed else 'Düz'}) [{language}]")
+        return shared.pk
+    
+    try:
+        pk = single_flight(
+            daily_card_flight_key(card, is_reversed, date, language), compute, result_timeout=300
+        )
+    except Exception as e:
+        logger.error(f"❌ Ortak günlük kart yorumu üretilemedi: {card.name} - {str(e)}")
+        return None
+    return DailyCardInterpretation.objects.filter(pk=pk).first()
+
+
+async def aget_daily_card_interpretation(card, is_reversed, date, language='tr'):
+    """
+    get_daily_card_interpretation'ın async versiyonu (async view'lar için)
+
+    AI çağrısı AsyncOpenRouterService ile yapılır; üretim sürerken worker
+    thread'i bloklanmaz. Single-flight anahtarı senkron versiyonla ortaktır.
+    """
+    lookup = {'card_id': card.id, 'is_reversed': is_reversed, 'language': language, 'date': date}
+    existing = await DailyCardInterpretation.objects.filter(**lookup).afirst()
+    if existing:
+        return existing
+    
+    async def compute():
+        service = DailyCardService()
+        interpretation = await service.arequest_daily_interpretation(card, is_reversed, language)
+        try:
+            shared, _ = await DailyCardInterpretation.objects.aget_or_create(
+                **lookup,
+                defaults={
+                    'interpretation': interpretation,
+                    'ai_provider': service.ai_service.provider_name,
+                }
+            )
+        except IntegrityError:
+            shared = await DailyCardInterpretation.objects.aget(**lookup)
+        logger.info(f"🃏 Ortak günlük kart yorumu hazır: {card.name} ({'Ters' if is_reversed else 'Düz'}) [{language}]")
+        return shared.pk
+    
+    try:
+        pk = await async_single_flight(
+            daily_card_flight_key(card, is_reversed, date, language), compute, result_timeout=300
+        )
+    except Exception as e:
+        logger.error(f"❌ Ortak günlük kart yorumu üretilemedi: {card.name} - {str(e)}")
+        return None
+    return await DailyCardInterpretation.objects.filter(pk=pk).afirst()
 
 
 class ImageGenerationService:
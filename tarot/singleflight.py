@@ -0,0 +1,173 @@
+"""
+Single-flight istek birleştirme
+Aynı anahtar için eşzamanlı gelen üretim isteklerinden yalnızca biri (lider)
+işi yapar; diğerleri liderin sonucunu cache'den bekler. Kilit paylaşılan cache
+üzerinde (L1 atlanarak) add (Redis SET NX) ile alındığı için tüm worker'larda
+geçerlidir. Kilidin değeri liderin rastgele token'ıdır; lider yalnızca hâlâ
+kendisine ait olan kilidi siler (süresi dolup başka lidere geçen kilit silinmez).
+
+None / boş sonuçlar cache'lenmez: bekleyenler kilit bırakılınca kendileri dener.
+Paylaşılan cache erişilemezse (Redis kapalı, IGNORE_EXCEPTIONS) kilit beklenmez;
+her çağıran doğrudan üretir.
+"""
+import asyncio
+import time
+import uuid
+import logging
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.cache import cache, caches
+
+logger = logging.getLogger(__name__)
+
+# Lider çökerse kilidin kendiliğinden düşeceği süre (saniye); en uzun üretimden
+# (retry + hedge + 3000 token'lık doğum haritası) uzun olmalı
+LOCK_TIMEOUT = config('SINGLEFLIGHT_LOCK_TIMEOUT', default=300, cast=int)
+# Bekleyenlerin lideri bekleyeceği en uzun süre; aşılırsa kendileri üretir.
+# Kısa tutulur: kilit takılı kalırsa (lider çöktü, kilit TTL'i dolmadı) kullanıcı
+# kilit ömrü boyunca beklemesin, en kötü ihtimalle kopya bir üretim yapılsın.
+WAIT_TIMEOUT = config('SINGLEFLIGHT_WAIT_TIMEOUT', default=10, cast=int)
+POLL_INTERVAL = 0.25
+
+_MISSING = object()
+# _acquire: paylaşılan cache yanıt vermedi (kilit kimsede değil, bilinmiyor)
+_UNAVAILABLE = object()
+
+# Kilit hâlâ bu liderin token'ını taşıyorsa sil (Redis'te atomik)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _lock_key(key):
+    return f"singleflight:lock:{key}"
+
+
+def _shared_cache():
+    # Kilit L1'e yazılmamalı; tüm süreçler aynı değeri görmeli (bkz. rate_limit)
+    return caches['shared']
+
+
+def _acquire(lock_key):
+    """
+    Kilidi al
+
+    Returns:
+        Liderin token'ı; kilit başkasındaysa None; paylaşılan cache erişilemezse
+        _UNAVAILABLE (django-redis IGNORE_EXCEPTIONS ile add() None döner)
+    """
+    token = uuid.uuid4().hex
+    added = _shared_cache().add(lock_key, token, LOCK_TIMEOUT)
+    if added is None:
+        return _UNAVAILABLE
+    return token if added else None
+
+
+def release_lock(lock_key, token):
+    """
+    Paylaşılan cache'teki kilidi yalnızca hâlâ token'ın sahibiyse sil (compare-and-delete)
+
+    Süresi dolup başka sahibe geçmiş kilit silinmez; rate_limit kova kilidi de bunu kullanır.
+    """
+    shared = _shared_cache()
+    client = getattr(shared, 'client', None)
+    if client is not None and hasattr(client, 'get_client'):
+        # django-redis: değer cache ile aynı serileştirmeyle karşılaştırılır
+        try:
+            client.get_client(write=True).eval(
+                _RELEASE_SCRIPT, 1, client.make_key(lock_key), client.encode(token)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Single-flight kilidi bırakılamadı ({lock_key}): {e}")
+        return
+
+    # Süreç içi backend (geliştirme): atomik olmayan karşılaştırma yeterli
+    if shared.get(lock_key) == token:
+        shared.delete(lock_key)
+
+
+def single_flight(key, compute, result_timeout=300):
+    """
+    compute() sonucunu key altında cache'le; eşzamanlı çağrılar tek üretim paylaşır
+
+    Args:
+        key: Sonucun cache anahtarı (aynı zamanda kilit anahtarı bunun üzerinden üretilir)
+        compute: Sonucu üreten fonksiyon (argümansız)
+        result_timeout: Sonucun cache'de kalma süresi
+
+    Lider hata verirse veya boş sonuç dönerse kilit bırakılır ve bekleyenlerden
+    biri yeniden dener.
+    """
+    lock_key = _lock_key(key)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    waited = False
+
+    while True:
+        result = cache.get(key, _MISSING)
+        if result is not _MISSING:
+            if waited:
+                logger.info(f"🤝 Single-flight: sonuç liderden alındı ({key})")
+            return result
+
+        token = _acquire(lock_key)
+        if token is _UNAVAILABLE:
+            logger.warning(f"⚠️ Single-flight: paylaşılan cache erişilemiyor, kilitsiz üretiliyor ({key})")
+            return compute()
+        if token:
+            try:
+                result = compute()
+                if result:
+                    cache.set(key, result, result_timeout)
+                return result
+            finally:
+                release_lock(lock_key, token)
+
+        if time.monotonic() >= deadline:
+            logger.warning(f"⚠️ Single-flight bekleme süresi aşıldı, yerel üretim yapılıyor ({key})")
+            return compute()
+
+        waited = True
+        time.sleep(POLL_INTERVAL)
+
+
+async def async_single_flight(key, compute, result_timeout=300):
+    """
+    single_flight'ın async versiyonu
+
+    Args:
+        compute: Sonucu üreten coroutine fonksiyonu (argümansız)
+    """
+    lock_key = _lock_key(key)
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    waited = False
+
+    while True:
+        result = await cache.aget(key, _MISSING)
+        if result is not _MISSING:
+            if waited:
+                logger.info(f"🤝 Single-flight: sonuç liderden alındı ({key})")
+            return result
+
+        token = await sync_to_async(_acquire)(lock_key)
+        if token is _UNAVAILABLE:
+            logger.warning(f"⚠️ Single-flight: paylaşılan cache erişilemiyor, kilitsiz üretiliyor ({key})")
+            return await compute()
+        if token:
+            try:
+                result = await compute()
+                if result:
+                    await cache.aset(key, result, result_timeout)
+                return result
+            finally:
+                await sync_to_async(release_lock)(lock_key, token)
+
+        if time.monotonic() >= deadline:
+            logger.warning(f"⚠️ Single-flight bekleme süresi aşıldı, yerel üretim yapılıyor ({key})")
+            return await compute()
+
+        waited = True
+        await asyncio.sleep(POLL_INTERVAL)
@@ -0,0 +1,135 @@
+"""
+Tarot arka plan görevleri (run_jobs worker'ı tarafından yürütülür)
+"""
+import logging
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+
+from .jobs import PermanentError, register
+from .deck import get_deck
+from .models import TarotSpread, TarotReading
+from .services import AIService
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def fallback_interpretation(spread, question, cards_data):
+    """AI servisi kullanılamazsa kart anlamlarından yorum oluştur"""
+    interpretation = f"## {spread.name} Yorumu\n\n**Sorunuz:** {question}\n\n"
+    for card_data in cards_data:
+        interpretation += f"**{card_data['position']}. Pozisyon - {card_data['name']}:** "
+        interpretation += f"{card_data['meaning']}\n\n"
+    return interpretation
+
+
+class InsufficientTokens(PermanentError):
+    """Kullanıcının bakiyesi yayılımın jeton maliyetine yetmiyor (iş yeniden denenmez)"""
+
+
+def save_reading(user, spread, question, cards_data, interpretation, ai_provider=None, reading_id=None):
+    """
+    Okuma kaydını oluştur ve varsa jeton düş
+
+    Kayıt ve jeton düşümü tek transaction'dadır; bakiye koşullu UPDATE ile
+    düşülür (eşzamanlı işler birbirinin düşümünü ezmez). reading_id verilirse
+    (iş payload'ındaki sabit id) aynı iş yeniden çalıştığında mevcut okuma
+    döner, ikinci kayıt ve ikinci ücret oluşmaz.
+
+    Raises:
+        InsufficientTokens: Bakiye kayıt anında yetersizse
+    """
+    from accounts.models import TokenTransaction
+
+    with transaction.atomic():
+        if reading_id:
+            existing = TarotReading.objects.filter(pk=reading_id).first()
+            if existing:
+                logger.info(f"♻️ Okuma zaten kaydedilmiş, tekrar oluşturulmadı: {reading_id}")
+                return existing
+
+        cost = spread.token_cost
+        if cost > 0:
+            charged = User.objects.filter(pk=user.pk, tokens__gte=cost).update(tokens=F('tokens') - cost)
+            if not charged:
+                raise InsufficientTokens(f"Bu işlem için {cost} jeton gerekli")
+
+        reading = TarotReading.objects.create(
+            id=reading_id or uuid.uuid4(),
+            user=user,
+            spread=spread,
+            question=question,
+            cards=cards_data,
+            interpretation=interpretation,
+            ai_provider=ai_provider or user.preferred_ai_provider,
+            is_public=False
+        )
+
+        if cost > 0:
+            balance_after = User.objects.values_list('tokens', flat=True).get(pk=user.pk)
+            user.tokens = balance_after
+            TokenTransaction.objects.create(
+                user=user,
+                transaction_type='usage',
+                amount=-cost,
+                balance_before=balance_after + cost,
+                balance_after=balance_after,
+                description=f'{spread.name} yayılımı kullanımı',
+                related_reading=reading
+            )
+
+    return reading
+
+
+@register('tarot.create_reading')
+def create_reading(user_id, spread_id, question, cards_data, language='tr', reading_id=None):
+    """
+    Çekilmiş kartlar için AI yorumu üret ve okumayı kaydet
+
+    reading_id enqueue anında üretilir; iş yeniden denenirse (çökme, takılı iş
+    kuyruğa geri alınması) aynı okuma döner ve tekrar ücret alınmaz.
+    """
+    user = User.objects.get(pk=user_id)
+    spread = TarotSpread.objects.get(pk=spread_id)
+
+    if reading_id:
+        existing = TarotReading.objects.filter(pk=reading_id).first()
+        if existing:
+            return _reading_result(existing)
+
+    deck = get_deck()
+    ai_cards = [
+        {
+            'card': deck.get(card['id']),
+            'position': card['position'],
+            'is_reversed': card['is_reversed'],
+        }
+        for card in cards_data
+    ]
+
+    try:
+        interpretation = AIService().generate_interpretation(
+            question=question,
+            cards=ai_cards,
+            spread_name=spread.name,
+            language=language,
+            user_id=user_id
+        )
+    except Exception as e:
+        logger.error(f"AI Service Error: {e}")
+        interpretation = fallback_interpretation(spread, question, cards_data)
+
+    reading = save_reading(user, spread, question, cards_data, interpretation, reading_id=reading_id)
+    return _reading_result(reading)
+
+
+def _reading_result(reading):
+    return {
+        'reading_id': str(reading.id),
+        'redirect_url': reverse('tarot:reading_detail', kwargs={'reading_id': reading.id}),
+    }
@@ -1,3 +1,279 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import fakeredis
+from django.core.cache import cache, caches
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from tarot_project.cache import GENERATION_KEY, TwoTierCache
+
+from . import jobs, model_router, reuse, singleflight
+from .models import AIJob
+
+CARDS = [
+    {'card': {'name': 'Kupa Ası'}, 'position': 'Geçmiş', 'is_reversed': False},
+    {'card': {'name': 'Kılıç Üçlüsü'}, 'position': 'Gelecek', 'is_reversed': True},
+]
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'reuse-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'reuse-tests-shared'},
+}
+# Paylaşılan cache için gerçek django-redis istemcisi, sunucu fakeredis
+FAKEREDIS_CACHES = {
+    'default': LOCMEM_CACHES['default'],
+    'shared': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://fakeredis:6379/0',
+        'OPTIONS': {'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection}},
+    },
+}
+
+# (ilk soru, anlamı farklı ikinci soru): olumsuzluk eki veya yer değiştiren kelimeler
+NEGATED_PAIRS = [
+    ('İşimi değiştirmeli miyim?', 'İşimi değiştirmemeli miyim?'),
+    ('Bu yıl yeni bir işe başlamalı mıyım?', 'Bu yıl yeni bir işe başlamamalı mıyım?'),
+    ('Should I move to Berlin this year?', 'Should I not move to Berlin this year?'),
+]
+REORDERED_PAIRS = [
+    ('Ali mi Veli mi beni seviyor?', 'Veli mi Ali mi beni seviyor?'),
+    ('Ankara mı İstanbul mu bana iyi gelir?', 'İstanbul mu Ankara mı bana iyi gelir?'),
+]
+
+
+class NormalizeQuestionTests(SimpleTestCase):
+    def test_folds_case_accents_and_stopwords(self):
+        self.assertEqual(reuse.normalize_question('Aşkta beni NELER bekliyor?'), 'askta bekliyor')
+
+    def test_keeps_word_order(self):
+        self.assertEqual(reuse.normalize_question('Ali mi Veli mi?'), 'ali veli')
+        self.assertEqual(reuse.normalize_question('Veli mi Ali mi?'), 'veli ali')
+
+
+class SimilarityTests(SimpleTestCase):
+    def _similarity(self, first, second):
+        return reuse.similarity(
+            reuse.minhash(reuse.normalize_question(first)),
+            reuse.minhash(reuse.normalize_question(second)),
+        )
+
+    def test_negated_questions_are_not_near_duplicates(self):
+        for first, second in NEGATED_PAIRS:
+            with self.subTest(first=first, second=second):
+                self.assertLess(self._similarity(first, second), reuse.REUSE_THRESHOLD)
+
+    def test_reordered_questions_are_not_near_duplicates(self):
+        for first, second in REORDERED_PAIRS:
+            with self.subTest(first=first, second=second):
+                self.assertLess(self._similarity(first, second), reuse.REUSE_THRESHOLD)
+
+    def test_identical_questions(self):
+        self.assertEqual(self._similarity('Aşkta beni neler bekliyor?', 'aşkta neler bekliyor'), 1.0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch.object(reuse, 'ENABLED', True)
+class LookupTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+
+    def _remember(self, question, interpretation, user_id):
+        reuse.remember(question, CARDS, 'Üç Kart', 'tr', 'test-model', interpretation, user_id=user_id)
+
+    def _lookup(self, question, user_id):
+        return reuse.lookup(question, CARDS, 'Üç Kart', 'tr', 'test-model', user_id=user_id)
+
+    def test_same_user_reuses_own_reading(self):
+        self._remember('Aşkta beni neler bekliyor?', 'Önceki yorum', user_id=1)
+        self.assertEqual(self._lookup('aşkta neler bekliyor', user_id=1), ('exact', 'Önceki yorum'))
+
+    def test_exact_original_text_is_reused_across_users(self):
+        self._remember('Aşkta beni neler bekliyor?', 'Önceki yorum', user_id=1)
+        self.assertEqual(self._lookup('Aşkta beni neler bekliyor?', user_id=2), ('exact', 'Önceki yorum'))
+
+    def test_other_users_reading_is_only_an_anonymized_example(self):
+        self._remember('Aşkta beni neler bekliyor?', 'Soru: Aşkta beni neler bekliyor?\nKupa Ası umut verir. ali@example.com', user_id=1)
+
+        outcome, example = self._lookup('aşkta neler bekliyor', user_id=2)
+
+        self.assertEqual(outcome, 'few_shot')
+        self.assertIn('Kupa Ası umut verir.', example)
+        self.assertNotIn('Aşkta beni neler bekliyor?', example)
+        self.assertNotIn('ali@example.com', example)
+
+    def test_anonymous_lookup_never_reuses_other_readings(self):
+        self._remember('Aşkta beni neler bekliyor?', 'Önceki yorum', user_id=1)
+        outcome, _ = self._lookup('aşkta neler bekliyor', user_id=None)
+        self.assertNotIn(outcome, ('exact', 'near'))
+
+    def test_negated_and_reordered_questions_are_not_reused(self):
+        for first, second in NEGATED_PAIRS + REORDERED_PAIRS:
+            with self.subTest(first=first, second=second):
+                caches['shared'].clear()
+                self._remember(first, 'Önceki yorum', user_id=1)
+                for user_id in (1, 2):
+                    outcome, _ = self._lookup(second, user_id=user_id)
+                    self.assertNotIn(outcome, ('exact', 'near'))
+
+
+@override_settings(CACHES=FAKEREDIS_CACHES)
+@mock.patch.object(reuse, 'ENABLED', True)
+class RedisLookupTests(LookupTests):
+    """Aynı senaryolar Redis listesi üzerinde (RPUSH + LTRIM)"""
+
+    def test_bucket_keeps_latest_entries(self):
+        with mock.patch.object(reuse, 'BUCKET_SIZE', 2):
+            for topic in ('Aşk', 'Kariyer', 'Sağlık'):
+                self._remember(f'{topic} hayatımda beni neler bekliyor?', f'{topic} yorumu', user_id=1)
+        self.assertNotIn(self._lookup('Aşk hayatımda beni neler bekliyor?', user_id=1)[0], ('exact', 'near'))
+        self.assertEqual(self._lookup('Sağlık hayatımda beni neler bekliyor?', user_id=1), ('exact', 'Sağlık yorumu'))
+
+    def test_repeated_question_returns_latest_reading(self):
+        self._remember('Aşkta beni neler bekliyor?', 'Eski yorum', user_id=1)
+        self._remember('Aşkta beni neler bekliyor?', 'Yeni yorum', user_id=1)
+        self.assertEqual(self._lookup('Aşkta beni neler bekliyor?', user_id=1), ('exact', 'Yeni yorum'))
+
+    def test_stats_count_outcomes(self):
+        self._lookup('Aşkta beni neler bekliyor?', user_id=1)
+        self._lookup('Aşkta beni neler bekliyor?', user_id=1)
+        self.assertEqual(reuse.stats()['miss'], 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _shared(self, added):
+        shared = mock.Mock()
+        shared.add.return_value = added
+        return mock.patch.object(singleflight, '_shared_cache', return_value=shared)
+
+    def test_computes_immediately_when_shared_cache_is_down(self):
+        # django-redis IGNORE_EXCEPTIONS: Redis kapalıyken add() None döner
+        compute = mock.Mock(return_value='yorum')
+        with self._shared(None), mock.patch.object(singleflight.time, 'sleep') as sleep:
+            self.assertEqual(singleflight.single_flight('sf-down', compute), 'yorum')
+        compute.assert_called_once_with()
+        sleep.assert_not_called()
+
+    async def test_async_computes_immediately_when_shared_cache_is_down(self):
+        compute = mock.AsyncMock(return_value='yorum')
+        with self._shared(None), mock.patch.object(singleflight.asyncio, 'sleep') as sleep:
+            self.assertEqual(await singleflight.async_single_flight('sf-down-async', compute), 'yorum')
+        compute.assert_awaited_once_with()
+        sleep.assert_not_called()
+
+    def test_waiter_returns_leaders_result(self):
+        compute = mock.Mock(return_value='kopya')
+
+        def leader_finishes(_):
+            cache.set('sf-held', 'liderin yorumu')
+
+        with self._shared(False), mock.patch.object(singleflight.time, 'sleep', side_effect=leader_finishes):
+            self.assertEqual(singleflight.single_flight('sf-held', compute), 'liderin yorumu')
+        compute.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ModelHealthTests(SimpleTestCase):
+    def setUp(self):
+        model_router._shared_cache().clear()
+        self.health = model_router.ModelHealth('test-model')
+
+    def test_latency_samples_keep_last_window(self):
+        with mock.patch.object(model_router, 'LATENCY_WINDOW', 3):
+            for latency in (1, 2, 3, 4):
+                self.health.record_success(latency)
+        self.assertEqual(self.health.samples(), [2, 3, 4])
+
+    def test_success_without_latency_adds_no_sample(self):
+        self.health.record_success()
+        self.assertEqual(self.health.samples(), [])
+
+    def test_release_probe_reopens_half_open_trial(self):
+        self.health.cache.set(self.health._key('tripped'), 1)
+        self.assertTrue(self.health.allow_request())
+        self.assertFalse(self.health.allow_request())
+        self.health.release_probe()
+        self.assertTrue(self.health.allow_request())
+
+
+@jobs.register('tests.insufficient_tokens')
+def _insufficient_tokens():
+    from .tasks import InsufficientTokens
+    raise InsufficientTokens('Bu işlem için 3 jeton gerekli')
+
+
+class JobQueueTests(TestCase):
+    def test_permanent_error_is_not_retried(self):
+        job = jobs.enqueue('tests.insufficient_tokens', max_attempts=3)
+
+        jobs.run_job(jobs.claim_next('test'), 'test')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('dead', 1))
+        self.assertEqual(jobs.job_status(job)['error'], 'Bu işlem için 3 jeton gerekli')
+
+    def test_requeue_stale_marks_exhausted_jobs_dead(self):
+        locked_at = timezone.now() - timedelta(seconds=jobs.LOCK_TIMEOUT + 1)
+        exhausted = AIJob.objects.create(task='t', status='running', attempts=3, max_attempts=3, locked_at=locked_at)
+        retryable = AIJob.objects.create(task='t', status='running', attempts=1, max_attempts=3, locked_at=locked_at)
+
+        self.assertEqual(jobs.requeue_stale(), 1)
+
+        exhausted.refresh_from_db()
+        retryable.refresh_from_db()
+        self.assertEqual(exhausted.status, 'dead')
+        self.assertEqual(retryable.status, 'pending')
+
+    def test_concurrent_enqueue_with_same_key_returns_existing_job(self):
+        existing = AIJob.objects.create(task='t', key='reading:1')
+        real_first = QuerySet.first
+        calls = []
+
+        def first(queryset):
+            # İlk kontrol, diğer istek henüz yazmamış gibi boş döner
+            calls.append(queryset)
+            return None if len(calls) == 1 else real_first(queryset)
+
+        with mock.patch.object(QuerySet, 'first', autospec=True, side_effect=first):
+            job = jobs.enqueue('t', key='reading:1')
+
+        self.assertEqual(job.pk, existing.pk)
+        self.assertEqual(AIJob.objects.filter(key='reading:1').count(), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TwoTierInvalidationTests(SimpleTestCase):
+    """İki worker aynı L2'yi paylaşır; birinin silmesi diğerinin L1'ini geçersiz kılar"""
+
+    def setUp(self):
+        caches['shared'].clear()
+        options = {'OPTIONS': {'L2_ALIAS': 'shared', 'L1_GENERATION_CHECK': 0}}
+        self.worker_a = TwoTierCache('', options)
+        self.worker_b = TwoTierCache('', options)
+
+    def test_delete_reaches_other_workers_l1(self):
+        self.worker_a.set('reading', 'eski')
+        self.assertEqual(self.worker_b.get('reading'), 'eski')
+
+        self.worker_a.delete('reading')
+
+        self.assertIsNone(self.worker_b.get('reading'))
+
+    def test_incr_reaches_other_workers_l1(self):
+        self.worker_a.set('version', 1)
+        self.assertEqual(self.worker_b.get('version'), 1)
+
+        self.worker_a.incr('version')
+
+        self.assertEqual(self.worker_b.get('version'), 2)
+
+    def test_own_l1_survives_own_invalidation(self):
+        self.worker_a.set('other', 'değer')
+        self.worker_a.delete('reading')
+        with mock.patch.object(self.worker_a.l2, 'get', wraps=self.worker_a.l2.get) as l2_get:
+            self.assertEqual(self.worker_a.get('other'), 'değer')
+        self.assertEqual([call.args[0] for call in l2_get.call_args_list], [GENERATION_KEY])
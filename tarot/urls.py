@@ -12,6 +12,8 @@ urlpatterns = [
     
     # Okuma işlemleri
     path('create-reading/', views.create_reading, name='create_reading'),
+    path('create-reading/stream/', views.create_reading_stream, name='create_reading_stream'),
+    path('jobs/<uuid:job_id>/', views.job_status, name='job_status'),
     path('reading/<uuid:reading_id>/', views.reading_detail, name='reading_detail'),
     path('reading/<uuid:reading_id>/toggle-public/', views.toggle_reading_public, name='toggle_reading_public'),
     path('my-readings/', views.user_readings, name='user_readings'),
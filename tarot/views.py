@@ -1,15 +1,26 @@
-from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 from django.urls import reverse
+from datetime import timedelta
 import random
+import uuid
 import json
-from .models import TarotCard, TarotSpread, TarotReading, DailyCard, SiteSettings, HeroSection
-from .services import AIService, DailyCardService
+import logging
+from asgiref.sync import sync_to_async
+from .models import TarotSpread, TarotReading, DailyCard, SiteSettings, HeroSection, AIJob
+from .services import AIService, aget_daily_card_interpretation
+from .async_utils import async_login_required, arender
+from .tasks import fallback_interpretation, save_reading
+from .meaning_library import acompose_reading, library_available
+from . import jobs
+from .deck import aget_deck
+
+logger = logging.getLogger(__name__)
 
 
 def index(request):
@@ -23,46 +34,60 @@ def index(request):
     # Popüler yayılımları al
     popular_spreads = TarotSpread.objects.filter(is_active=True).order_by('difficulty_level')[:4]
     
-    # YouTube videolarını al
+    # YouTube videolarını al - sadece cache, eksikse arka planda yenilenir
     youtube_videos = []
     try:
         from blog.youtube_service import YouTubeService
         youtube_service = YouTubeService()
-        youtube_videos = youtube_service.get_latest_videos(max_results=6)
+        cached_videos, is_fresh = youtube_service.get_cached_videos(max_results=6)
+        if not is_fresh:
+            jobs.enqueue('blog.refresh_youtube_videos', payload={'max_results': 6},
+                         key='youtube_videos:6', throttle=300)
+        youtube_videos = cached_videos or []
     except Exception as e:
         print(f"YouTube videoları alınamadı: {e}")
     
-    # Günlük burç yorumlarını al ve gerekirse Gemini ile oluştur
+    # Günlük burç yorumlarını al - sayfa sadece hazır veriyi okur.
+    # Bugünün yorumu yoksa arka planda üretilir, bu sırada dünkü yorum gösterilir.
     daily_horoscopes = []
     try:
-        from zodiac.models import ZodiacSign, DailyHoroscope
-        from zodiac.views import generate_daily_horoscope
+        from zodiac.models import ZodiacSign, DailyHoroscope, horoscope_language
         
         # İlk 6 burcu al
-        zodiac_signs = ZodiacSign.objects.all().order_by('order')[:6]
+        zodiac_signs = list(ZodiacSign.objects.all().order_by('order')[:6])
         today = timezone.now().date()
+        yesterday = today - timedelta(days=1)
+        language = horoscope_language()
+        
+        # Bugün ve dünün yorumları tek sorguda
+        horoscopes_by_key = {
+            (h.zodiac_sign_id, h.date): h
+            for h in DailyHoroscope.objects.filter(
+                zodiac_sign__in=zodiac_signs,
+                date__in=[today, yesterday],
+                language=language
+            )
+        }
         
         for sign in zodiac_signs:
-            # Bugünün yorumu var mı kontrol et
-            horoscope = DailyHoroscope.objects.filter(
-                zodiac_sign=sign,
-                date=today
-            ).first()
+            horoscope = horoscopes_by_key.get((sign.id, today))
+            is_stale = False
             
-            # Yoksa Gemini ile otomatik oluştur
             if not horoscope:
-                try:
-                    horoscope = generate_daily_horoscope(sign, today)
-                except Exception as e:
-                    print(f"Günlük yorum oluşturma hatası ({sign.name}): {e}")
-                    # Hata durumunda boş geç
-                    continue
+                jobs.enqueue(
+                    'zodiac.daily_horoscope',
+                    payload={'sign_id': sign.pk, 'date': today.isoformat(), 'language': language},
+                    key=f"daily_horoscope:{sign.pk}:{today.isoformat()}:{language}",
+                    throttle=300
+                )
+                horoscope = horoscopes_by_key.get((sign.id, yesterday))
+                is_stale = True
             
-            if horoscope:
-                daily_horoscopes.append({
-                    'sign': sign,
-                    'horoscope': horoscope
-                })
+            daily_horoscopes.append({
+                'sign': sign,
+                'horoscope': horoscope,
+                'is_stale': is_stale,
+            })
     except ImportError:
         pass  # Zodiac app henüz yüklü değil
     except Exception as e:
@@ -98,157 +123,263 @@ def spread_detail(request, slug):
     context = {
         'title': f'{spread.name} - Rehberlik Yöntemi',
         'spread': spread,
+        'library_available': library_available(spread),
     }
     return render(request, 'tarot/spread_detail.html', context)
 
 
-@login_required
+async def _prepare_reading(request):
+    """
+    Okuma isteğini doğrula ve kartları çek
+    
+    Returns:
+        (prepared, error) tuple - hata yoksa error None olur
+    """
+    user = request.user
+    
+    # Site ayarlarını kontrol et
+    settings = await sync_to_async(SiteSettings.load)()
+    
+    # TEST AŞAMASI: Günlük okuma sınırı devre dışı
+    # if not request.user.can_read_today():
+    #     return None, f'Günlük okuma limitiniz ({settings.daily_reading_limit}) dolmuş.'
+    
+    # Form verilerini al
+    spread_id = request.POST.get('spread_id')
+    question = request.POST.get('question', '').strip()
+    
+    if not question:
+        return None, 'Lütfen bir soru girin.'
+    
+    if len(question) > settings.max_question_length:
+        return None, f'Soru en fazla {settings.max_question_length} karakter olabilir.'
+    
+    # Yayılımı al
+    spread = await aget_object_or_404(TarotSpread, id=spread_id, is_active=True)
+    
+    # Jeton kontrolü
+    if spread.is_premium_only and not user.is_premium:
+        return None, 'Bu yayılım sadece premium üyelere açıktır.'
+    
+    # Jeton yeterlilik kontrolü
+    if spread.token_cost > 0:
+        if user.tokens < spread.token_cost:
+            return None, (f'Bu işlem için {spread.token_cost} jeton gerekli. '
+                          f'Mevcut jetonunuz: {user.tokens}')
+    
+    # Her zaman rastgele kartları çek (süreç içi desteden, sorgusuz)
+    deck = await aget_deck()
+    if len(deck) < spread.card_count:
+        return None, 'Yeterli kart yok.'
+    selected_cards = random.sample(deck.cards, spread.card_count)
+    
+    # Kartların bilgilerini hazırla
+    cards_data = []
+    ai_cards = []
+    for i, card in enumerate(selected_cards, 1):
+        is_reversed = random.choice([True, False])
+        position_meaning = spread.positions.get(str(i), f'Pozisyon {i}')
+        
+        cards_data.append({
+            'id': card.id,
+            'name': card.name,
+            'position': i,
+            'position_meaning': position_meaning,
+            'is_reversed': is_reversed,
+            'meaning': card.reversed_meaning if is_reversed else card.upright_meaning,
+            'image_url': card.image_url if card.image_url else None
+        })
+        # Kartları AI servisi için hazırla
+        ai_cards.append({
+            'card': card,
+            'position': i,
+            'is_reversed': is_reversed
+        })
+    
+    # Kullanıcının seçili dilini al
+    from django.utils.translation import get_language
+    
+    return {
+        'spread': spread,
+        'question': question,
+        'cards_data': cards_data,
+        'ai_cards': ai_cards,
+        'language': get_language(),
+    }, None
+
+
+def _sse_event(event, data):
+    """Server-Sent Events formatında tek bir olay"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@async_login_required
 @require_POST
-def create_reading(request):
-    """Yeni kişisel rehberlik seansı oluştur"""
+async def create_reading(request):
+    """
+    Yeni kişisel rehberlik seansı oluştur
+    
+    Küçük yayılımlar kart yorum kütüphanesinden anında yorumlanır. Derin yorum
+    istendiyse veya kütüphane yetersizse yorum arka plan işi olarak kuyruğa alınır;
+    istemci status_url üzerinden işin durumunu sorgular.
+    """
     try:
-        # Site ayarlarını kontrol et
-        settings = SiteSettings.load()
-        
-        # TEST AŞAMASI: Günlük okuma sınırı devre dışı
-        # if not request.user.can_read_today():
-        #     return JsonResponse({
-        #         'success': False,
-        #         'error': f'Günlük okuma limitiniz ({settings.daily_reading_limit}) dolmuş.'
-        #     })
-        
-        # Form verilerini al
-        spread_id = request.POST.get('spread_id')
-        question = request.POST.get('question', '').strip()
-        
-        if not question:
+        prepared, error = await _prepare_reading(request)
+        if error:
             return JsonResponse({
                 'success': False,
-                'error': 'Lütfen bir soru girin.'
+                'error': error
             })
         
-        if len(question) > settings.max_question_length:
+        reading = await _library_reading(request, prepared)
+        if reading:
             return JsonResponse({
-                'success': False,
-                'error': f'Soru en fazla {settings.max_question_length} karakter olabilir.'
+                'success': True,
+                'reading_id': str(reading.id),
+                'redirect_url': reverse('tarot:reading_detail', kwargs={'reading_id': reading.id})
             })
         
-        # Yayılımı al
-        spread = get_object_or_404(TarotSpread, id=spread_id, is_active=True)
-        
-        # Jeton kontrolü
-        if spread.is_premium_only and not request.user.is_premium:
-            return JsonResponse({
-                'success': False,
-                'error': 'Bu yayılım sadece premium üyelere açıktır.'
-            })
-        
-        # Jeton yeterlilik kontrolü
-        if spread.token_cost > 0:
-            if request.user.tokens < spread.token_cost:
-                return JsonResponse({
-                    'success': False,
-                    'error': f'Bu işlem için {spread.token_cost} jeton gerekli. '
-                             f'Mevcut jetonunuz: {request.user.tokens}'
-                })
+        job = await jobs.aenqueue(
+            'tarot.create_reading',
+            payload={
+                'user_id': request.user.pk,
+                'spread_id': prepared['spread'].pk,
+                'question': prepared['question'],
+                'cards_data': prepared['cards_data'],
+                'language': prepared['language'],
+                # Yeniden denemelerde aynı okuma döner (tek kayıt, tek ücret)
+                'reading_id': str(uuid.uuid4()),
+            },
+            user=request.user
+        )
         
-        # Her zaman rastgele kartları çek
-        all_cards = list(TarotCard.objects.all())
-        if len(all_cards) < spread.card_count:
-            return JsonResponse({
-                'success': False,
-                'error': 'Yeterli kart yok.'
-            })
-        selected_cards = random.sample(all_cards, spread.card_count)
+        return JsonResponse({
+            'success': True,
+            'job_id': str(job.id),
+            'status_url': reverse('tarot:job_status', kwargs={'job_id': job.id})
+        }, status=202)
         
-        # Kartların bilgilerini hazırla
-        cards_data = []
-        for i, card in enumerate(selected_cards, 1):
-            is_reversed = random.choice([True, False])
-            position_meaning = spread.positions.get(str(i), f'Pozisyon {i}')
-            
-            cards_data.append({
-                'id': card.id,
-                'name': card.name,
-                'position': i,
-                'position_meaning': position_meaning,
-                'is_reversed': is_reversed,
-                'meaning': card.reversed_meaning if is_reversed else card.upright_meaning,
-                'image_url': card.image_url if card.image_url else None
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'Bir hata oluştu: {str(e)}'
+        })
+
+
+async def _library_reading(request, prepared):
+    """
+    Derin yorum istenmediyse okumayı kütüphaneden oluşturup kaydet
+    
+    Returns:
+        TarotReading veya kütüphane kullanılamıyorsa None
+    """
+    if request.POST.get('deep_reading'):
+        return None
+    
+    interpretation = await acompose_reading(
+        prepared['spread'], prepared['question'], prepared['cards_data'], prepared['language']
+    )
+    if not interpretation:
+        return None
+    
+    return await sync_to_async(save_reading)(
+        request.user, prepared['spread'], prepared['question'],
+        prepared['cards_data'], interpretation, ai_provider='library'
+    )
+
+
+@login_required
+def job_status(request, job_id):
+    """Arka plan işinin durumu (polling)"""
+    job = get_object_or_404(AIJob, id=job_id, user=request.user)
+    return JsonResponse(jobs.job_status(job))
+
+
+@async_login_required
+@require_POST
+async def create_reading_stream(request):
+    """
+    Rehberlik seansı oluştur - yorum Server-Sent Events ile akıtılır
+    
+    Olaylar: 'token' (yorum parçası), 'done' (okuma kaydedildi), 'error'
+    Okuma kaydı akış tamamlandığında oluşturulur; akış yarıda koparsa 'error'
+    gönderilir, okuma kaydedilmez ve jeton düşülmez.
+    """
+    try:
+        prepared, error = await _prepare_reading(request)
+    except Exception as e:
+        prepared, error = None, f'Bir hata oluştu: {str(e)}'
+    
+    if error:
+        return JsonResponse({
+            'success': False,
+            'error': error
+        }, status=400)
+    
+    user = request.user
+    
+    try:
+        library_reading = await _library_reading(request, prepared)
+    except Exception as e:
+        logger.exception(f"❌ Kütüphane yorumu oluşturulamadı, AI akışına geçiliyor: {e}")
+        library_reading = None
+    
+    async def event_stream():
+        if library_reading:
+            yield _sse_event('token', {'text': library_reading.interpretation})
+            yield _sse_event('done', {
+                'reading_id': str(library_reading.id),
+                'redirect_url': reverse('tarot:reading_detail', kwargs={'reading_id': library_reading.id})
             })
+            return
         
-        # AI yorumu oluştur
+        chunks = []
         try:
-            # Kullanıcının seçili dilini al
-            from django.utils.translation import get_language
-            current_language = get_language()
-            
             ai_service = AIService()
-            # Kartları AI servisi için hazırla
-            ai_cards = []
-            for card_data in cards_data:
-                card_obj = TarotCard.objects.get(id=card_data['id'])
-                ai_cards.append({
-                    'card': card_obj,
-                    'position': card_data['position'],
-                    'is_reversed': card_data['is_reversed']
-                })
-            
-            interpretation = ai_service.generate_interpretation(
-                question=question,
-                cards=ai_cards,
-                spread_name=spread.name,
-                language=current_language
-            )
+            async for chunk in ai_service.astream_interpretation(
+                question=prepared['question'],
+                cards=prepared['ai_cards'],
+                spread_name=prepared['spread'].name,
+                language=prepared['language'],
+                user_id=user.pk
+            ):
+                chunks.append(chunk)
+                yield _sse_event('token', {'text': chunk})
         except Exception as e:
-            print(f"AI Service Error: {e}")
-            # Fallback yorum
-            interpretation = f"## {spread.name} Yorumu\n\n**Sorunuz:** {question}\n\n"
-            for card_data in cards_data:
-                interpretation += f"**{card_data['position']}. Pozisyon - {card_data['name']}:** "
-                interpretation += f"{card_data['meaning']}\n\n"
+            logger.exception(f"❌ AI yorum akışı hatası ({len(chunks)} parça gönderilmişti): {e}")
+            if chunks:
+                # Yarım yorum kaydedilmez ve jeton düşülmez
+                yield _sse_event('error', {
+                    'error': 'Yorum akışı yarıda kesildi, jeton düşülmedi. Lütfen tekrar deneyin.'
+                })
+                return
         
-        # Okuma kaydı oluştur
-        reading = TarotReading.objects.create(
-            user=request.user,
-            spread=spread,
-            question=question,
-            cards=cards_data,
-            interpretation=interpretation,
-            ai_provider=request.user.preferred_ai_provider,
-            is_public=False
-        )
+        if chunks:
+            interpretation = ''.join(chunks)
+        else:
+            interpretation = fallback_interpretation(
+                prepared['spread'], prepared['question'], prepared['cards_data']
+            )
+            yield _sse_event('token', {'text': interpretation})
         
-        # Jeton işlemini yap (varsa)
-        if spread.token_cost > 0:
-            from accounts.models import TokenTransaction
-            
-            balance_before = request.user.tokens
-            request.user.tokens -= spread.token_cost
-            request.user.save()
-            balance_after = request.user.tokens
-            
-            TokenTransaction.objects.create(
-                user=request.user,
-                transaction_type='usage',
-                amount=-spread.token_cost,
-                balance_before=balance_before,
-                balance_after=balance_after,
-                description=f'{spread.name} yayılımı kullanımı',
-                related_reading=reading
+        try:
+            reading = await sync_to_async(save_reading)(
+                user, prepared['spread'], prepared['question'],
+                prepared['cards_data'], interpretation
             )
+        except Exception as e:
+            yield _sse_event('error', {'error': f'Bir hata oluştu: {str(e)}'})
+            return
         
-        return JsonResponse({
-            'success': True,
+        yield _sse_event('done', {
             'reading_id': str(reading.id),
             'redirect_url': reverse('tarot:reading_detail', kwargs={'reading_id': reading.id})
         })
-        
-    except Exception as e:
-        return JsonResponse({
-            'success': False,
-            'error': f'Bir hata oluştu: {str(e)}'
-        })
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Nginx'in yanıtı bufferlamasını engelle
+    return response
 
 
 def reading_detail(request, reading_id):
@@ -305,51 +436,55 @@ def user_readings(request):
     return render(request, 'tarot/user_readings.html', context)
 
 
-@login_required
-def daily_card(request):
-    """Günlük ilham kaynağı"""
+@async_login_required
+async def daily_card(request):
+    """
+    Günlük ilham kaynağı
+    
+    Yorumlar (kart, yön, dil, tarih) başına bir kez üretilip tüm kullanıcılarca
+    paylaşılır; kullanıcının çekimi yalnızca ortak kayda referans verir.
+    """
     today = timezone.now().date()
     
     # Bugün çekilmiş sembol var mı kontrol et
-    daily_card_obj = DailyCard.objects.filter(user=request.user, date=today).first()
+    daily_card_obj = await DailyCard.objects.select_related('card', 'shared_interpretation').filter(
+        user=request.user, date=today
+    ).afirst()
     
     if not daily_card_obj:
         # Yeni günlük ilham kaynağı seç
-        all_cards = list(TarotCard.objects.all())
-        if all_cards:
-            random_card = random.choice(all_cards)
+        deck = await aget_deck()
+        if deck.cards:
+            random_card = random.choice(deck.cards)
             is_reversed = random.choice([True, False])
             
-            # AI yorumu oluştur
-            try:
-                # Kullanıcının seçili dilini al
-                from django.utils.translation import get_language
-                current_language = get_language()
-                
-                daily_service = DailyCardService()
-                interpretation = daily_service.generate_daily_interpretation(
-                    random_card, 
-                    is_reversed,
-                    language=current_language
-                )
-            except Exception as e:
-                print(f"Daily card interpretation error: {e}")
+            # Kullanıcının seçili dilindeki ortak yorumu al (yoksa bir kez üretilir)
+            from zodiac.models import horoscope_language
+            
+            shared = await aget_daily_card_interpretation(
+                random_card, is_reversed, today, horoscope_language()
+            )
+            
+            interpretation = ''
+            if shared is None:
                 meaning = random_card.reversed_meaning if is_reversed else random_card.upright_meaning
                 interpretation = f"## Günün İlham Kaynağı: {random_card.name}\n\nBugün sizin için {random_card.name} rehberlik sembolü seçildi.\n\n{meaning}"
             
-            daily_card_obj = DailyCard.objects.create(
+            daily_card_obj = await DailyCard.objects.acreate(
                 user=request.user,
-                card=random_card,
+                card_id=random_card.id,
                 date=today,
                 is_reversed=is_reversed,
-                interpretation=interpretation
+                shared_interpretation=shared,
+                interpretation=interpretation,
+                ai_provider=shared.ai_provider if shared else 'fallback'
             )
     
     context = {
         'title': 'Günlük İlham Kaynağı',
         'daily_card': daily_card_obj,
     }
-    return render(request, 'tarot/daily_card.html', context)
+    return await arender(request, 'tarot/daily_card.html', context)
 
 
 def public_readings(request):
@@ -0,0 +1,251 @@
+"""
+İki katmanlı cache backend'i
+L1: süreç içi, boyutu sınırlı LRU (çok kısa TTL)
+L2: paylaşılan cache (Redis) - tüm gunicorn worker'ları ve komutlar ortak kullanır
+"""
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+_MISSING = object()
+# L2'deki nesil değeri: delete/incr/clear bunu yeniler, diğer süreçler L1'lerini boşaltır
+GENERATION_KEY = 'twotier:l1_generation'
+
+
+class LocalLRU:
+    """Thread-safe, boyutu sınırlı ve TTL destekli LRU sözlüğü"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl):
+        # Değer pickle'lanır; çağıranın nesneyi değiştirmesi cache'i bozmasın
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TwoTierCache(BaseCache):
+    """
+    L1 (süreç içi LRU) + L2 (paylaşılan cache) backend'i
+
+    OPTIONS:
+        L2_ALIAS: Paylaşılan cache'in CACHES içindeki adı (varsayılan: 'shared')
+        L1_MAX_ENTRIES: L1'de tutulacak en fazla kayıt (varsayılan: 1000)
+        L1_TIMEOUT: L1 kayıtlarının ömrü (saniye, varsayılan: 30)
+        L1_GENERATION_CHECK: Nesil değerinin L2'den en fazla hangi sıklıkla
+            okunacağı (saniye, varsayılan: 1)
+
+    Diğer worker'lar L2'yi güncelleyebildiği için L1 ömrü kısa tutulur.
+    delete/delete_many/incr/decr/clear L2'deki nesil değerini yeniler; diğer
+    worker'lar değeri en geç L1_GENERATION_CHECK saniyede bir okur ve
+    değişmişse L1'lerini boşaltır. Böylece silinen/geçersiz kılınan değer
+    başka worker'da L1 ömrü boyunca değil, en fazla bu süre kadar görülür.
+    Başka worker'ın set'i ise L1 ömrü kadar gecikmeyle görünebilir.
+    Anahtar versiyonlama L2 backend'inin KEY_PREFIX/VERSION ayarlarıyla yapılır.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2_ALIAS', 'shared')
+        self._l1_timeout = options.get('L1_TIMEOUT', 30)
+        self._l1 = LocalLRU(options.get('L1_MAX_ENTRIES', 1000))
+        self._generation_check = options.get('L1_GENERATION_CHECK', 1)
+        self._generation = None
+        self._generation_checked_at = None
+        self._stats_lock = threading.Lock()
+        self._stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'sets': 0}
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # Yardımcılar
+
+    def _l1_key(self, key, version):
+        return self.l2.make_and_validate_key(key, version=version)
+
+    def _l1_ttl(self, timeout):
+        timeout = self._l2_timeout(timeout)
+        if timeout is None:
+            return self._l1_timeout
+        return min(timeout, self._l1_timeout)
+
+    def _sync_generation(self):
+        """Nesil değeri başka süreçte yenilenmişse L1'i boşalt (en fazla L1_GENERATION_CHECK'te bir)"""
+        now = time.monotonic()
+        if self._generation_checked_at is not None and now - self._generation_checked_at < self._generation_check:
+            return
+        self._generation_checked_at = now
+        generation = self.l2.get(GENERATION_KEY)
+        if generation != self._generation:
+            self._l1.clear()
+            self._generation = generation
+
+    def _invalidate_other_processes(self):
+        # Sayaç yerine rastgele değer: clear sonrası yeniden başlayan sayaç eski değere denk gelemez
+        self._generation = uuid.uuid4().hex
+        self.l2.set(GENERATION_KEY, self._generation, None)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        """Bu süreçteki hit/miss sayaçları"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['l1_hits'] + stats['l2_hits']) / lookups, 4) if lookups else 0.0
+        stats['l1_size'] = len(self._l1)
+        return stats
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        self._sync_generation()
+        l1_key = self._l1_key(key, version)
+        value = self._l1.get(l1_key)
+        if value is not _MISSING:
+            self._count('l1_hits')
+            return value
+
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count('misses')
+            return default
+
+        self._count('l2_hits')
+        self._l1.set(l1_key, value, self._l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout=self._l2_timeout(timeout), version=version)
+        self._count('sets')
+        if timeout != 0:
+            self._l1.set(self._l1_key(key, version), value, self._l1_ttl(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=self._l2_timeout(timeout), version=version)
+        if added and timeout != 0:
+            self._l1.set(self._l1_key(key, version), value, self._l1_ttl(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=self._l2_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self._l1.delete(self._l1_key(key, version))
+        deleted = self.l2.delete(key, version=version)
+        self._invalidate_other_processes()
+        return deleted
+
+    def has_key(self, key, version=None):
+        self._sync_generation()
+        if self._l1.get(self._l1_key(key, version)) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # Sayaçlar her zaman L2 üzerinden atomik artırılır
+        self._l1.delete(self._l1_key(key, version))
+        value = self.l2.incr(key, delta, version=version)
+        self._invalidate_other_processes()
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        self._l1.delete(self._l1_key(key, version))
+        value = self.l2.decr(key, delta, version=version)
+        self._invalidate_other_processes()
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync_generation()
+        found = {}
+        remaining = []
+        for key in keys:
+            value = self._l1.get(self._l1_key(key, version))
+            if value is _MISSING:
+                remaining.append(key)
+            else:
+                found[key] = value
+        self._count('l1_hits', len(found))
+
+        if remaining:
+            from_l2 = self.l2.get_many(remaining, version=version)
+            self._count('l2_hits', len(from_l2))
+            self._count('misses', len(remaining) - len(from_l2))
+            for key, value in from_l2.items():
+                self._l1.set(self._l1_key(key, version), value, self._l1_timeout)
+            found.update(from_l2)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        # django-redis set_many None döndürür
+        failed = self.l2.set_many(data, timeout=self._l2_timeout(timeout), version=version) or []
+        self._count('sets', len(data))
+        if timeout != 0:
+            ttl = self._l1_ttl(timeout)
+            for key, value in data.items():
+                if key not in failed:
+                    self._l1.set(self._l1_key(key, version), value, ttl)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._l1.delete(self._l1_key(key, version))
+        result = self.l2.delete_many(keys, version=version)
+        self._invalidate_other_processes()
+        return result
+
+    def clear(self):
+        self._l1.clear()
+        result = self.l2.clear()
+        self._invalidate_other_processes()
+        return result
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    def _l2_timeout(self, timeout):
+        # DEFAULT_TIMEOUT ise bu backend'in TIMEOUT ayarı L2'ye aktarılır
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
@@ -157,6 +157,60 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache - İki katmanlı: süreç içi LRU (L1) + paylaşılan Redis (L2)
+# REDIS_URL yoksa L2 olarak LocMemCache kullanılır (geliştirme ortamı)
+# USE_FAKEREDIS=True ise Redis sunucusu olmadan fakeredis ile çalışır (testler)
+REDIS_URL = config('REDIS_URL', default='')
+USE_FAKEREDIS = config('USE_FAKEREDIS', default=False, cast=bool)
+CACHE_TTL = config('CACHE_TTL', default=3600, cast=int)
+CACHE_KEY_PREFIX = 'horoscope'
+CACHE_VERSION = config('CACHE_VERSION', default=1, cast=int)
+
+if REDIS_URL or USE_FAKEREDIS:
+    SHARED_CACHE = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_URL or 'redis://localhost:6379/1',
+        'TIMEOUT': CACHE_TTL,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'VERSION': CACHE_VERSION,
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SOCKET_CONNECT_TIMEOUT': 2,
+            'SOCKET_TIMEOUT': 2,
+            # Redis erişilemezse cache miss gibi davran, siteyi düşürme
+            'IGNORE_EXCEPTIONS': True,
+        },
+    }
+    if USE_FAKEREDIS:
+        import fakeredis
+        SHARED_CACHE['OPTIONS']['CONNECTION_POOL_KWARGS'] = {
+            'connection_class': fakeredis.FakeConnection,
+        }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'horoscope-shared',
+        'TIMEOUT': CACHE_TTL,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'VERSION': CACHE_VERSION,
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'tarot_project.cache.TwoTierCache',
+        'TIMEOUT': CACHE_TTL,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'VERSION': CACHE_VERSION,
+        'OPTIONS': {
+            'L2_ALIAS': 'shared',
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1000, cast=int),
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=30, cast=int),
+            'L1_GENERATION_CHECK': config('CACHE_L1_GENERATION_CHECK', default=1, cast=float),
+        },
+    },
+    'shared': SHARED_CACHE,
+}
+
 # AI Settings - OpenRouter (Primary AI Provider)
 OPENROUTER_API_KEY = config('OPENROUTER_API_KEY', default='')
 OPENROUTER_MODEL = config('OPENROUTER_MODEL', default='moonshotai/kimi-k2:free')
@@ -208,6 +262,11 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'tarot.openrouter_service': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         'django': {
             'handlers': ['console'],
             'level': 'INFO',
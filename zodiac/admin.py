@@ -7,7 +7,8 @@ from .models import (
     ZodiacSign, DailyHoroscope, WeeklyHoroscope, 
     MonthlyHoroscope, CompatibilityReading, BirthChart,
     MoonSign, Ascendant, PersonalHoroscope,
-    UserDailyHoroscope, UserWeeklyHoroscope, UserMonthlyHoroscope
+    UserDailyHoroscope, UserWeeklyHoroscope, UserMonthlyHoroscope,
+    GeocodedPlace
 )
 from .views import generate_daily_horoscope
 
@@ -83,8 +84,8 @@ class ZodiacSignAdmin(admin.ModelAdmin):
 
 @admin.register(DailyHoroscope)
 class DailyHoroscopeAdmin(admin.ModelAdmin):
-    list_display = ['zodiac_sign', 'date', 'mood_score', 'lucky_number', 'ai_provider', 'created_at']
-    list_filter = ['date', 'zodiac_sign', 'ai_provider']
+    list_display = ['zodiac_sign', 'date', 'language', 'mood_score', 'lucky_number', 'ai_provider', 'created_at']
+    list_filter = ['date', 'language', 'zodiac_sign', 'ai_provider']
     search_fields = ['zodiac_sign__name']
     date_hierarchy = 'date'
     ordering = ['-date', 'zodiac_sign']
@@ -107,7 +108,8 @@ class DailyHoroscopeAdmin(admin.ModelAdmin):
                 # Bugün için yorum var mı kontrol et
                 existing = DailyHoroscope.objects.filter(
                     zodiac_sign=sign,
-                    date=today
+                    date=today,
+                    language='tr'
                 ).first()
                 
                 if existing:
@@ -193,8 +195,8 @@ class DailyHoroscopeAdmin(admin.ModelAdmin):
 
 @admin.register(WeeklyHoroscope)
 class WeeklyHoroscopeAdmin(admin.ModelAdmin):
-    list_display = ['zodiac_sign', 'week_start', 'week_end', 'ai_provider', 'created_at']
-    list_filter = ['week_start', 'zodiac_sign', 'ai_provider']
+    list_display = ['zodiac_sign', 'week_start', 'week_end', 'language', 'ai_provider', 'created_at']
+    list_filter = ['week_start', 'language', 'zodiac_sign', 'ai_provider']
     search_fields = ['zodiac_sign__name']
     date_hierarchy = 'week_start'
     ordering = ['-week_start', 'zodiac_sign']
@@ -202,8 +204,8 @@ class WeeklyHoroscopeAdmin(admin.ModelAdmin):
 
 @admin.register(MonthlyHoroscope)
 class MonthlyHoroscopeAdmin(admin.ModelAdmin):
-    list_display = ['zodiac_sign', 'month', 'year', 'ai_provider', 'created_at']
-    list_filter = ['year', 'month', 'zodiac_sign', 'ai_provider']
+    list_display = ['zodiac_sign', 'month', 'year', 'language', 'ai_provider', 'created_at']
+    list_filter = ['year', 'month', 'language', 'zodiac_sign', 'ai_provider']
     search_fields = ['zodiac_sign__name']
     ordering = ['-year', '-month', 'zodiac_sign']
 
@@ -312,3 +314,11 @@ class UserMonthlyHoroscopeAdmin(admin.ModelAdmin):
     list_filter = ['year', 'month', 'zodiac_sign', 'ai_provider']
     search_fields = ['user__username', 'zodiac_sign__name']
     ordering = ['-year', '-month']
+
+
+@admin.register(GeocodedPlace)
+class GeocodedPlaceAdmin(admin.ModelAdmin):
+    list_display = ['query', 'name', 'country', 'latitude', 'longitude', 'timezone', 'source', 'updated_at']
+    list_filter = ['source', 'country']
+    search_fields = ['query', 'name']
+    ordering = ['query']
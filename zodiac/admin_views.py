@@ -37,7 +37,8 @@ def horoscope_images_view(request):
         # Yorum var mı?
         horoscope = DailyHoroscope.objects.filter(
             zodiac_sign=sign,
-            date=target_date
+            date=target_date,
+            language='tr'
         ).first()
         
         # Görsel var mı?
@@ -87,7 +88,8 @@ def generate_horoscope_image(request, sign_slug, date_str):
     # Yorum var mı?
     horoscope = DailyHoroscope.objects.filter(
         zodiac_sign=sign,
-        date=target_date
+        date=target_date,
+        language='tr'
     ).first()
     
     if not horoscope:
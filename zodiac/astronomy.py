@@ -1,8 +1,10 @@
 """
 Gerçek astronomik hesaplamalar için Swiss Ephemeris servisi
 """
-from datetime import datetime
+import copy
+from datetime import datetime, timedelta, timezone as dt_timezone, tzinfo
 from typing import Optional, Tuple, Dict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
 
 try:
@@ -12,13 +14,7 @@ except ImportError:
     SWISSEPH_AVAILABLE = False
     logging.warning("pyswisseph kütüphanesi yüklü değil. Basit algoritmalar kullanılacak.")
 
-try:
-    from geopy.geocoders import Nominatim
-    GEOPY_AVAILABLE = True
-except ImportError:
-    GEOPY_AVAILABLE = False
-    logging.warning("geopy kütüphanesi yüklü değil. Varsayılan koordinatlar kullanılacak.")
-
+from . import chart as chart_engine, ephemeris, geocoding, sign_table
 from .models import ZodiacSign
 
 logger = logging.getLogger(__name__)
@@ -30,6 +26,7 @@ class AstronomyService:
     # Varsayılan koordinatlar (İstanbul)
     DEFAULT_LAT = 41.0082
     DEFAULT_LON = 28.9784
+    DEFAULT_TIMEZONE = 'Europe/Istanbul'
     
     # Burç limitleri (Tropical Zodiac)
     ZODIAC_LIMITS = [
@@ -56,7 +53,7 @@ class AstronomyService:
     
     def get_coordinates(self, place_name: str) -> Tuple[float, float]:
         """
-        Şehir adından koordinat al
+        Şehir adından koordinat al (yerel gazetteer + geocode tablosu, ağ çağrısı yok)
         
         Args:
             place_name: Şehir adı (örn: "Ankara, Türkiye")
@@ -64,31 +61,70 @@ class AstronomyService:
         Returns:
             (latitude, longitude) tuple
         """
-        if not GEOPY_AVAILABLE or not place_name:
-            logger.info(f"Varsayılan koordinatlar kullanılıyor: İstanbul ({self.DEFAULT_LAT}, {self.DEFAULT_LON})")
-            return self.DEFAULT_LAT, self.DEFAULT_LON
+        latitude, longitude, _ = self.get_location(place_name)
+        return latitude, longitude
+    
+    def get_place(self, place_name: str) -> Optional[geocoding.Place]:
+        """
+        Doğum yerini ad, ülke, koordinat ve saat dilimiyle çöz
         
+        Bulunamazsa None döner; Nominatim sorgusu arka planda çalışır ve sonucu
+        sonraki isteklerde kullanılır.
+        """
         try:
-            geolocator = Nominatim(user_agent="tarot-yorum-app")
-            location = geolocator.geocode(place_name, timeout=10)
-            
-            if location:
-                logger.info(f"{place_name} için koordinatlar bulundu: ({location.latitude}, {location.longitude})")
-                return location.latitude, location.longitude
-            else:
-                logger.warning(f"{place_name} için koordinat bulunamadı, varsayılan kullanılıyor")
-                return self.DEFAULT_LAT, self.DEFAULT_LON
-                
+            return geocoding.resolve(place_name)
         except Exception as e:
             logger.error(f"Geocoding hatası: {e}")
-            return self.DEFAULT_LAT, self.DEFAULT_LON
+            return None
+    
+    def get_location(self, place_name: str) -> Tuple[float, float, tzinfo]:
+        """
+        Doğum yerinin koordinatları ve saat dilimi
+        
+        Saat dilimi yerin kaydından, yoksa ülkesinden (tek saat dilimli ülkeler)
+        gelir; ikisi de yoksa boylamdan yaklaşık sabit fark (15° = 1 saat) kullanılır.
+        Yer bulunamazsa İstanbul varsayılır.
+        
+        Returns:
+            (latitude, longitude, tzinfo) tuple
+        """
+        place = self.get_place(place_name) if place_name else None
+        if not place:
+            logger.info(f"Varsayılan konum kullanılıyor: İstanbul ({self.DEFAULT_LAT}, {self.DEFAULT_LON})")
+            return self.DEFAULT_LAT, self.DEFAULT_LON, ZoneInfo(self.DEFAULT_TIMEZONE)
+        
+        return place.latitude, place.longitude, self.get_timezone(place)
+    
+    def get_timezone(self, place: geocoding.Place) -> tzinfo:
+        """Yerin saat dilimi (kayıt -> ülke -> boylamdan yaklaşık sabit fark)"""
+        name = geocoding.place_timezone(place)
+        if name:
+            try:
+                return ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"Saat dilimi bulunamadı: {name}")
+        
+        logger.warning(f"Saat dilimi bilinmiyor, boylamdan tahmin ediliyor: {place.name}")
+        return dt_timezone(timedelta(hours=round(place.longitude / 15)))
+    
+    def to_universal_time(self, dt: datetime, tz: tzinfo) -> datetime:
+        """
+        Doğum yerindeki yerel saati UT'ye çevir (naive datetime döner)
+        
+        Julian Day ve harita hesapları UT ister; kullanıcının girdiği saat ise
+        doğum yerinin yaz saati dahil yerel saatidir. Saat dilimi içeren
+        datetime'lar doğrudan çevrilir.
+        """
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=tz)
+        return dt.astimezone(dt_timezone.utc).replace(tzinfo=None)
     
     def datetime_to_julian(self, dt: datetime) -> float:
         """
         Datetime'ı Julian Day'e çevir
         
         Args:
-            dt: Python datetime objesi
+            dt: UT datetime (yerel saat için önce to_universal_time)
             
         Returns:
             Julian Day Number (float)
@@ -130,6 +166,18 @@ class AstronomyService:
             logger.error(f"Gezegen pozisyon hesaplama hatası: {e}")
             return 0.0, 0.0
     
+    def get_table_longitudes(self, jd: float) -> Optional[Dict[str, float]]:
+        """
+        Önceden hesaplanmış efemeris tablosundan tüm cisimlerin boylamları
+        
+        Returns:
+            {cisim: boylam} veya tablo yoksa / JD kapsam dışındaysa None
+        """
+        table = ephemeris.get_table()
+        if table is None or not table.covers(jd):
+            return None
+        return table.positions(jd)
+    
     def longitude_to_zodiac(self, longitude: float) -> int:
         """
         Ekliptik boylamı burç sırasına çevir
@@ -157,41 +205,29 @@ class AstronomyService:
         birth_place: Optional[str] = None
     ) -> Optional[ZodiacSign]:
         """
-        Gerçek Ay burcunu hesapla
+        Gerçek Ay burcunu hesapla (harita motoru: efemeris tablosu, yoksa swisseph)
         
         Args:
-            birth_date: Doğum tarihi ve saati
+            birth_date: Doğum tarihi ve saati (UT, bkz. to_universal_time)
             birth_place: Doğum yeri (şehir adı)
             
         Returns:
             ZodiacSign objesi veya None
         """
-        if not SWISSEPH_AVAILABLE:
-            logger.warning("Swiss Ephemeris yok, basit ay burcu hesaplanıyor")
+        signs = self.signs_by_order()
+        jd = self.datetime_to_julian(birth_date)
+        longitudes = self.get_table_longitudes(jd)
+        if longitudes is None and SWISSEPH_AVAILABLE:
+            longitudes = {'moon': self.get_planet_position(jd, swe.MOON)[0]}
+        
+        if not longitudes:
+            logger.warning("Efemeris yok, basit ay burcu hesaplanıyor")
             # Fallback: ay bazlı basit hesaplama
-            month = birth_date.month
-            try:
-                return ZodiacSign.objects.get(order=month)
-            except ZodiacSign.DoesNotExist:
-                return None
+            return signs.get(birth_date.month)
         
-        try:
-            # Julian Day'e çevir
-            jd = self.datetime_to_julian(birth_date)
-            
-            # Ay'ın pozisyonunu hesapla
-            moon_longitude, _ = self.get_planet_position(jd, swe.MOON)
-            
-            # Burca çevir
-            zodiac_order = self.longitude_to_zodiac(moon_longitude)
-            
-            logger.info(f"Ay pozisyonu: {moon_longitude:.2f}° -> Burç order: {zodiac_order}")
-            
-            return ZodiacSign.objects.get(order=zodiac_order)
-            
-        except Exception as e:
-            logger.error(f"Ay burcu hesaplama hatası: {e}")
-            return None
+        zodiac_order = self.longitude_to_zodiac(longitudes['moon'])
+        logger.info(f"Ay pozisyonu: {longitudes['moon']:.2f}° -> Burç order: {zodiac_order}")
+        return signs.get(zodiac_order)
     
     def calculate_ascendant(
         self,
@@ -202,126 +238,111 @@ class AstronomyService:
         """
         Gerçek Yükselen burcunu hesapla
         
+        Harita motorunun (calculate_chart) ev hesabını kullanır; iki sayfa
+        aynı doğum bilgisi için farklı yükselen göstermez.
+        
         Args:
-            birth_date: Doğum tarihi ve saati
+            birth_date: Doğum tarihi ve saati (UT, bkz. to_universal_time)
             latitude: Enlem
             longitude: Boylam
             
         Returns:
             ZodiacSign objesi veya None
         """
-        if not SWISSEPH_AVAILABLE:
-            logger.warning("Swiss Ephemeris yok, basit yükselen hesaplanıyor")
+        signs = self.signs_by_order()
+        try:
+            ascendant_longitude = chart_engine.ascendant(self.datetime_to_julian(birth_date), latitude, longitude)
+        except Exception as e:
+            logger.error(f"Yükselen burç hesaplama hatası: {e}")
+            return None
+        
+        if ascendant_longitude is None:
+            logger.warning("NumPy yok, basit yükselen hesaplanıyor")
             # Fallback: saat bazlı basit hesaplama
-            hour = birth_date.hour
-            ascendant_order = (hour // 2) + 1
-            if ascendant_order > 12:
-                ascendant_order = ascendant_order % 12
-            try:
-                return ZodiacSign.objects.get(order=ascendant_order)
-            except ZodiacSign.DoesNotExist:
-                return None
+            return signs.get(birth_date.hour // 2 + 1)
         
+        zodiac_order = self.longitude_to_zodiac(ascendant_longitude)
+        logger.info(f"Yükselen pozisyonu: {ascendant_longitude:.2f}° -> Burç order: {zodiac_order}")
+        return signs.get(zodiac_order)
+    
+    def signs_by_order(self) -> Dict[int, ZodiacSign]:
+        """Burç sırası (1-12) -> ZodiacSign kopyası; süreç içi burç tablosundan, sorgusuz"""
+        return {sign.order: copy.copy(sign) for sign in sign_table.get_table().signs.values()}
+    
+    def calculate_chart(
+        self,
+        birth_date: datetime,
+        latitude: float,
+        longitude: float
+    ) -> Optional[chart_engine.Chart]:
+        """
+        Tam doğum haritası: gezegenler, Placidus/tam burç evleri ve açılar
+        
+        birth_date UT olmalıdır (bkz. to_universal_time); yerel saat verilirse
+        evler ve Ay saat farkı kadar kayar.
+        
+        Returns:
+            Chart (BirthChart alanlarına doğrudan yazılır) veya efemeris yoksa None
+        """
         try:
-            # Julian Day'e çevir
-            jd = self.datetime_to_julian(birth_date)
-            
-            # Ev sistemini hesapla (Placidus - en yaygın)
-            # swe.houses(jd, lat, lon, b'P') -> (cusps, ascmc)
-            houses = swe.houses(jd, latitude, longitude, b'P')
-            ascendant_longitude = houses[1][0]  # ascmc[0] = Ascendant
-            
-            # Burca çevir
-            zodiac_order = self.longitude_to_zodiac(ascendant_longitude)
-            
-            logger.info(f"Yükselen pozisyonu: {ascendant_longitude:.2f}° -> Burç order: {zodiac_order}")
-            
-            return ZodiacSign.objects.get(order=zodiac_order)
-            
+            return chart_engine.compute_chart(self.datetime_to_julian(birth_date), latitude, longitude)
         except Exception as e:
-            logger.error(f"Yükselen burç hesaplama hatası: {e}")
+            logger.error(f"Harita hesaplama hatası: {e}")
             return None
     
     def calculate_all_planets(
         self,
         birth_date: datetime,
         latitude: float,
-        longitude: float
+        longitude: float,
+        chart: Optional[chart_engine.Chart] = None
     ) -> Dict[str, Dict]:
         """
         Tüm gezegenlerin pozisyonlarını hesapla
         
         Args:
-            birth_date: Doğum tarihi ve saati
+            birth_date: Doğum tarihi ve saati (UT, bkz. to_universal_time)
             latitude: Enlem
             longitude: Boylam
+            chart: Önceden hesaplanmış harita (varsa yeniden hesaplanmaz)
             
         Returns:
             Gezegen bilgileri dictionary
         """
-        if not SWISSEPH_AVAILABLE:
-            logger.warning("Swiss Ephemeris yok, gezegen hesaplamaları yapılamıyor")
+        chart = chart or self.calculate_chart(birth_date, latitude, longitude)
+        if chart is None:
+            logger.warning("Efemeris yok, gezegen hesaplamaları yapılamıyor")
             return {}
         
-        planets = {
-            'sun': swe.SUN,
-            'moon': swe.MOON,
-            'mercury': swe.MERCURY,
-            'venus': swe.VENUS,
-            'mars': swe.MARS,
-            'jupiter': swe.JUPITER,
-            'saturn': swe.SATURN,
-            'uranus': swe.URANUS,
-            'neptune': swe.NEPTUNE,
-            'pluto': swe.PLUTO,
-        }
+        # Burçlar tek seferde süreç içi tablodan (gezegen başına sorgu yok)
+        signs = self.signs_by_order()
+        points = dict(chart.planet_positions)
+        ascendant = chart.house_positions['ascendant']
+        points['ascendant'] = {'longitude': ascendant, 'sign': int(ascendant // 30) + 1, 'house': 1}
         
         results = {}
-        jd = self.datetime_to_julian(birth_date)
-        
-        for name, planet_id in planets.items():
-            try:
-                planet_longitude, _ = self.get_planet_position(jd, planet_id)
-                zodiac_order = self.longitude_to_zodiac(planet_longitude)
-                
-                zodiac_sign = ZodiacSign.objects.get(order=zodiac_order)
-                
-                results[name] = {
-                    'longitude': planet_longitude,
-                    'zodiac_order': zodiac_order,
-                    'zodiac_name': zodiac_sign.name,
-                    'zodiac_slug': zodiac_sign.slug,
-                }
-                
-            except Exception as e:
-                logger.error(f"{name} gezegeni hesaplama hatası: {e}")
+        for name, position in points.items():
+            zodiac_sign = signs.get(position['sign'])
+            if not zodiac_sign:
                 results[name] = None
-        
-        # Yükselen burcu da ekle
-        try:
-            houses = swe.houses(jd, latitude, longitude, b'P')
-            ascendant_longitude = houses[1][0]
-            zodiac_order = self.longitude_to_zodiac(ascendant_longitude)
-            zodiac_sign = ZodiacSign.objects.get(order=zodiac_order)
-            
-            results['ascendant'] = {
-                'longitude': ascendant_longitude,
-                'zodiac_order': zodiac_order,
+                continue
+            results[name] = {
+                'longitude': position['longitude'],
+                'zodiac_order': position['sign'],
                 'zodiac_name': zodiac_sign.name,
                 'zodiac_slug': zodiac_sign.slug,
+                'house': position['house'],
             }
-        except Exception as e:
-            logger.error(f"Yükselen hesaplama hatası: {e}")
-            results['ascendant'] = None
         
         return results
     
-    def get_planet_info_for_ai(self, planets: Dict[str, Dict]) -> str:
+    def get_planet_info_for_ai(self, planets: Dict[str, Dict], aspects: Optional[Dict] = None) -> str:
         """
         Gezegen bilgilerini AI için formatlı string'e çevir
         
         Args:
             planets: calculate_all_planets() sonucu
+            aspects: Chart.aspects (opsiyonel)
             
         Returns:
             Formatlı string
@@ -348,6 +369,21 @@ class AstronomyService:
         for key, info in planets.items():
             if info:
                 name = planet_names.get(key, key)
-                lines.append(f"{name}: {info['zodiac_name']} ({info['longitude']:.2f}°)")
+                house = f", {info['house']}. ev" if info.get('house') else ''
+                lines.append(f"{name}: {info['zodiac_name']} ({info['longitude']:.2f}°{house})")
+        
+        if aspects:
+            aspect_names = {
+                'conjunction': 'Kavuşum',
+                'sextile': 'Altmışlık',
+                'square': 'Kare',
+                'trine': 'Üçgen',
+                'opposition': 'Karşıt',
+            }
+            lines.append("")
+            lines.append("AÇILAR:")
+            for pair, aspect in aspects.items():
+                first, second = (planet_names.get(key, key) for key in pair.split('-'))
+                lines.append(f"{first} - {second}: {aspect_names.get(aspect['aspect'], aspect['aspect'])} (orb {aspect['orb']:.1f}°)")
         
         return "\n".join(lines)
@@ -0,0 +1,284 @@
+"""
+Toplu doğum haritası hesaplama (kampanyalar, içe aktarmalar)
+
+CSV veya JSONL akışındaki (isim, doğum tarihi/saati, doğum yeri) kayıtları
+parçalara bölünür. Her parçada:
+
+1. Doğum yerleri ana süreçte çözülür (gazetteer / geocode tablosu, yer başına bir kez);
+   yerel doğum saatleri yerin saat dilimiyle UT'ye çevrilir
+2. Güneş burçları yerel doğum tarihlerinden, burç tablosundan tek çağrıda sınıflandırılır
+3. Haritalar (gezegenler, evler, açılar) ProcessPoolExecutor'daki alt süreçlerde
+   zodiac.chart ile vektörel hesaplanır; alt süreçler veritabanına dokunmaz
+4. Sonuçlar BirthChart / PersonalHoroscope tablolarına bulk_create ile yazılır
+
+Kullanım:
+    from zodiac import bulk_charts
+
+    with open('kampanya.csv', encoding='utf-8') as f:
+        for result in bulk_charts.compute_bulk(bulk_charts.read_records(f, 'csv')):
+            bulk_charts.save_chunk(result, owner=user)
+
+Komut satırı için: python manage.py bulk_birth_charts
+"""
+import csv
+import json
+import logging
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from decouple import config
+
+from . import chart as chart_engine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = config('BULK_CHART_CHUNK_SIZE', default=2000, cast=int)
+WRITE_BATCH_SIZE = 1000
+
+# Doğum saati girdisi: ISO 'birth_datetime' veya ayrı 'birth_date' + 'birth_time'.
+# birth_datetime doğum yerindeki yerel saattir; saat dilimi içerebilir (bkz. parse_record)
+BirthRecord = namedtuple('BirthRecord', 'line name birth_datetime birth_place username')
+
+# Bir parçanın hesaplama sonucu; charts[i] records[i] içindir (hesaplanamadıysa None)
+# coordinates[i]: (enlem, boylam, varsayılan konum mu)
+ChunkResult = namedtuple('ChunkResult', 'records charts coordinates sun_sign_ids cpu_seconds')
+
+
+def parse_record(raw, line):
+    """
+    Ham satırı (dict) BirthRecord'a çevir
+
+    Tarih girildiği gibi (yerel saat) tutulur. Saat dilimi içerenler UT'ye
+    kendi farklarıyla, içermeyenler doğum yerinin saat dilimiyle çevrilir
+    (compute_bulk); kaydedilen tarih/saat ve güneş burcu yerel değerlerdir.
+
+    Raises:
+        ValueError: tarih/saat eksik veya geçersizse
+    """
+    value = (raw.get('birth_datetime') or '').strip()
+    if not value:
+        birth_date = (raw.get('birth_date') or '').strip()
+        birth_time = (raw.get('birth_time') or '').strip()
+        if not birth_date or not birth_time:
+            raise ValueError('doğum tarihi ve saati gerekli')
+        value = f"{birth_date}T{birth_time}"
+
+    birth_datetime = datetime.fromisoformat(value)
+
+    return BirthRecord(
+        line=line,
+        name=(raw.get('name') or '').strip()[:100],
+        birth_datetime=birth_datetime,
+        birth_place=(raw.get('birth_place') or '').strip()[:200],
+        username=(raw.get('username') or '').strip(),
+    )
+
+
+def read_records(stream, fmt='csv'):
+    """
+    CSV (başlık satırlı) veya JSONL akışından kayıtları oku
+
+    Geçersiz satırlar loglanıp atlanır; akış belleğe alınmadan tüketilir.
+    """
+    if fmt == 'csv':
+        rows = ((number, row) for number, row in enumerate(csv.DictReader(stream), start=2))
+    elif fmt == 'jsonl':
+        rows = ((number, line) for number, line in enumerate(stream, start=1) if line.strip())
+    else:
+        raise ValueError(f"Desteklenmeyen format: {fmt}")
+
+    for number, row in rows:
+        try:
+            yield parse_record(json.loads(row) if fmt == 'jsonl' else row, number)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"⚠️ Satır {number} atlandı: {e}")
+
+
+def local_datetime(record):
+    """Doğum yerindeki yerel tarih/saat (naive); kaydedilen ve güneş burcunda kullanılan değer"""
+    return record.birth_datetime.replace(tzinfo=None)
+
+
+def _resolve_places(records, places):
+    """
+    Doğum yerlerini çöz; places sözlüğü parçalar arasında önbellek olarak taşınır
+
+    Returns:
+        (koordinatlar, UT doğum zamanları) - koordinatlar[i]: (enlem, boylam, varsayılan konum mu)
+    """
+    from zoneinfo import ZoneInfo
+    from .astronomy import AstronomyService
+
+    astro_service = AstronomyService()
+    for record in records:
+        if record.birth_place not in places:
+            place = astro_service.get_place(record.birth_place) if record.birth_place else None
+            if place:
+                places[record.birth_place] = (
+                    (place.latitude, place.longitude, False), astro_service.get_timezone(place)
+                )
+            else:
+                # İstek yolundaki gibi İstanbul varsayılır; raporda ayrıca sayılır
+                places[record.birth_place] = (
+                    (astro_service.DEFAULT_LAT, astro_service.DEFAULT_LON, True),
+                    ZoneInfo(astro_service.DEFAULT_TIMEZONE),
+                )
+
+    coordinates, universal_times = [], []
+    for record in records:
+        location, tz = places[record.birth_place]
+        coordinates.append(location)
+        universal_times.append(astro_service.to_universal_time(record.birth_datetime, tz))
+    return coordinates, universal_times
+
+
+def compute_chunk(jds, latitudes, longitudes):
+    """
+    Bir parçanın haritalarını hesapla (alt süreçte çalışır, veritabanına gitmez)
+
+    Returns:
+        (Chart listesi, süreç CPU süresi)
+    """
+    start = time.process_time()
+    charts = chart_engine.compute_charts(jds, latitudes, longitudes)
+    return charts, time.process_time() - start
+
+
+def compute_bulk(records, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Kayıt akışını parçalar halinde süreç havuzunda hesapla
+
+    Args:
+        records: BirthRecord iterable'ı (read_records)
+        workers: Süreç sayısı (varsayılan: CPU sayısı)
+        chunk_size: Parça başına kayıt
+
+    Yields:
+        ChunkResult - girdi sırasıyla; bellekte en fazla 2 x workers parça tutulur
+    """
+    from django.db import connections
+    from . import sign_table
+
+    if np is None:
+        raise RuntimeError('Toplu harita hesaplama için numpy gerekli')
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    records = iter(records)
+    places = {}
+    pending = deque()
+
+    # Alt süreçler fork ile açılır; açık veritabanı bağlantıları paylaşılmasın
+    connections.close_all()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = list(islice(records, max(1, chunk_size)))
+            if batch:
+                coordinates, universal_times = _resolve_places(batch, places)
+                # Julian Day UT ile; güneş burcu yerel doğum tarihiyle
+                jds = chart_engine.datetimes_to_julian(np.array(universal_times, dtype='datetime64[s]'))
+                latitudes = np.array([latitude for latitude, _, _ in coordinates])
+                longitudes = np.array([longitude for _, longitude, _ in coordinates])
+                sun_sign_ids = sign_table.classify_dates([local_datetime(record).date() for record in batch])
+                future = executor.submit(compute_chunk, jds, latitudes, longitudes)
+                pending.append((batch, coordinates, sun_sign_ids, future))
+
+            # Girdi bittiyse kalanları, bitmediyse pencere dolunca en eskiyi teslim et
+            while pending and (not batch or len(pending) >= workers * 2):
+                batch_records, coordinates, sun_sign_ids, future = pending.popleft()
+                charts, cpu_seconds = future.result()
+                yield ChunkResult(batch_records, charts, coordinates, sun_sign_ids, cpu_seconds)
+
+            if not batch:
+                break
+
+
+def save_chunk(result, owner=None, targets=('birth_chart', 'personal')):
+    """
+    Bir parçanın sonuçlarını toplu yaz
+
+    BirthChart kaydın kullanıcısına (username), yoksa owner'a yazılır; analiz
+    alanları boş kalır. PersonalHoroscope yalnızca kullanıcısı bilinen kayıtlar
+    için oluşturulur/güncellenir.
+
+    Returns:
+        (yazılan harita sayısı, yazılan profil sayısı)
+    """
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from .astronomy import AstronomyService
+    from .models import BirthChart, PersonalHoroscope
+
+    User = get_user_model()
+
+    usernames = {record.username for record in result.records if record.username}
+    users = {user.username: user for user in User.objects.filter(username__in=usernames)} if usernames else {}
+    sign_ids = {order: sign.pk for order, sign in AstronomyService().signs_by_order().items()}
+
+    charts = []
+    profiles = {}
+    for record, chart, (latitude, longitude, _), sun_sign_id in zip(
+        result.records, result.charts, result.coordinates, result.sun_sign_ids
+    ):
+        if chart is None or sun_sign_id is None:
+            continue
+        moon_sign_id = sign_ids.get(chart.planet_positions['moon']['sign'])
+        rising_sign_id = sign_ids.get(chart.house_positions['whole_sign'][0])
+        user = users.get(record.username)
+        local = local_datetime(record)
+
+        if 'birth_chart' in targets and (user or owner) and moon_sign_id and rising_sign_id:
+            charts.append(BirthChart(
+                user=user or owner,
+                name=record.name or record.username or f"#{record.line}",
+                birth_date=local.date(),
+                birth_time=local.time(),
+                birth_place=record.birth_place,
+                latitude=latitude,
+                longitude=longitude,
+                sun_sign_id=sun_sign_id,
+                moon_sign_id=moon_sign_id,
+                rising_sign_id=rising_sign_id,
+                personality_analysis='',
+                emotional_analysis='',
+                career_analysis='',
+                relationship_analysis='',
+                life_path_analysis='',
+                ai_provider='',
+                **chart._asdict()
+            ))
+
+        if 'personal' in targets and user:
+            # Aynı kullanıcı parçada birden fazla geçerse son kayıt geçerli
+            profiles[user.pk] = PersonalHoroscope(
+                user=user,
+                sun_sign_id=sun_sign_id,
+                moon_sign_id=moon_sign_id,
+                ascendant_sign_id=rising_sign_id,
+                birth_date=local.date(),
+                birth_time=local.time(),
+                birth_place=record.birth_place,
+            )
+
+    with transaction.atomic():
+        if charts:
+            BirthChart.objects.bulk_create(charts, batch_size=WRITE_BATCH_SIZE)
+        if profiles:
+            PersonalHoroscope.objects.bulk_create(
+                list(profiles.values()),
+                batch_size=WRITE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['sun_sign', 'moon_sign', 'ascendant_sign', 'birth_date', 'birth_time', 'birth_place', 'updated_at'],
+            )
+
+    return len(charts), len(profiles)
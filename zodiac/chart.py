@@ -0,0 +1,310 @@
+"""
+Vektörel doğum haritası motoru
+Bir veya birden fazla an/konum için tek seferde hesaplanır:
+
+- On gök cisminin boylamları (efemeris tablosu, yoksa swisseph)
+- Placidus ev başlangıçları (kutup bölgelerinde Porphyry) ve tam burç evleri
+- 10x10 boylam farkı matrisinden orb'lu açılar (aspects)
+
+Hesaplamalar NumPy dizileri üzerinde yapılır ve veritabanına gitmez; burç
+karşılıkları ZodiacSign.order (1-12) olarak döner. Sonuç BirthChart'ın
+planet_positions / house_positions / aspects alanlarına doğrudan yazılır.
+"""
+import logging
+from collections import namedtuple
+
+from . import ephemeris
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import swisseph as swe
+except ImportError:
+    swe = None
+
+logger = logging.getLogger(__name__)
+
+# J2000.0 ve Unix epoch'un Julian Day karşılıkları
+J2000 = 2451545.0
+UNIX_EPOCH_JD = 2440587.5
+
+# (ad, açı, orb) - orb derece cinsinden izin verilen sapma
+ASPECTS = (
+    ('conjunction', 0.0, 8.0),
+    ('sextile', 60.0, 6.0),
+    ('square', 90.0, 7.0),
+    ('trine', 120.0, 8.0),
+    ('opposition', 180.0, 8.0),
+)
+
+# Placidus iterasyonu için yakınsama eşiği (radyan) ve üst sınır
+_PLACIDUS_TOLERANCE = 1e-10
+_PLACIDUS_MAX_ITERATIONS = 20
+
+# Evler 11, 12, 2, 3: RA = RAMC + taban + ağırlık * AD (AD: yükselim farkı)
+_PLACIDUS_OFFSETS = (30.0, 60.0, 120.0, 150.0)
+_PLACIDUS_WEIGHTS = (1 / 3, 2 / 3, 2 / 3, 1 / 3)
+
+if NUMPY_AVAILABLE:
+    _ASPECT_ANGLES = np.array([angle for _, angle, _ in ASPECTS])
+    _ASPECT_ORBS = np.array([orb for _, _, orb in ASPECTS])
+    # Ev genişliği için bir sonraki ev başlangıcı (12 -> 1)
+    _NEXT_CUSP = np.roll(np.arange(12), -1)
+    # 10x10 matrisin üst üçgeni: her cisim çifti bir kez
+    _PAIR_A, _PAIR_B = np.triu_indices(len(ephemeris.BODIES), k=1)
+    _PAIR_NAMES = [f"{ephemeris.BODIES[a]}-{ephemeris.BODIES[b]}" for a, b in zip(_PAIR_A, _PAIR_B)]
+
+# BirthChart alanlarıyla aynı adlar: BirthChart(**chart._asdict(), ...)
+Chart = namedtuple('Chart', 'planet_positions house_positions aspects')
+
+
+def datetimes_to_julian(values):
+    """NumPy datetime64 dizisi (UT) -> Julian Day dizisi"""
+    seconds = np.asarray(values).astype('datetime64[s]').astype(np.int64)
+    return seconds / 86400.0 + UNIX_EPOCH_JD
+
+
+def planet_longitudes(jds):
+    """
+    Her Julian Day için on cismin boylamı
+
+    Tablo kapsamındaki anlar tek toplu interpolasyonla, kalanlar swisseph ile
+    hesaplanır; ikisi de yoksa satır NaN kalır.
+
+    Returns:
+        ndarray (len(jds), len(ephemeris.BODIES))
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+    longitudes = np.full((len(jds), len(ephemeris.BODIES)), np.nan)
+
+    covered = np.zeros(len(jds), dtype=bool)
+    table = ephemeris.get_table()
+    if table is not None:
+        covered = (jds >= table.start_jd) & (jds < table.end_jd)
+        if covered.any():
+            longitudes[covered] = table.positions_many(jds[covered])
+
+    missing = np.flatnonzero(~covered)
+    if len(missing) and swe is not None:
+        body_ids = [getattr(swe, body.upper()) for body in ephemeris.BODIES]
+        for row in missing:
+            longitudes[row] = [swe.calc_ut(jds[row], body_id, swe.FLG_SWIEPH)[0][0] for body_id in body_ids]
+
+    return longitudes
+
+
+def sidereal_time(jds, geo_longitudes):
+    """Yerel yıldız zamanı = RAMC (derece, Meeus 12.4 + doğu boylamı)"""
+    t = (jds - J2000) / 36525.0
+    gmst = 280.46061837 + 360.98564736629 * (jds - J2000) + 0.000387933 * t ** 2 - t ** 3 / 38710000.0
+    return (gmst + geo_longitudes) % 360.0
+
+
+def obliquity(jds):
+    """Ortalama ekliptik eğikliği (derece, Meeus 22.2)"""
+    t = (jds - J2000) / 36525.0
+    return 23.439291111 - 0.013004167 * t - 1.639e-7 * t ** 2 + 5.036e-7 * t ** 3
+
+
+def _ecliptic_longitude(ra, eps):
+    """Ekliptik üzerindeki noktanın sağ açıklığından boylamı (radyan)"""
+    return np.arctan2(np.sin(ra), np.cos(ra) * np.cos(eps))
+
+
+def house_cusps(ramc, eps, latitudes):
+    """
+    Placidus ev başlangıçları
+
+    Args:
+        ramc, eps, latitudes: derece cinsinden (N,) diziler
+
+    Returns:
+        (cusps (N, 12) derece, placidus (N,) bool) - Placidus tanımsız olan
+        kutup enlemlerinde Porphyry kullanılır (swisseph ile aynı davranış)
+    """
+    ramc_r = np.radians(ramc)
+    eps_r = np.radians(eps)
+    phi = np.radians(np.clip(latitudes, -89.9, 89.9))
+
+    mc = np.degrees(_ecliptic_longitude(ramc_r, eps_r)) % 360.0
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc_r),
+        -(np.sin(ramc_r) * np.cos(eps_r) + np.tan(phi) * np.sin(eps_r))
+    )) % 360.0
+
+    # Her ev başlangıcının yükselim farkı (AD) kendi eğimine bağlı: AD = g(AD)
+    # sabit noktası sekant yöntemiyle bulunur (basit yineleme yüksek enlemlerde
+    # onlarca adım sürer)
+    # Kutup dairesi içinde bazı ekliptik noktaları hiç doğmaz/batmaz: Placidus
+    # tanımsızdır, bu satırlar yinelemeye katılmaz (aşağıda Porphyry)
+    placidus = np.abs(latitudes) < 90.0 - eps
+    tan_phi = np.where(placidus, np.tan(phi), 0.0)[:, None]
+    sin_eps = np.sin(eps_r)[:, None]
+    cos_eps = np.cos(eps_r)[:, None]
+    base = ramc_r[:, None] + np.radians(_PLACIDUS_OFFSETS)
+    weights = np.array(_PLACIDUS_WEIGHTS)
+
+    def residual(ad):
+        ra = base + weights * ad
+        # sin(eğim) = sin(ε) sin(λ), λ = atan2(sin RA, cos RA cos ε)
+        sin_dec = sin_eps * np.sin(np.arctan2(np.sin(ra), np.cos(ra) * cos_eps))
+        tan_dec = sin_dec / np.sqrt(1.0 - sin_dec * sin_dec)
+        return np.arcsin(np.minimum(np.maximum(tan_phi * tan_dec, -1.0), 1.0)) - ad
+
+    previous = np.zeros((len(ramc_r), 4))
+    previous_residual = residual(previous)
+    ad = previous + previous_residual
+    for _ in range(_PLACIDUS_MAX_ITERATIONS):
+        current_residual = residual(ad)
+        if np.abs(current_residual).max() < _PLACIDUS_TOLERANCE:
+            break
+        slope = current_residual - previous_residual
+        # Yakınsamış sütunlarda eğim 0 olabilir: o sütunlar yerinde kalır
+        step = np.divide(current_residual * (ad - previous), slope, out=np.zeros_like(slope), where=slope != 0.0)
+        previous, previous_residual = ad, current_residual
+        ad = ad - step
+    ra = base + weights * ad
+    intermediate = np.degrees(np.arctan2(np.sin(ra), np.cos(ra) * cos_eps)) % 360.0
+
+    if not placidus.all():
+        upper = ((asc - mc) % 360.0)[:, None] * np.array([1 / 3, 2 / 3])
+        lower = ((mc + 180.0 - asc) % 360.0)[:, None] * np.array([1 / 3, 2 / 3])
+        porphyry = np.hstack([mc[:, None] + upper, asc[:, None] + lower]) % 360.0
+        intermediate = np.where(placidus[:, None], intermediate, porphyry)
+
+    house_11, house_12, house_2, house_3 = intermediate.T
+    ic = (mc + 180.0) % 360.0
+    # 1-6. evler; 7-12. evler karşı noktalarıdır
+    first_half = np.stack([asc, house_2, house_3, ic, (house_11 + 180.0) % 360.0, (house_12 + 180.0) % 360.0], axis=1)
+    cusps = np.hstack([first_half, (first_half + 180.0) % 360.0])
+    return cusps, placidus
+
+
+def houses_of(longitudes, cusps):
+    """Her cismin bulunduğu ev (1-12): (N, B) boylam, (N, 12) başlangıç"""
+    offset = (longitudes[:, :, None] - cusps[:, None, :]) % 360.0
+    width = (cusps[:, _NEXT_CUSP] - cusps) % 360.0
+    return np.argmax(offset < width[:, None, :], axis=2) + 1
+
+
+def aspect_matrix(longitudes):
+    """
+    Tüm cisim çiftleri için en yakın açı
+
+    Returns:
+        (kind (N, B, B) ASPECTS indeksi veya -1, orb (N, B, B) derece)
+    """
+    separation = np.abs(longitudes[:, :, None] - longitudes[:, None, :]) % 360.0
+    separation = np.minimum(separation, 360.0 - separation)
+
+    deviation = np.abs(separation[..., None] - _ASPECT_ANGLES)
+    deviation = np.where(deviation <= _ASPECT_ORBS, deviation, np.inf)
+
+    orb = deviation.min(axis=-1)
+    kind = np.where(orb < np.inf, deviation.argmin(axis=-1), -1)
+    return kind, orb
+
+
+def compute_charts(jds, latitudes, longitudes):
+    """
+    Birden fazla harita için toplu hesaplama
+
+    Args:
+        jds: Julian Day (UT) dizisi
+        latitudes, longitudes: doğum yeri enlem/boylam dizileri (derece, doğu +)
+
+    Returns:
+        Chart listesi; boylamı hesaplanamayan satırlarda None
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+    latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+
+    bodies = planet_longitudes(jds)
+    valid = ~np.isnan(bodies).any(axis=1)
+    cusps, placidus = house_cusps(sidereal_time(jds, longitudes), obliquity(jds), latitudes)
+
+    # NaN satırlar (efemeris yok) aşağıda atlanır; tamsayıya çevirme uyarılarını sustur
+    with np.errstate(invalid='ignore'):
+        body_signs = (bodies // 30.0).astype(np.int64) % 12 + 1
+        ascendant_signs = (cusps[:, 0] // 30.0).astype(np.int64) % 12 + 1
+        placidus_houses = houses_of(bodies, cusps)
+        kinds, orbs = aspect_matrix(bodies)
+    whole_sign_houses = (body_signs - ascendant_signs[:, None]) % 12 + 1
+
+    # Satır başına Python nesnelerine tek seferde çevir (eleman eleman float() yerine)
+    rows = zip(
+        valid.tolist(), bodies.round(4).tolist(), (bodies % 30.0).round(2).tolist(),
+        body_signs.tolist(), placidus_houses.tolist(), whole_sign_houses.tolist(),
+        cusps.round(4).tolist(), ascendant_signs.tolist(), placidus.tolist(),
+        kinds[:, _PAIR_A, _PAIR_B].tolist(), orbs[:, _PAIR_A, _PAIR_B].round(2).tolist(),
+    )
+
+    charts = []
+    for is_valid, lons, degrees, signs, houses, whole_houses, row_cusps, ascendant_sign, is_placidus, pair_kinds, pair_orbs in rows:
+        if not is_valid:
+            charts.append(None)
+            continue
+
+        planet_positions = {
+            body: {
+                'longitude': lons[column],
+                'sign': signs[column],
+                'degree': degrees[column],
+                'house': houses[column],
+                'whole_sign_house': whole_houses[column],
+            }
+            for column, body in enumerate(ephemeris.BODIES)
+        }
+        house_positions = {
+            'system': 'placidus' if is_placidus else 'porphyry',
+            'ascendant': row_cusps[0],
+            'midheaven': row_cusps[9],
+            'cusps': row_cusps,
+            # Tam burç evleri: 1. ev yükselenin burcu
+            'whole_sign': [(ascendant_sign - 1 + house) % 12 + 1 for house in range(12)],
+        }
+        aspects = {
+            pair: {'aspect': ASPECTS[kind][0], 'orb': orb}
+            for pair, kind, orb in zip(_PAIR_NAMES, pair_kinds, pair_orbs)
+            if kind >= 0
+        }
+        charts.append(Chart(planet_positions, house_positions, aspects))
+
+    return charts
+
+
+def ascendant(jd, latitude, longitude):
+    """
+    Yükselen boylamı (derece); compute_charts ile aynı Placidus hesabı
+
+    Gezegen boylamı gerekmediğinden efemeris olmadan da çalışır.
+
+    Returns:
+        Boylam veya NumPy yoksa None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    jds = np.array([jd], dtype=np.float64)
+    cusps, _ = house_cusps(
+        sidereal_time(jds, np.array([longitude], dtype=np.float64)),
+        obliquity(jds),
+        np.array([latitude], dtype=np.float64),
+    )
+    return round(float(cusps[0, 0]), 4)
+
+
+def compute_chart(jd, latitude, longitude):
+    """
+    Tek harita
+
+    Returns:
+        Chart veya NumPy / efemeris (tablo ya da swisseph) yoksa None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    return compute_charts([jd], [latitude], [longitude])[0]
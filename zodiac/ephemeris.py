@@ -0,0 +1,132 @@
+"""
+Önceden hesaplanmış efemeris tablosu
+On gök cisminin jeosentrik ekliptik boylamları sabit adımla (varsayılan saatlik)
+`python manage.py build_ephemeris` ile bir kez hesaplanır ve NumPy dizisi olarak
+diske yazılır. Dosya süreç başına bir kez, ilk kullanımda bellek eşlemeli (mmap)
+açılır (uygulama yüklenirken değil; migrate gibi komutlar dosyaya dokunmaz); "t anındaki
+gezegen konumları" swisseph çağrılmadan iki komşu satır arasında doğrusal
+interpolasyonla bulunur. Tablo yoksa veya tarih kapsam dışındaysa çağıranlar
+swisseph'e döner.
+
+Doğruluk ve hız için: python manage.py benchmark_ephemeris
+"""
+import json
+import os
+import threading
+import logging
+
+from decouple import config
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EPHEMERIS_PATH = config(
+    'EPHEMERIS_PATH',
+    default=os.path.join(os.path.dirname(__file__), 'data', 'ephemeris.npy')
+)
+EPHEMERIS_ENABLED = config('EPHEMERIS_ENABLED', default=True, cast=bool)
+
+# Tablo sütunları (AstronomyService.calculate_all_planets anahtarlarıyla aynı sırada)
+BODIES = ('sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto')
+
+
+def metadata_path(path):
+    """Tablonun yanındaki JSON üst veri dosyası (başlangıç JD, adım, sütunlar)"""
+    return os.path.splitext(path)[0] + '.json'
+
+
+class EphemerisTable:
+    """Bellek eşlemeli boylam tablosu: satır = zaman adımı, sütun = gök cismi"""
+
+    def __init__(self, path):
+        with open(metadata_path(path), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        self.start_jd = float(meta['start_jd'])
+        self.step = float(meta['step_hours']) / 24.0
+        self.bodies = tuple(meta['bodies'])
+        self.data = np.load(path, mmap_mode='r')
+        if self.data.shape[1] != len(self.bodies):
+            raise ValueError(f"Efemeris sütun sayısı üst veriyle uyuşmuyor: {path}")
+        self.end_jd = self.start_jd + (len(self.data) - 1) * self.step
+
+    def __len__(self):
+        return len(self.data)
+
+    def covers(self, jd):
+        return self.start_jd <= jd < self.end_jd
+
+    def positions_many(self, jds):
+        """
+        Birden fazla Julian Day için boylamlar
+
+        Args:
+            jds: Julian Day (UT) dizisi; tamamı tablo kapsamında olmalı
+
+        Returns:
+            ndarray (len(jds), len(bodies)) - derece, 0-360
+        """
+        position = (np.asarray(jds, dtype=np.float64) - self.start_jd) / self.step
+        index = np.floor(position).astype(np.int64)
+        if index.size and (index.min() < 0 or index.max() >= len(self.data) - 1):
+            raise ValueError('Julian Day efemeris tablosunun kapsamı dışında')
+
+        fraction = (position - index)[:, None]
+        before = self.data[index].astype(np.float64)
+        after = self.data[index + 1].astype(np.float64)
+        # 359° -> 1° geçişinde farkı (-180, 180] aralığına al (geri hareket dahil)
+        delta = (after - before + 180.0) % 360.0 - 180.0
+        return (before + fraction * delta) % 360.0
+
+    def positions(self, jd):
+        """Tek bir Julian Day için {cisim: boylam}"""
+        row = self.positions_many([jd])[0]
+        return {body: float(value) for body, value in zip(self.bodies, row)}
+
+
+_table = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def get_table():
+    """Süreç içi tablo; dosya, NumPy yoksa veya devre dışıysa None"""
+    global _table, _loaded
+
+    if _loaded:
+        return _table
+
+    with _lock:
+        if not _loaded:
+            _table = _open()
+            _loaded = True
+    return _table
+
+
+def _open():
+    if not EPHEMERIS_ENABLED or not NUMPY_AVAILABLE:
+        return None
+    if not os.path.exists(EPHEMERIS_PATH) or not os.path.exists(metadata_path(EPHEMERIS_PATH)):
+        logger.info("Efemeris tablosu yok, gezegen konumları swisseph ile hesaplanacak")
+        return None
+    try:
+        table = EphemerisTable(EPHEMERIS_PATH)
+    except Exception as e:
+        logger.error(f"❌ Efemeris tablosu açılamadı: {e}")
+        return None
+    logger.info(f"🪐 Efemeris tablosu açıldı: {len(table)} satır, adım {table.step * 24:g} saat")
+    return table
+
+
+def reset():
+    """Tabloyu bir sonraki erişimde yeniden aç (build_ephemeris sonrası)"""
+    global _table, _loaded
+
+    with _lock:
+        _table = None
+        _loaded = False
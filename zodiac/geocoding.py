@@ -0,0 +1,268 @@
+"""
+Doğum yeri -> koordinat çözümleme
+Sorgular önce paketle gelen yerel gazetteer'dan (zodiac/data/gazetteer.tsv: il,
+ilçe ve yurt dışı şehirler; enlem/boylam/saat dilimi) çözülür:
+
+1. Birebir ad / alternatif ad eşleşmesi (bellekte, veritabanına gitmez)
+2. GeocodedPlace tablosundaki önceki sonuçlar (Nominatim, önek/bulanık eşleşmeler)
+3. Önek ve bulanık (difflib) eşleşme -> sonuç tabloya yazılır
+
+Hiçbiri tutmazsa None döner ve Nominatim sorgusu arka plan işi olarak kuyruğa
+alınır (zodiac.geocode); sonucu sonraki isteklerde tablodan gelir. Böylece harita
+hesaplama süresi üçüncü taraf servise bağlı değildir.
+"""
+import bisect
+import difflib
+import logging
+import os
+import threading
+import unicodedata
+from collections import namedtuple
+
+from decouple import config
+
+from tarot.reuse import turkish_lower
+
+try:
+    from geopy.geocoders import Nominatim
+    GEOPY_AVAILABLE = True
+except ImportError:
+    GEOPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = config(
+    'GAZETTEER_PATH',
+    default=os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.tsv')
+)
+# Bulanık eşleşme için en düşük benzerlik oranı (0-1)
+FUZZY_CUTOFF = config('GAZETTEER_FUZZY_CUTOFF', default=0.82, cast=float)
+# Önek eşleşmesi için en kısa sorgu
+MIN_PREFIX_LENGTH = 3
+NOMINATIM_ENABLED = config('NOMINATIM_ENABLED', default=True, cast=bool)
+NOMINATIM_TIMEOUT = config('NOMINATIM_TIMEOUT', default=10, cast=int)
+
+Place = namedtuple('Place', 'name country latitude longitude timezone source')
+
+# Sorgunun sonundaki ülke adları -> ISO kodu (aksanları katlanmış halde)
+COUNTRY_ALIASES = {
+    'turkiye': 'TR', 'turkey': 'TR', 'tr': 'TR',
+    'kktc': 'CY', 'kibris': 'CY', 'cyprus': 'CY',
+    'almanya': 'DE', 'germany': 'DE', 'deutschland': 'DE',
+    'avusturya': 'AT', 'austria': 'AT', 'isvicre': 'CH', 'switzerland': 'CH',
+    'hollanda': 'NL', 'netherlands': 'NL', 'belcika': 'BE', 'belgium': 'BE',
+    'fransa': 'FR', 'france': 'FR', 'ingiltere': 'GB', 'uk': 'GB', 'england': 'GB',
+    'abd': 'US', 'usa': 'US', 'amerika': 'US', 'kanada': 'CA', 'canada': 'CA',
+}
+
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def normalize_place(text):
+    """
+    Yer adını karşılaştırma için kanonik biçime getir
+
+    'İSTANBUL,  Türkiye' -> 'istanbul, turkiye'
+    """
+    text = turkish_lower(unicodedata.normalize('NFC', text or '')).translate(_FOLD)
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    parts = [' '.join(''.join(ch if ch.isalnum() else ' ' for ch in part).split()) for part in text.split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def split_query(normalized):
+    """'kadikoy, istanbul, turkiye' -> ('kadikoy', 'TR')"""
+    parts = normalized.split(', ') if normalized else []
+    country = None
+    if len(parts) > 1 and parts[-1] in COUNTRY_ALIASES:
+        country = COUNTRY_ALIASES[parts.pop()]
+    elif len(parts) == 1 and parts[0] in COUNTRY_ALIASES:
+        # Yalnızca ülke adı ('Türkiye'): şehir bilinmiyor
+        return '', COUNTRY_ALIASES[parts[0]]
+    elif parts:
+        # 'ankara turkiye' gibi virgülsüz yazımlar
+        words = parts[0].split()
+        if len(words) > 1 and words[-1] in COUNTRY_ALIASES:
+            country = COUNTRY_ALIASES[words[-1]]
+            parts[0] = ' '.join(words[:-1])
+    return (parts[0] if parts else ''), country
+
+
+class Gazetteer:
+    """Yerel yer adı indeksi (salt okunur)"""
+
+    def __init__(self, path):
+        self.places = []
+        self.index = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                name, alternates, country, latitude, longitude, timezone = line.rstrip('\n').split('\t')
+                place = Place(name, country, float(latitude), float(longitude), timezone, 'gazetteer')
+                self.places.append(place)
+                for alias in [name, *filter(None, alternates.split('|'))]:
+                    self.index.setdefault(normalize_place(alias), []).append(place)
+        self.keys = sorted(self.index)
+
+        timezones = {}
+        for place in self.places:
+            timezones.setdefault(place.country, set()).add(place.timezone)
+        # Tek saat dilimli ülkeler (Nominatim sonuçlarına saat dilimi atamak için)
+        self.country_timezones = {
+            country: zones.pop() for country, zones in timezones.items() if len(zones) == 1
+        }
+
+    def __len__(self):
+        return len(self.places)
+
+    def _pick(self, key, country):
+        candidates = self.index.get(key, [])
+        if country:
+            candidates = [place for place in candidates if place.country == country]
+        return candidates[0] if candidates else None
+
+    def exact(self, name, country=None):
+        return self._pick(name, country)
+
+    def prefix(self, name, country=None):
+        """Sorguyla başlayan en kısa ad ('kahraman' -> Kahramanmaraş)"""
+        if len(name) < MIN_PREFIX_LENGTH:
+            return None
+        start = bisect.bisect_left(self.keys, name)
+        matches = []
+        for key in self.keys[start:]:
+            if not key.startswith(name):
+                break
+            matches.append(key)
+        for key in sorted(matches, key=len):
+            place = self._pick(key, country)
+            if place:
+                return place
+        return None
+
+    def fuzzy(self, name, country=None):
+        """Yazım hatalarına toleranslı eşleşme ('diyarbakir' ~ 'diyarbakr')"""
+        for key in difflib.get_close_matches(name, self.keys, n=3, cutoff=FUZZY_CUTOFF):
+            place = self._pick(key, country)
+            if place:
+                return place
+        return None
+
+
+_gazetteer = None
+_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """Süreç içi gazetteer (ilk erişimde dosyadan yüklenir)"""
+    global _gazetteer
+
+    if _gazetteer is None:
+        with _lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer(GAZETTEER_PATH)
+                logger.info(f"🗺️ Gazetteer yüklendi: {len(_gazetteer)} yer")
+    return _gazetteer
+
+
+def place_timezone(place):
+    """Yerin IANA saat dilimi; kayıtta yoksa ülkenin tek saat dilimi, o da yoksa ''"""
+    if place.timezone:
+        return place.timezone
+    return get_gazetteer().country_timezones.get(place.country, '')
+
+
+def _from_row(row):
+    return Place(row.name, row.country, row.latitude, row.longitude, row.timezone, row.source)
+
+
+def _save(query, place):
+    from .models import GeocodedPlace
+
+    GeocodedPlace.objects.update_or_create(
+        query=query,
+        defaults={
+            'name': place.name,
+            'country': place.country,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'timezone': place.timezone,
+            'source': place.source,
+        }
+    )
+
+
+def resolve(place_name):
+    """
+    Doğum yerini çöz (ağ çağrısı yapmaz)
+
+    Returns:
+        Place veya bulunamazsa None (Nominatim sorgusu kuyruğa alınır)
+    """
+    from .models import GeocodedPlace
+
+    query = normalize_place(place_name)
+    name, country = split_query(query)
+    if not name:
+        return None
+
+    gazetteer = get_gazetteer()
+    place = gazetteer.exact(name, country)
+    if place:
+        return place
+
+    row = GeocodedPlace.objects.filter(query=query).first()
+    if row:
+        return _from_row(row)
+
+    place = gazetteer.prefix(name, country) or gazetteer.fuzzy(name, country)
+    if place:
+        logger.info(f"🗺️ Gazetteer eşleşmesi: '{place_name}' -> {place.name}")
+        _save(query, place)
+        return place
+
+    _enqueue_remote(place_name, query)
+    return None
+
+
+def _enqueue_remote(place_name, query):
+    if not NOMINATIM_ENABLED or not GEOPY_AVAILABLE:
+        logger.warning(f"⚠️ Doğum yeri bulunamadı: '{place_name}'")
+        return
+
+    from tarot import jobs
+
+    # Aynı yer için saatte en fazla bir uzak sorgu
+    jobs.enqueue('zodiac.geocode', payload={'place_name': place_name}, key=f"geocode:{query}", throttle=3600)
+    logger.warning(f"⚠️ Doğum yeri gazetteer'da yok, Nominatim sorgusu kuyruğa alındı: '{place_name}'")
+
+
+def geocode_remote(place_name):
+    """
+    Nominatim ile çöz ve tabloya yaz (yalnızca arka plan işinden çağrılır)
+
+    Returns:
+        Place veya None
+    """
+    from tarot import rate_limit
+
+    if not GEOPY_AVAILABLE:
+        return None
+
+    query = normalize_place(place_name)
+    # Nominatim kullanım politikası: saniyede en fazla bir istek
+    rate_limit.acquire('nominatim')
+    location = Nominatim(user_agent="tarot-yorum-app").geocode(
+        place_name, timeout=NOMINATIM_TIMEOUT, addressdetails=True
+    )
+    if not location:
+        logger.warning(f"⚠️ Nominatim sonucu yok: '{place_name}'")
+        return None
+
+    country = (location.raw.get('address', {}).get('country_code') or '').upper()[:2]
+    timezone = get_gazetteer().country_timezones.get(country, '')
+    place = Place(location.address[:200], country, location.latitude, location.longitude, timezone, 'nominatim')
+    _save(query, place)
+    logger.info(f"🌍 Nominatim: '{place_name}' -> ({place.latitude:.4f}, {place.longitude:.4f})")
+    return place
@@ -1,19 +1,90 @@
 """
 Günlük burç yorumlarını toplu olarak oluştur
 Her gün sabah 6'da çalıştırılabilir (cron job)
+
+Burç x tarih x dil kombinasyonları sınırlı bir thread havuzunda paralel
+üretilir. Sağlayıcı yavaşladığında (fallback yanıt) eşzamanlılık yarıya
+düşürülür ve kısa bir bekleme yapılır; başarılı yanıtlarla tekrar artırılır.
+
+Örnekler:
+    python manage.py batch_generate_horoscopes
+    python manage.py batch_generate_horoscopes --from 2025-01-01 --to 2025-01-07 --languages tr,en,de,fr --concurrency 8
+    python manage.py batch_generate_horoscopes --bulk --languages tr,en   # tarih/dil başına tek JSON isteği
 """
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
 from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from decouple import config
+from tarot import rate_limit
 from zodiac.models import ZodiacSign, DailyHoroscope
-from zodiac.views import generate_daily_horoscope
+from zodiac.views import (
+    generate_daily_horoscope, generate_daily_horoscopes_bulk, daily_horoscope_flight_key
+)
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONCURRENCY = config('BATCH_CONCURRENCY', default=4, cast=int)
+
+
+class AdaptiveLimiter:
+    """
+    Rate limit'e duyarlı eşzamanlılık sınırlayıcı (AIMD)
+
+    Sınırlanma sinyalinde limit yarıya iner ve tüm worker'lar üstel artan bir
+    süre bekler; limit kadar ardışık başarıdan sonra limit 1 artar.
+    """
+
+    def __init__(self, max_concurrency, base_backoff=2.0, max_backoff=60.0):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.throttle_events = 0
+        self._backoff = base_backoff
+        self._active = 0
+        self._successes = 0
+        self._cooldown_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self._cooldown_until - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                elif self._active < self.limit:
+                    self._active += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def release(self, throttled=False):
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self.throttle_events += 1
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+                self._cooldown_until = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+            else:
+                self._successes += 1
+                self._backoff = self.base_backoff
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
 
 class Command(BaseCommand):
-    help = 'Tüm burçlar için günlük yorumları batch olarak oluştur'
+    help = 'Tüm burçlar için günlük yorumları batch olarak (paralel) oluştur'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -21,99 +92,284 @@ class Command(BaseCommand):
             type=str,
             help='Belirli bir tarih için oluştur (YYYY-MM-DD formatında)',
         )
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            type=str,
+            help='Başlangıç tarihi (YYYY-MM-DD, dahil)',
+        )
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            type=str,
+            help='Bitiş tarihi (YYYY-MM-DD, dahil). Varsayılan: --from ile aynı gün',
+        )
+        parser.add_argument(
+            '--languages',
+            type=str,
+            default='tr',
+            help='Virgülle ayrılmış diller (ör. tr,en,de,fr). Varsayılan: tr',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=f'Eşzamanlı AI isteği sayısı. Varsayılan: {DEFAULT_CONCURRENCY}',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=2,
+            help='Fallback yanıt dönen yorumlar için ek deneme sayısı. Varsayılan: 2',
+        )
         parser.add_argument(
             '--force',
             action='store_true',
             help='Mevcut yorumları yeniden oluştur',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Her tarih/dil için 12 burcu tek JSON isteğinde üret ve bulk_create ile kaydet',
+        )
 
-    def handle(self, *args, **options):
-        # Tarih belirtildiyse onu kullan, yoksa bugünü al
-        if options['date']:
-            try:
-                target_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
-            except ValueError:
-                self.stdout.write(self.style.ERROR('❌ Geçersiz tarih formatı! YYYY-MM-DD kullanın.'))
-                return
+    def _parse_date(self, value):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'❌ Geçersiz tarih formatı: {value} (YYYY-MM-DD kullanın)')
+
+    def _get_dates(self, options):
+        if options['date_from']:
+            start = self._parse_date(options['date_from'])
+            end = self._parse_date(options['date_to']) if options['date_to'] else start
+        elif options['date']:
+            start = end = self._parse_date(options['date'])
         else:
-            target_date = timezone.now().date()
-        
+            start = end = timezone.now().date()
+
+        if end < start:
+            raise CommandError('❌ --to tarihi --from tarihinden önce olamaz.')
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    def _get_languages(self, options):
+        supported = [code for code, _ in settings.LANGUAGES]
+        languages = [lang.strip() for lang in options['languages'].split(',') if lang.strip()]
+        unknown = [lang for lang in languages if lang not in supported]
+        if unknown or not languages:
+            raise CommandError(f'❌ Desteklenmeyen dil: {", ".join(unknown)} (desteklenen: {", ".join(supported)})')
+        return languages
+
+    def _existing_keys(self, signs, dates, languages):
+        """Zaten üretilmiş (fallback olmayan) yorumlar - tek sorgu"""
+        return set(DailyHoroscope.objects.filter(
+            zodiac_sign__in=signs,
+            date__in=dates,
+            language__in=languages
+        ).exclude(ai_provider='fallback').values_list('zodiac_sign_id', 'date', 'language'))
+
+    def _generate(self, limiter, sign, target_date, language, retries):
+        """
+        Tek bir burç/tarih/dil için yorum üret (worker thread'inde çalışır)
+
+        Returns:
+            (durum, süre, deneme sayısı) - durum: 'success', 'fallback' veya 'error'
+        """
+        start = time.perf_counter()
+        attempts = 0
+        try:
+            for attempt in range(retries + 1):
+                attempts += 1
+                limiter.acquire()
+                horoscope = None
+                throttled = False
+                try:
+                    horoscope = generate_daily_horoscope(sign, target_date, language)
+                    throttled = horoscope is None or horoscope.ai_provider == 'fallback'
+                except Exception:
+                    throttled = True
+                    if attempt >= retries:
+                        raise
+                finally:
+                    limiter.release(throttled=throttled)
+
+                if not throttled:
+                    return 'success', time.perf_counter() - start, attempts
+
+                if attempt < retries:
+                    # Fallback kaydı ve single-flight sonucu temizlenir ki tekrar üretilsin
+                    if horoscope is not None and horoscope.pk:
+                        horoscope.delete()
+                    cache.delete(daily_horoscope_flight_key(sign, target_date, language))
+
+            return 'fallback', time.perf_counter() - start, attempts
+        except Exception as e:
+            logger.error(f'Batch generation error for {sign.name} ({target_date}, {language}): {e}', exc_info=True)
+            return 'error', time.perf_counter() - start, attempts
+        finally:
+            close_old_connections()
+
+    def _generate_bulk(self, limiter, signs, target_date, language):
+        """
+        Bir tarih/dil için tüm eksik burçları tek JSON isteğiyle üret
+
+        Returns:
+            ([durum, ...], süre, deneme sayısı) - her burç için bir durum
+        """
+        start = time.perf_counter()
+        limiter.acquire()
+        throttled = False
+        try:
+            horoscopes = generate_daily_horoscopes_bulk(signs, target_date, language)
+            statuses = ['fallback' if h.ai_provider == 'fallback' else 'success' for h in horoscopes]
+            statuses += ['error'] * (len(signs) - len(horoscopes))
+            throttled = 'success' not in statuses
+            return statuses, time.perf_counter() - start, 1
+        except Exception as e:
+            throttled = True
+            logger.error(f'Bulk generation error ({target_date}, {language}): {e}', exc_info=True)
+            return ['error'] * len(signs), time.perf_counter() - start, 1
+        finally:
+            limiter.release(throttled=throttled)
+            close_old_connections()
+
+    def _generate_single(self, limiter, signs, target_date, language, retries):
+        status, duration, attempts = self._generate(limiter, signs[0], target_date, language, retries)
+        return [status], duration, attempts
+
+    def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
+        dates = self._get_dates(options)
+        languages = self._get_languages(options)
+        concurrency = max(1, options['concurrency'])
         force = options['force']
-        
+
         self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
         self.stdout.write(self.style.SUCCESS(f'  📅 GÜNLÜK BURÇ BATCH GENERATION'))
         self.stdout.write(self.style.SUCCESS(f'{"="*60}\n'))
-        self.stdout.write(f'Tarih: {target_date}')
+        self.stdout.write(f'Tarih: {dates[0]}' + (f' → {dates[-1]} ({len(dates)} gün)' if len(dates) > 1 else ''))
+        self.stdout.write(f'Diller: {", ".join(languages)}')
+        self.stdout.write(f'Eşzamanlılık: {concurrency}')
+        self.stdout.write(f'Mod: {"Toplu JSON (tarih/dil başına tek istek)" if options["bulk"] else "Burç başına istek"}')
         self.stdout.write(f'Force Mode: {"Evet" if force else "Hayır"}\n')
-        
+
         # Tüm burçları al
-        signs = ZodiacSign.objects.all().order_by('name')
-        total_signs = signs.count()
-        
-        if total_signs == 0:
+        signs = list(ZodiacSign.objects.all().order_by('name'))
+
+        if not signs:
             self.stdout.write(self.style.ERROR('❌ Hiç burç bulunamadı!'))
             return
-        
-        self.stdout.write(f'Toplam {total_signs} burç için yorum oluşturulacak...\n')
-        
-        success_count = 0
+
+        existing = set() if force else self._existing_keys(signs, dates, languages)
+
+        if not force:
+            # Önceki çalıştırmalardan kalan fallback yorumlar yeniden üretilir
+            DailyHoroscope.objects.filter(
+                zodiac_sign__in=signs, date__in=dates, language__in=languages, ai_provider='fallback'
+            ).delete()
+
+        if force:
+            # Seçili dillerdeki mevcut yorumlar silinir (tek sorgu)
+            deleted, _ = DailyHoroscope.objects.filter(
+                zodiac_sign__in=signs, date__in=dates, language__in=languages
+            ).delete()
+            if deleted:
+                self.stdout.write(f'♻️  {deleted} mevcut yorum silindi')
+            cache.delete_many([
+                daily_horoscope_flight_key(sign, target_date, language)
+                for sign in signs for target_date in dates for language in languages
+            ])
+
+        # İş birimi: (burçlar, tarih, dil) - bulk modda tarih/dil başına bir grup
+        tasks = []
         skip_count = 0
-        error_count = 0
-        
-        for index, sign in enumerate(signs, 1):
-            try:
-                # Mevcut yorum var mı kontrol et
-                existing = DailyHoroscope.objects.filter(
-                    zodiac_sign=sign,
-                    date=target_date
-                ).exists()
-                
-                if existing and not force:
-                    self.stdout.write(f'⏭️  [{index}/{total_signs}] {sign.symbol} {sign.name} - Zaten mevcut, atlanıyor')
-                    skip_count += 1
-                    continue
-                
-                # Yorum oluştur
-                self.stdout.write(f'🔮 [{index}/{total_signs}] {sign.symbol} {sign.name} için yorum oluşturuluyor...')
-                
-                # Mevcut varsa sil (force mode)
-                if existing and force:
-                    DailyHoroscope.objects.filter(
-                        zodiac_sign=sign,
-                        date=target_date
-                    ).delete()
-                    self.stdout.write('   ♻️  Mevcut yorum silindi')
-                
-                # Yeni yorum oluştur
-                horoscope = generate_daily_horoscope(sign, target_date)
-                
-                if horoscope:
-                    success_count += 1
-                    provider_emoji = '🤖' if horoscope.ai_provider == 'openai' else '🆓' if horoscope.ai_provider == 'gemini' else '📝'
-                    self.stdout.write(self.style.SUCCESS(
-                        f'   ✅ Başarılı! (Provider: {provider_emoji} {horoscope.ai_provider})'
+        for target_date in dates:
+            for language in languages:
+                missing = []
+                for sign in signs:
+                    if (sign.id, target_date, language) in existing:
+                        skip_count += 1
+                    else:
+                        missing.append(sign)
+                if options['bulk'] and missing:
+                    tasks.append((missing, target_date, language))
+                else:
+                    tasks.extend(([sign], target_date, language) for sign in missing)
+
+        total = sum(len(task_signs) for task_signs, _, _ in tasks)
+        self.stdout.write(f'Toplam {total} yorum oluşturulacak, {skip_count} mevcut yorum atlanıyor...\n')
+
+        counts = {'success': 0, 'fallback': 0, 'error': 0}
+        durations = []
+        retried = 0
+        limiter = AdaptiveLimiter(concurrency)
+        started = time.perf_counter()
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='horoscope-batch') as executor:
+            if options['bulk']:
+                futures = {
+                    executor.submit(self._generate_bulk, limiter, task_signs, target_date, language): (task_signs, target_date, language)
+                    for task_signs, target_date, language in tasks
+                }
+            else:
+                futures = {
+                    executor.submit(self._generate_single, limiter, task_signs, target_date, language, options['retries']): (task_signs, target_date, language)
+                    for task_signs, target_date, language in tasks
+                }
+
+            for future in as_completed(futures):
+                task_signs, target_date, language = futures[future]
+                statuses, duration, attempts = future.result()
+                for status in statuses:
+                    counts[status] += 1
+                done += len(statuses)
+                durations.append(duration)
+                retried += attempts - 1
+
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed * 60 if elapsed else 0
+                if len(task_signs) == 1:
+                    sign = task_signs[0]
+                    label = f'[{done}/{total}] {sign.symbol} {sign.name} {target_date} ({language})'
+                else:
+                    label = f'[{done}/{total}] {len(task_signs)} burç {target_date} ({language})'
+                progress = f'{duration:.1f}s, {rate:.1f}/dk, limit={limiter.limit}'
+
+                if all(status == 'success' for status in statuses):
+                    self.stdout.write(self.style.SUCCESS(f'✅ {label} - {progress}'))
+                elif 'error' not in statuses:
+                    self.stdout.write(self.style.WARNING(
+                        f'📝 {label} - {statuses.count("fallback")} fallback yorum kaydedildi ({progress})'
                     ))
                 else:
-                    error_count += 1
-                    self.stdout.write(self.style.ERROR('   ❌ Yorum oluşturulamadı'))
-                
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(self.style.ERROR(f'   ❌ Hata: {str(e)}'))
-                logger.error(f'Batch generation error for {sign.name}: {e}', exc_info=True)
-        
+                    self.stdout.write(self.style.ERROR(f'❌ {label} - {statuses.count("error")} hata ({progress})'))
+
+        elapsed = time.perf_counter() - started
+        durations.sort()
+
         # Özet
         self.stdout.write(f'\n{"="*60}')
         self.stdout.write(self.style.SUCCESS('  📊 ÖZET'))
         self.stdout.write(f'{"="*60}')
-        self.stdout.write(f'✅ Başarılı: {success_count}')
+        self.stdout.write(f'✅ Başarılı: {counts["success"]}')
+        self.stdout.write(f'📝 Fallback: {counts["fallback"]}')
         self.stdout.write(f'⏭️  Atlanan: {skip_count}')
-        self.stdout.write(f'❌ Hatalı: {error_count}')
+        self.stdout.write(f'❌ Hatalı: {counts["error"]}')
+        self.stdout.write(f'🔁 Tekrar deneme: {retried}')
+        self.stdout.write(f'🚦 Rate limit olayı: {limiter.throttle_events} (son eşzamanlılık: {limiter.limit}/{concurrency})')
+        self.stdout.write(f'⏱️  Süre: {elapsed:.1f}s')
+        if durations:
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            self.stdout.write(f'🚀 Throughput: {total / elapsed * 60:.1f} yorum/dk')
+            self.stdout.write(f'📈 İstek süresi: ort {sum(durations) / len(durations):.1f}s, p95 {p95:.1f}s')
         self.stdout.write(f'{"="*60}\n')
-        
+
+        error_count = counts['error'] + counts['fallback']
         if error_count == 0:
             self.stdout.write(self.style.SUCCESS('🎉 Tüm yorumlar başarıyla oluşturuldu!'))
-        elif success_count > 0:
+        elif counts['success'] > 0:
             self.stdout.write(self.style.WARNING('⚠️  Bazı yorumlar oluşturulamadı.'))
         else:
             self.stdout.write(self.style.ERROR('❌ Hiçbir yorum oluşturulamadı!'))
@@ -0,0 +1,108 @@
+"""
+Efemeris tablosunun doğruluk ve hız raporu (doğrudan swe.calc_ut ile karşılaştırma)
+
+Tablo kapsamından rastgele anlar seçilir; her cisim için interpolasyon hatası
+(açı saniyesi) ve tek/toplu arama süreleri swisseph ile karşılaştırılır.
+
+Örnekler:
+    python manage.py benchmark_ephemeris
+    python manage.py benchmark_ephemeris --samples 100000 --seed 1
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from zodiac import ephemeris
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import swisseph as swe
+except ImportError:
+    swe = None
+
+
+class Command(BaseCommand):
+    help = 'Efemeris tablosunun swisseph karşısında doğruluk ve hız raporu'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=20000,
+            help='Rastgele an sayısı. Varsayılan: 20000',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Rastgele tohum. Varsayılan: 42',
+        )
+
+    def handle(self, *args, **options):
+        if np is None or swe is None:
+            raise CommandError('numpy ve pyswisseph kurulu olmalı')
+
+        table = ephemeris.get_table()
+        if table is None:
+            raise CommandError(f'Efemeris tablosu yok: {ephemeris.EPHEMERIS_PATH} (önce build_ephemeris)')
+
+        samples = max(1, options['samples'])
+        rng = np.random.default_rng(options['seed'])
+        jds = rng.uniform(table.start_jd, table.end_jd - table.step, samples)
+        body_ids = [getattr(swe, body.upper()) for body in table.bodies]
+
+        self.stdout.write(
+            f"🪐 {table.path}: {len(table):,} satır, adım {table.step * 24:g} saat, "
+            f"JD {table.start_jd:.1f}-{table.end_jd:.1f}, {samples:,} örnek\n"
+        )
+
+        # Doğrudan swisseph
+        start = time.perf_counter()
+        reference = np.array([
+            [swe.calc_ut(jd, body_id, swe.FLG_SWIEPH)[0][0] for body_id in body_ids]
+            for jd in jds
+        ])
+        swe_duration = time.perf_counter() - start
+
+        # Tablo: tek tek (harita başına bir an) ve toplu
+        start = time.perf_counter()
+        for jd in jds:
+            table.positions(jd)
+        single_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        interpolated = table.positions_many(jds)
+        batch_duration = time.perf_counter() - start
+
+        # Açısal fark (-180, 180] -> açı saniyesi
+        error = np.abs((interpolated - reference + 180.0) % 360.0 - 180.0) * 3600.0
+
+        self.stdout.write(f"{'Cisim':<10} {'ortalama':>10} {'p99':>10} {'en fazla':>10}  (açı saniyesi)")
+        for column, body in enumerate(table.bodies):
+            body_error = error[:, column]
+            self.stdout.write(
+                f"{body:<10} {body_error.mean():>10.3f} {np.percentile(body_error, 99):>10.3f} {body_error.max():>10.3f}"
+            )
+
+        # Burç sınırına çok yakın konumlarda tablo ile swisseph farklı burç verebilir
+        sign_mismatch = int((np.floor(interpolated / 30.0) != np.floor(reference / 30.0)).sum())
+
+        self.stdout.write('')
+        self.stdout.write(f"swe.calc_ut ({len(body_ids)} cisim): {swe_duration / samples * 1e6:8.1f} µs/an")
+        self.stdout.write(
+            f"Tablo, tek tek:          {single_duration / samples * 1e6:8.1f} µs/an "
+            f"({swe_duration / single_duration:.1f}x)"
+        )
+        self.stdout.write(
+            f"Tablo, toplu:            {batch_duration / samples * 1e6:8.2f} µs/an "
+            f"({swe_duration / batch_duration:.0f}x)"
+        )
+        self.stdout.write(f"Burç ataması farklı konum: {sign_mismatch} / {error.size:,}")
+
+        worst = error.max()
+        style = self.style.SUCCESS if worst < 1.0 else self.style.WARNING
+        self.stdout.write(style(f"\nEn büyük hata: {worst:.3f}\" ({worst / 3600:.6f}°)"))
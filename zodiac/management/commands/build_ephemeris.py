@@ -0,0 +1,162 @@
+"""
+Efemeris tablosunu (zodiac.ephemeris) swisseph ile önceden hesapla
+
+On gök cisminin jeosentrik boylamları sabit adımla hesaplanıp NumPy dizisi olarak
+yazılır; web/worker süreçleri dosyayı bellek eşlemeli açar. Saatlik ±150 yıl
+float32 ile yaklaşık 105 MB'tır.
+
+Örnekler:
+    python manage.py build_ephemeris                              # bugün ±150 yıl, saatlik
+    python manage.py build_ephemeris --start-year 1900 --end-year 2100 --step-hours 2
+    python manage.py build_ephemeris --workers 8 --dtype float64
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from zodiac import ephemeris
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import swisseph as swe
+except ImportError:
+    swe = None
+
+# Satır bloğu başına hesaplanan adım sayısı (iş parçası boyutu)
+CHUNK_ROWS = 50000
+
+
+def _body_ids():
+    return [getattr(swe, body.upper()) for body in ephemeris.BODIES]
+
+
+def compute_chunk(start_jd, step, first_row, rows, dtype):
+    """[first_row, first_row + rows) satırlarını hesapla (alt süreçte çalışır)"""
+    body_ids = _body_ids()
+    chunk = np.empty((rows, len(body_ids)), dtype=dtype)
+    for offset in range(rows):
+        jd = start_jd + (first_row + offset) * step
+        for column, body_id in enumerate(body_ids):
+            chunk[offset, column] = swe.calc_ut(jd, body_id, swe.FLG_SWIEPH)[0][0]
+    return first_row, chunk
+
+
+class Command(BaseCommand):
+    help = 'Gezegen boylamları için bellek eşlemeli efemeris tablosunu hesapla'
+
+    def add_arguments(self, parser):
+        year = timezone.now().year
+        parser.add_argument(
+            '--start-year',
+            type=int,
+            default=year - 150,
+            help=f'İlk yıl (1 Ocak 00:00 UT). Varsayılan: {year - 150}',
+        )
+        parser.add_argument(
+            '--end-year',
+            type=int,
+            default=year + 150,
+            help=f'Son yıl (31 Aralık dahil). Varsayılan: {year + 150}',
+        )
+        parser.add_argument(
+            '--step-hours',
+            type=float,
+            default=1.0,
+            help='Satırlar arası adım (saat). Varsayılan: 1',
+        )
+        parser.add_argument(
+            '--dtype',
+            choices=['float32', 'float64'],
+            default='float32',
+            help='Saklama tipi. Varsayılan: float32 (en fazla ~0.1" yuvarlama)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Paralel süreç sayısı. Varsayılan: CPU sayısı',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=ephemeris.EPHEMERIS_PATH,
+            help=f'Çıktı dosyası (.npy). Varsayılan: {ephemeris.EPHEMERIS_PATH}',
+        )
+
+    def handle(self, *args, **options):
+        if np is None or swe is None:
+            raise CommandError('numpy ve pyswisseph kurulu olmalı')
+        if options['end_year'] < options['start_year']:
+            raise CommandError('--end-year, --start-year değerinden küçük olamaz')
+        if options['step_hours'] <= 0:
+            raise CommandError('--step-hours pozitif olmalı')
+
+        start_jd = swe.julday(options['start_year'], 1, 1, 0.0)
+        end_jd = swe.julday(options['end_year'] + 1, 1, 1, 0.0)
+        step = options['step_hours'] / 24.0
+        # Son satır end_jd'yi kapsasın (interpolasyon için bir fazla)
+        rows = int(np.ceil((end_jd - start_jd) / step)) + 1
+        dtype = np.dtype(options['dtype'])
+
+        output = options['output']
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        temp_output = output + '.tmp.npy'
+
+        self.stdout.write(
+            f"🪐 {options['start_year']}-{options['end_year']}, {options['step_hours']:g} saat adım: "
+            f"{rows:,} satır × {len(ephemeris.BODIES)} cisim "
+            f"({rows * len(ephemeris.BODIES) * dtype.itemsize / 1024 ** 2:.0f} MB)"
+        )
+
+        table = np.lib.format.open_memmap(temp_output, mode='w+', dtype=dtype, shape=(rows, len(ephemeris.BODIES)))
+        start = time.perf_counter()
+        done = 0
+
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = [
+                executor.submit(compute_chunk, start_jd, step, first_row, min(CHUNK_ROWS, rows - first_row), dtype)
+                for first_row in range(0, rows, CHUNK_ROWS)
+            ]
+            for future in futures:
+                first_row, chunk = future.result()
+                table[first_row:first_row + len(chunk)] = chunk
+                done += len(chunk)
+                self.stdout.write(f"  {done / rows:6.1%} ({done:,}/{rows:,})", ending='\r')
+
+        table.flush()
+        del table
+
+        metadata = {
+            'start_jd': start_jd,
+            'step_hours': options['step_hours'],
+            'rows': rows,
+            'bodies': list(ephemeris.BODIES),
+            'dtype': dtype.name,
+            'start_year': options['start_year'],
+            'end_year': options['end_year'],
+            'swisseph_version': getattr(swe, 'version', ''),
+            'created_at': timezone.now().isoformat(),
+        }
+        temp_metadata = ephemeris.metadata_path(output) + '.tmp'
+        with open(temp_metadata, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+
+        # Okuyan süreçler yarım dosya görmesin
+        os.replace(temp_output, output)
+        os.replace(temp_metadata, ephemeris.metadata_path(output))
+        ephemeris.reset()
+
+        duration = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ Efemeris yazıldı: {output} ({duration:.1f}s, "
+            f"{rows * len(ephemeris.BODIES) / duration:,.0f} konum/s)"
+        ))
+        self.stdout.write("Doğruluk raporu için: python manage.py benchmark_ephemeris")
@@ -0,0 +1,166 @@
+"""
+Doğum haritalarını toplu hesapla ve kaydet (kampanyalar, içe aktarmalar)
+
+Girdi CSV (başlık satırlı) veya JSONL'dir; alanlar: name, birth_datetime (ISO,
+saat dilimi opsiyonel) veya birth_date + birth_time, birth_place ve opsiyonel
+username. Saat doğum yerinin yerel saatidir; saat dilimi verilmezse doğum yerinin
+saat dilimi kullanılır. Haritalar süreç havuzunda parça parça hesaplanır (bkz.
+zodiac.bulk_charts) ve BirthChart / PersonalHoroscope tablolarına toplu yazılır.
+Sonunda saniyede ve çekirdek başına harita sayısı raporlanır.
+
+Örnekler:
+    python manage.py bulk_birth_charts kampanya.csv --user admin
+    python manage.py bulk_birth_charts kayitlar.jsonl --workers 8 --chunk-size 5000
+    cat kayitlar.jsonl | python manage.py bulk_birth_charts - --format jsonl --dry-run
+"""
+import os
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from zodiac import bulk_charts
+
+User = get_user_model()
+
+TARGETS = ('birth_chart', 'personal')
+
+
+class Command(BaseCommand):
+    help = 'CSV/JSONL doğum kayıtlarından haritaları süreç havuzunda toplu hesapla ve kaydet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input',
+            type=str,
+            help='Girdi dosyası (stdin için -)',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Girdi formatı. Varsayılan: dosya uzantısından (stdin için csv)',
+        )
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Kullanıcısı (username) olmayan kayıtların haritalarının sahibi',
+        )
+        parser.add_argument(
+            '--targets',
+            type=str,
+            default=','.join(TARGETS),
+            help=f'Yazılacak tablolar: birth_chart, personal. Varsayılan: {",".join(TARGETS)}',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Paralel süreç sayısı. Varsayılan: CPU sayısı',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=bulk_charts.CHUNK_SIZE,
+            help=f'Parça başına kayıt. Varsayılan: {bulk_charts.CHUNK_SIZE}',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Yalnızca hesapla, veritabanına yazma (verim ölçümü için)',
+        )
+
+    def _get_format(self, options):
+        if options['format']:
+            return options['format']
+        if options['input'].endswith(('.jsonl', '.ndjson')):
+            return 'jsonl'
+        return 'csv'
+
+    def _get_targets(self, options):
+        targets = [target.strip() for target in options['targets'].split(',') if target.strip()]
+        unknown = [target for target in targets if target not in TARGETS]
+        if unknown or not targets:
+            raise CommandError(f'❌ Geçersiz hedef: {", ".join(unknown)} (geçerli: {", ".join(TARGETS)})')
+        return targets
+
+    def _get_owner(self, options):
+        if not options['user']:
+            return None
+        try:
+            return User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'❌ Kullanıcı bulunamadı: {options["user"]}')
+
+    def handle(self, *args, **options):
+        fmt = self._get_format(options)
+        targets = self._get_targets(options)
+        owner = self._get_owner(options)
+        workers = max(1, options['workers'])
+        dry_run = options['dry_run']
+
+        if options['input'] == '-':
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(options['input'], encoding='utf-8', newline='')
+            except OSError as e:
+                raise CommandError(f'❌ Girdi açılamadı: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('  🪐 TOPLU DOĞUM HARİTASI'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}\n'))
+        self.stdout.write(f'Girdi: {options["input"]} ({fmt})')
+        self.stdout.write(f'Süreç: {workers}, parça: {options["chunk_size"]}')
+        self.stdout.write(f'Hedef: {"(yazma yok)" if dry_run else ", ".join(targets)}\n')
+
+        records = computed = charts_written = profiles_written = default_places = 0
+        cpu_seconds = 0.0
+        start = time.perf_counter()
+
+        try:
+            results = bulk_charts.compute_bulk(
+                bulk_charts.read_records(stream, fmt),
+                workers=workers,
+                chunk_size=options['chunk_size'],
+            )
+            for result in results:
+                records += len(result.records)
+                computed += sum(1 for chart in result.charts if chart is not None)
+                default_places += sum(1 for _, _, is_default in result.coordinates if is_default)
+                cpu_seconds += result.cpu_seconds
+
+                if not dry_run:
+                    written_charts, written_profiles = bulk_charts.save_chunk(result, owner=owner, targets=targets)
+                    charts_written += written_charts
+                    profiles_written += written_profiles
+
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'  {records:,} kayıt, {records / elapsed:,.0f} kayıt/s', ending='\r')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        duration = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(f'\n\n{"="*60}'))
+        self.stdout.write(self.style.SUCCESS('  📊 ÖZET'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*60}'))
+        self.stdout.write(f'Kayıt: {records:,}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Hesaplanan harita: {computed:,}'))
+        if records - computed:
+            self.stdout.write(self.style.ERROR(f'❌ Hesaplanamayan (efemeris yok): {records - computed:,}'))
+        if default_places:
+            self.stdout.write(self.style.WARNING(f'⚠️ Doğum yeri bulunamadı, İstanbul varsayıldı: {default_places:,}'))
+        if not dry_run:
+            self.stdout.write(f'BirthChart yazıldı: {charts_written:,}')
+            self.stdout.write(f'PersonalHoroscope yazıldı/güncellendi: {profiles_written:,}')
+            if 'birth_chart' in targets and owner is None and charts_written < computed:
+                self.stdout.write(self.style.WARNING('⚠️ Kullanıcısı olmayan kayıtlar için --user verilmedi'))
+
+        self.stdout.write(f'\n⏱️  Toplam süre: {duration:.2f}s')
+        if duration > 0 and computed:
+            self.stdout.write(f'Uçtan uca: {computed / duration:,.0f} harita/s ({computed / duration / workers:,.0f} harita/s/çekirdek)')
+        if cpu_seconds > 0:
+            # Alt süreçlerin yalnızca hesaplamaya harcadığı CPU süresi üzerinden
+            self.stdout.write(f'Hesaplama: {computed / cpu_seconds:,.0f} harita/s/çekirdek')
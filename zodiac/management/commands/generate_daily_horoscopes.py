@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from tarot import rate_limit
 from zodiac.models import ZodiacSign, DailyHoroscope
 from zodiac.views import generate_daily_horoscope
 import time
@@ -29,6 +30,8 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
         today = timezone.now().date()
         force = options.get('force', False)
         delay = options.get('delay', 3)
@@ -58,7 +61,8 @@ class Command(BaseCommand):
             # Var olan yorumu kontrol et
             existing = DailyHoroscope.objects.filter(
                 zodiac_sign=sign,
-                date=today
+                date=today,
+                language=language
             ).first()
             
             if existing and not force:
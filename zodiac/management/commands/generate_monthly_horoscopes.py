@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from tarot import rate_limit
 from zodiac.models import ZodiacSign, MonthlyHoroscope
 from zodiac.services import ZodiacAIService
 
@@ -23,8 +24,19 @@ class Command(BaseCommand):
             action='store_true',
             help='Mevcut yorumları güncelle'
         )
+        parser.add_argument(
+            '--language',
+            type=str,
+            default='tr',
+            choices=['tr', 'en', 'de', 'fr'],
+            help='Yorum dili. Varsayılan: tr'
+        )
 
     def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
+        language = options['language']
+
         # Yıl ve ay belirleme
         today = timezone.now().date()
         year = options['year'] or today.year
@@ -54,7 +66,8 @@ class Command(BaseCommand):
                 existing = MonthlyHoroscope.objects.filter(
                     zodiac_sign=sign,
                     year=year,
-                    month=month
+                    month=month,
+                    language=language
                 ).first()
 
                 if existing and not options['force']:
@@ -65,7 +78,7 @@ class Command(BaseCommand):
                 self.stdout.write(f"  {'🔄' if existing else '🆕'} {sign.name}: {'Güncelleniyor' if existing else 'Oluşturuluyor'}...")
 
                 # AI ile yorum oluştur
-                horoscope_data = ai_service.generate_monthly_horoscope(sign, year, month)
+                horoscope_data = ai_service.generate_monthly_horoscope(sign, year, month, language)
 
                 if existing:
                     # Güncelle
@@ -80,6 +93,7 @@ class Command(BaseCommand):
                         zodiac_sign=sign,
                         year=year,
                         month=month,
+                        language=language,
                         **horoscope_data
                     )
                     created_count += 1
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
+from tarot import rate_limit
 from zodiac.models import ZodiacSign, WeeklyHoroscope
 from zodiac.services import ZodiacAIService
 
@@ -19,8 +20,19 @@ class Command(BaseCommand):
             action='store_true',
             help='Mevcut yorumları güncelle'
         )
+        parser.add_argument(
+            '--language',
+            type=str,
+            default='tr',
+            choices=['tr', 'en', 'de', 'fr'],
+            help='Yorum dili. Varsayılan: tr'
+        )
 
     def handle(self, *args, **options):
+        # Dış API kotasında web isteklerine öncelik ver
+        rate_limit.set_default_priority('batch')
+        language = options['language']
+
         # Hafta başlangıç tarihini belirle (Pazartesi)
         if options['week_start']:
             from datetime import datetime
@@ -47,7 +59,8 @@ class Command(BaseCommand):
                 # Mevcut yorum var mı kontrol et
                 existing = WeeklyHoroscope.objects.filter(
                     zodiac_sign=sign,
-                    week_start=week_start
+                    week_start=week_start,
+                    language=language
                 ).first()
 
                 if existing and not options['force']:
@@ -58,7 +71,7 @@ class Command(BaseCommand):
                 self.stdout.write(f"  {'🔄' if existing else '🆕'} {sign.name}: {'Güncelleniyor' if existing else 'Oluşturuluyor'}...")
 
                 # AI ile yorum oluştur
-                horoscope_data = ai_service.generate_weekly_horoscope(sign, week_start)
+                horoscope_data = ai_service.generate_weekly_horoscope(sign, week_start, language)
 
                 if existing:
                     # Güncelle
@@ -73,6 +86,7 @@ class Command(BaseCommand):
                         zodiac_sign=sign,
                         week_start=week_start,
                         week_end=week_end,
+                        language=language,
                         **horoscope_data
                     )
                     created_count += 1
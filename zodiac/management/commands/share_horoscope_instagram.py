@@ -8,6 +8,8 @@ from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from tarot import rate_limit
+from tarot.http_session import get_vendor_session
 from zodiac.models import ZodiacSign, DailyHoroscope
 
 
@@ -85,7 +87,8 @@ class Command(BaseCommand):
                 # Günlük yorumu getir
                 horoscope = DailyHoroscope.objects.filter(
                     zodiac_sign=sign,
-                    date=target_date
+                    date=target_date,
+                    language='tr'
                 ).first()
                 
                 if not horoscope:
@@ -100,14 +103,15 @@ class Command(BaseCommand):
                 self.stdout.write(f"  ✅ Görsel oluşturuldu: {image_path}")
                 
                 if not options['test']:
-                    # Instagram'a paylaş
-                    result = self._post_to_instagram(
-                        image_path,
-                        sign,
-                        horoscope,
-                        access_token,
-                        instagram_account_id
-                    )
+                    # Instagram'a paylaş (admin panelinden de çağrıldığı için öncelik yalnızca bu blokta)
+                    with rate_limit.priority('batch'):
+                        result = self._post_to_instagram(
+                            image_path,
+                            sign,
+                            horoscope,
+                            access_token,
+                            instagram_account_id
+                        )
                     
                     if result:
                         self.stdout.write(
@@ -312,7 +316,7 @@ Detaylı yorum için: www.tarot-yorum.fun
             }
             
             self.stdout.write(f"    🔄 Container oluşturuluyor...")
-            container_response = requests.post(container_url, params=container_params, timeout=30)
+            container_response = get_vendor_session().post(container_url, params=container_params, timeout=30)
             
             if container_response.status_code != 200:
                 self.stdout.write(
@@ -344,7 +348,7 @@ Detaylı yorum için: www.tarot-yorum.fun
             }
             
             self.stdout.write(f"    🔄 Post yayınlanıyor...")
-            publish_response = requests.post(publish_url, params=publish_params, timeout=30)
+            publish_response = get_vendor_session().post(publish_url, params=publish_params, timeout=30)
             
             if publish_response.status_code != 200:
                 self.stdout.write(
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.2 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+LANGUAGE_CHOICES = [('tr', 'Türkçe'), ('en', 'English'), ('de', 'Deutsch'), ('fr', 'Français')]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zodiac', '0005_zodiacsign_is_premium_only_zodiacsign_token_cost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyhoroscope',
+            name='language',
+            field=models.CharField(choices=LANGUAGE_CHOICES, default='tr', max_length=10, verbose_name='Dil'),
+        ),
+        migrations.AddField(
+            model_name='weeklyhoroscope',
+            name='language',
+            field=models.CharField(choices=LANGUAGE_CHOICES, default='tr', max_length=10, verbose_name='Dil'),
+        ),
+        migrations.AddField(
+            model_name='monthlyhoroscope',
+            name='language',
+            field=models.CharField(choices=LANGUAGE_CHOICES, default='tr', max_length=10, verbose_name='Dil'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailyhoroscope',
+            unique_together={('zodiac_sign', 'date', 'language')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='weeklyhoroscope',
+            unique_together={('zodiac_sign', 'week_start', 'language')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='monthlyhoroscope',
+            unique_together={('zodiac_sign', 'month', 'year', 'language')},
+        ),
+    ]
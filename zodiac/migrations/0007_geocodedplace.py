@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zodiac', '0006_horoscope_language'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodedPlace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=200, unique=True, verbose_name='Normalize Sorgu')),
+                ('name', models.CharField(max_length=200, verbose_name='Yer Adı')),
+                ('country', models.CharField(blank=True, max_length=2, verbose_name='Ülke Kodu')),
+                ('latitude', models.FloatField(verbose_name='Enlem')),
+                ('longitude', models.FloatField(verbose_name='Boylam')),
+                ('timezone', models.CharField(blank=True, max_length=64, verbose_name='Saat Dilimi')),
+                ('source', models.CharField(choices=[('gazetteer', 'Yerel Gazetteer'), ('nominatim', 'Nominatim'), ('manual', 'Manuel')], default='gazetteer', max_length=20, verbose_name='Kaynak')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Coğrafi Kodlanmış Yer',
+                'verbose_name_plural': 'Coğrafi Kodlanmış Yerler',
+                'ordering': ['query'],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -6,6 +7,18 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 User = get_user_model()
 
 
+def horoscope_language(language=None):
+    """
+    Aktif dili burç yorumlarının saklandığı dil koduna çevir
+    'en-us' -> 'en'; desteklenmeyen diller varsayılan dile (tr) düşer.
+    """
+    from django.utils.translation import get_language
+
+    code = (language or get_language() or settings.LANGUAGE_CODE).split('-')[0].lower()
+    supported = [lang for lang, _ in settings.LANGUAGES]
+    return code if code in supported else settings.LANGUAGE_CODE
+
+
 class ZodiacSign(models.Model):
     """Burç bilgileri"""
     name = models.CharField(max_length=50, unique=True, verbose_name="Burç Adı")
@@ -81,33 +94,35 @@ class ZodiacSign(models.Model):
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Süreç içi burç tablosunu (zodiac.sign_table) tüm worker'larda yenile
+        from .sign_table import invalidate
+        invalidate()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        from .sign_table import invalidate
+        invalidate()
+        return result
+    
     @classmethod
     def get_sign_by_date(cls, month, day):
-        """Doğum tarihine göre burç belirle"""
-        for sign in cls.objects.all():
-            if sign.start_month == sign.end_month:
-                # Aynı ay içinde
-                if month == sign.start_month and sign.start_day <= day <= sign.end_day:
-                    return sign
-            elif sign.start_month < sign.end_month:
-                # Normal durum (örn: Mart 21 - Nisan 19)
-                if (month == sign.start_month and day >= sign.start_day) or \
-                   (month == sign.end_month and day <= sign.end_day) or \
-                   (sign.start_month < month < sign.end_month):
-                    return sign
-            else:
-                # Yıl geçişi olan burçlar (örn: Aralık 22 - Ocak 19)
-                if (month == sign.start_month and day >= sign.start_day) or \
-                   (month == sign.end_month and day <= sign.end_day) or \
-                   (month > sign.start_month or month < sign.end_month):
-                    return sign
-        return None
+        """Doğum tarihine göre burç belirle (366 günlük süreç içi tablodan)"""
+        from .sign_table import sign_for
+        return sign_for(month, day)
 
 
 class DailyHoroscope(models.Model):
     """Günlük burç yorumu"""
     zodiac_sign = models.ForeignKey(ZodiacSign, on_delete=models.CASCADE, verbose_name="Burç")
     date = models.DateField(verbose_name="Tarih")
+    language = models.CharField(
+        max_length=10,
+        choices=settings.LANGUAGES,
+        default='tr',
+        verbose_name="Dil"
+    )
     general = models.TextField(verbose_name="Genel Yorum")
     love = models.TextField(verbose_name="Aşk Hayatı")
     career = models.TextField(verbose_name="Kariyer")
@@ -131,11 +146,11 @@ class DailyHoroscope(models.Model):
     class Meta:
         verbose_name = "Günlük Burç Yorumu"
         verbose_name_plural = "Günlük Burç Yorumları"
-        unique_together = ['zodiac_sign', 'date']
+        unique_together = ['zodiac_sign', 'date', 'language']
         ordering = ['-date']
     
     def __str__(self):
-        return f"{self.zodiac_sign.name} - {self.date}"
+        return f"{self.zodiac_sign.name} - {self.date} ({self.language})"
 
 
 class WeeklyHoroscope(models.Model):
@@ -143,6 +158,12 @@ class WeeklyHoroscope(models.Model):
     zodiac_sign = models.ForeignKey(ZodiacSign, on_delete=models.CASCADE, verbose_name="Burç")
     week_start = models.DateField(verbose_name="Hafta Başlangıcı")
     week_end = models.DateField(verbose_name="Hafta Bitişi")
+    language = models.CharField(
+        max_length=10,
+        choices=settings.LANGUAGES,
+        default='tr',
+        verbose_name="Dil"
+    )
     general = models.TextField(verbose_name="Genel Yorum")
     love = models.TextField(verbose_name="Aşk Hayatı")
     career = models.TextField(verbose_name="Kariyer")
@@ -160,11 +181,11 @@ class WeeklyHoroscope(models.Model):
     class Meta:
         verbose_name = "Haftalık Burç Yorumu"
         verbose_name_plural = "Haftalık Burç Yorumları"
-        unique_together = ['zodiac_sign', 'week_start']
+        unique_together = ['zodiac_sign', 'week_start', 'language']
         ordering = ['-week_start']
     
     def __str__(self):
-        return f"{self.zodiac_sign.name} - {self.week_start} / {self.week_end}"
+        return f"{self.zodiac_sign.name} - {self.week_start} / {self.week_end} ({self.language})"
 
 
 class MonthlyHoroscope(models.Model):
@@ -175,6 +196,12 @@ class MonthlyHoroscope(models.Model):
         verbose_name="Ay"
     )
     year = models.IntegerField(verbose_name="Yıl")
+    language = models.CharField(
+        max_length=10,
+        choices=settings.LANGUAGES,
+        default='tr',
+        verbose_name="Dil"
+    )
     general = models.TextField(verbose_name="Genel Yorum")
     love = models.TextField(verbose_name="Aşk Hayatı")
     career = models.TextField(verbose_name="Kariyer")
@@ -193,11 +220,11 @@ class MonthlyHoroscope(models.Model):
     class Meta:
         verbose_name = "Aylık Burç Yorumu"
         verbose_name_plural = "Aylık Burç Yorumları"
-        unique_together = ['zodiac_sign', 'month', 'year']
+        unique_together = ['zodiac_sign', 'month', 'year', 'language']
         ordering = ['-year', '-month']
     
     def __str__(self):
-        return f"{self.zodiac_sign.name} - {self.month}/{self.year}"
+        return f"{self.zodiac_sign.name} - {self.month}/{self.year} ({self.language})"
 
 
 class CompatibilityReading(models.Model):
@@ -465,3 +492,30 @@ class UserMonthlyHoroscope(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.zodiac_sign.name} - {self.month}/{self.year}"
+
+
+class GeocodedPlace(models.Model):
+    """Doğum yeri sorgusu -> koordinat kaydı (gazetteer eşleşmesi veya Nominatim sonucu)"""
+    SOURCE_CHOICES = [
+        ('gazetteer', 'Yerel Gazetteer'),
+        ('nominatim', 'Nominatim'),
+        ('manual', 'Manuel'),
+    ]
+    
+    query = models.CharField(max_length=200, unique=True, verbose_name="Normalize Sorgu")
+    name = models.CharField(max_length=200, verbose_name="Yer Adı")
+    country = models.CharField(max_length=2, blank=True, verbose_name="Ülke Kodu")
+    latitude = models.FloatField(verbose_name="Enlem")
+    longitude = models.FloatField(verbose_name="Boylam")
+    timezone = models.CharField(max_length=64, blank=True, verbose_name="Saat Dilimi")
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='gazetteer', verbose_name="Kaynak")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Coğrafi Kodlanmış Yer"
+        verbose_name_plural = "Coğrafi Kodlanmış Yerler"
+        ordering = ['query']
+    
+    def __str__(self):
+        return f"{self.query} -> {self.name} ({self.latitude:.4f}, {self.longitude:.4f})"
@@ -0,0 +1,275 @@
+"""
+Yapılandırılmış (JSON) AI çıktıları için şemalar ve doğrulama
+Model yanıtı serbest metin yerine JSON olarak istenir; burada ayrıştırılır ve
+alan bazında doğrulanır. Doğrulamayı geçemeyen kayıtlar SchemaError fırlatır.
+
+Her ürünün (günlük, haftalık, aylık, uyum, doğum haritası) bölüm şeması
+alan adı -> (en az, en fazla karakter) biçimindedir. validate_sections geçerli
+alanları ve hatalı alanları ayrı döndürür; böylece kısmi sonuçlar saklanabilir
+ve yalnızca eksik alanlar yeniden istenir.
+"""
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaError(ValueError):
+    """AI çıktısı beklenen şemaya uymuyor"""
+
+
+# Günlük yorum bölümleri: alan adı -> (en az, en fazla karakter)
+DAILY_SECTIONS = {
+    'general': (40, 1500),
+    'love': (20, 1000),
+    'career': (20, 1000),
+    'health': (20, 1000),
+    'money': (20, 1000),
+}
+
+WEEKLY_SECTIONS = {
+    'general': (60, 2000),
+    'love': (40, 1500),
+    'career': (40, 1500),
+    'health': (30, 1200),
+    'money': (30, 1200),
+    'advice': (30, 1200),
+}
+
+MONTHLY_SECTIONS = {
+    'general': (80, 2500),
+    'love': (60, 2000),
+    'career': (60, 2000),
+    'health': (40, 1500),
+    'money': (40, 1500),
+    'opportunities': (30, 1200),
+    'challenges': (30, 1200),
+}
+
+COMPATIBILITY_SECTIONS = {
+    'love_compatibility': (60, 2000),
+    'friendship_compatibility': (60, 2000),
+    'work_compatibility': (60, 2000),
+    'challenges': (40, 1500),
+    'advice': (40, 1500),
+}
+
+BIRTH_CHART_SECTIONS = {
+    'personality': (200, 6000),
+    'emotional': (120, 4000),
+    'career': (120, 4000),
+    'relationship': (120, 4000),
+    'life_path': (120, 4000),
+}
+
+# Prompt'a eklenen örnek yapı (tek burç)
+DAILY_ENTRY_EXAMPLE = {
+    'general': '...',
+    'love': '...',
+    'career': '...',
+    'health': '...',
+    'money': '...',
+    'mood_score': 7,
+}
+
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+# Nesne içinde '{' veya ',' sonrası gelen (yani anahtar olan) son metin; kapanış
+# tırnağı olmayabilir: {"a": "b", "lo  /  {"a": "b", "love"
+_DANGLING_KEY_RE = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*\\?"?\s*$')
+_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+# Cümle sonu: noktalama ardından boşluk veya metin sonu
+_SENTENCE_END_RE = re.compile(r'[.!?…](?=\s|$)')
+
+
+def repair_json(text):
+    """
+    Sık görülen model hatalarını yerel olarak onar (yeni istek atmadan)
+
+    - Metin içindeki kaçışsız satır sonları ve tab karakterleri
+    - Kapanıştan önceki fazladan virgüller
+    - max_tokens ile kesilmiş yanıtlar: açık metin ve parantezler kapatılır,
+      değeri gelmemiş son anahtar ('"lo', '"love"') atılır, ':' ile biten
+      anahtara null verilir
+    """
+    chars = []
+    stack = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch in _ESCAPES:
+                ch = _ESCAPES[ch]
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and stack:
+            stack.pop()
+        chars.append(ch)
+
+    repaired = ''.join(chars)
+    if stack:
+        if stack[-1] == '}' and _DANGLING_KEY_RE.search(repaired):
+            # Değeri hiç gelmemiş yarım anahtar (ve önündeki virgül) atılır
+            repaired = _DANGLING_KEY_RE.sub(r'\1', repaired)
+            in_string = False
+        if in_string:
+            repaired = repaired.rstrip('\\') + '"'
+        repaired = repaired.rstrip().rstrip(',')
+        # Değeri gelmeden kesilmiş anahtar: "alan": -> "alan": null
+        if repaired.endswith(':'):
+            repaired += ' null'
+        repaired += ''.join(reversed(stack))
+    return _TRAILING_COMMA_RE.sub(r'\1', repaired)
+
+
+def extract_json(text):
+    """
+    Model yanıtından JSON nesnesini çıkar
+    ```json blokları ve nesne öncesi/sonrası açıklama metinleri temizlenir;
+    ayrıştırılamayan yanıtlar önce repair_json ile onarılır.
+    """
+    if not text:
+        raise SchemaError('Boş yanıt')
+
+    text = _FENCE_RE.sub('', text.strip())
+    start = text.find('{')
+    if start == -1:
+        raise SchemaError('Yanıtta JSON nesnesi bulunamadı')
+
+    end = text.rfind('}')
+    candidate = text[start:end + 1] if end > start else text[start:]
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    # Kesilmiş yanıtlarda son '}' iç nesneye ait olabilir; metnin tamamı onarılır
+    try:
+        return json.loads(repair_json(text[start:]))
+    except json.JSONDecodeError as e:
+        raise SchemaError(f'Geçersiz JSON: {e}')
+
+
+def validate_text(value, field, min_length, max_length):
+    """
+    Metin alanını doğrula
+
+    En fazla uzunluğu aşan metin son tam cümlesinden kesilir (loglanır);
+    sınır içinde min_length'i karşılayan cümle sonu yoksa SchemaError.
+    """
+    if not isinstance(value, str):
+        raise SchemaError(f'{field}: metin bekleniyordu')
+    value = value.strip()
+    if len(value) < min_length:
+        raise SchemaError(f'{field}: çok kısa ({len(value)} karakter)')
+    if len(value) <= max_length:
+        return value
+
+    ends = [match.end() for match in _SENTENCE_END_RE.finditer(value, 0, max_length + 1) if match.end() <= max_length]
+    if not ends or ends[-1] < min_length:
+        raise SchemaError(f'{field}: çok uzun ({len(value)} karakter, en fazla {max_length})')
+    logger.warning(f"✂️ {field}: {len(value)} karakterlik metin cümle sonundan {ends[-1]} karaktere kesildi")
+    return value[:ends[-1]]
+
+
+def validate_int(value, field, minimum, maximum):
+    """Tam sayı alanını doğrula ('7' gibi metinler kabul edilir)"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise SchemaError(f'{field}: sayı bekleniyordu')
+    if not minimum <= value <= maximum:
+        raise SchemaError(f'{field}: {minimum}-{maximum} aralığında olmalı')
+    return value
+
+
+def validate_sections(document, sections):
+    """
+    Belgedeki metin bölümlerini şemaya göre alan alan doğrula
+
+    Args:
+        document: extract_json ile çıkarılmış nesne
+        sections: *_SECTIONS şeması (alan -> (en az, en fazla karakter))
+
+    Returns:
+        (valid, errors) tuple - valid: {alan: temiz metin},
+        errors: {alan: hata mesajı} (eksik veya geçersiz alanlar)
+    """
+    if not isinstance(document, dict):
+        raise SchemaError('Belge nesne olmalı')
+
+    # Model anahtarları büyük/küçük harf farklı yazabilir
+    normalized = {str(key).strip().lower(): value for key, value in document.items()}
+
+    valid = {}
+    errors = {}
+    for field, (min_length, max_length) in sections.items():
+        value = normalized.get(field)
+        if value is None:
+            errors[field] = 'Belgede yok'
+            continue
+        try:
+            valid[field] = validate_text(value, field, min_length, max_length)
+        except SchemaError as e:
+            errors[field] = str(e)
+    return valid, errors
+
+
+def validate_daily_entry(entry):
+    """
+    Tek bir burcun günlük yorum kaydını doğrula
+
+    Returns:
+        dict: general, love, career, health, money ve mood_score alanları
+    """
+    if not isinstance(entry, dict):
+        raise SchemaError('Burç kaydı nesne olmalı')
+
+    cleaned = {
+        field: validate_text(entry.get(field), field, min_length, max_length)
+        for field, (min_length, max_length) in DAILY_SECTIONS.items()
+    }
+    cleaned['mood_score'] = validate_int(entry.get('mood_score'), 'mood_score', 1, 10)
+    return cleaned
+
+
+def validate_daily_batch(document, sign_keys):
+    """
+    Tüm burçları içeren günlük yorum belgesini doğrula
+
+    Beklenen yapı: {"signs": {"<burç anahtarı>": {...günlük kayıt...}}}
+
+    Returns:
+        (valid, errors) tuple - valid: {anahtar: temiz kayıt},
+        errors: {anahtar: hata mesajı} (eksik veya geçersiz burçlar)
+    """
+    if not isinstance(document, dict):
+        raise SchemaError('Belge nesne olmalı')
+
+    signs = document.get('signs', document)
+    if not isinstance(signs, dict):
+        raise SchemaError('"signs" nesne olmalı')
+
+    # Model anahtarları büyük/küçük harf farklı yazabilir
+    normalized = {str(key).strip().lower(): value for key, value in signs.items()}
+
+    valid = {}
+    errors = {}
+    for key in sign_keys:
+        entry = normalized.get(key.lower())
+        if entry is None:
+            errors[key] = 'Belgede yok'
+            continue
+        try:
+            valid[key] = validate_daily_entry(entry)
+        except SchemaError as e:
+            errors[key] = str(e)
+    return valid, errors
@@ -2,14 +2,73 @@
 Zodiac AI Service - Burç yorumları için AI entegrasyonu
 OpenRouter AI ile günlük, haftalık, aylık burç yorumları oluşturur
 """
+import json
 import logging
 import random
 from datetime import timedelta
 from django.utils import timezone
 from tarot.openrouter_service import OpenRouterService
+from .schemas import (
+    SchemaError, DAILY_ENTRY_EXAMPLE, DAILY_SECTIONS, WEEKLY_SECTIONS, MONTHLY_SECTIONS,
+    COMPATIBILITY_SECTIONS, BIRTH_CHART_SECTIONS, extract_json, validate_int,
+    validate_sections, validate_daily_batch
+)
 
 logger = logging.getLogger(__name__)
 
+# Dil talimatları (JSON çıktılı istekler)
+LANGUAGE_INSTRUCTIONS = {
+    'tr': 'Türkçe yanıt ver. ',
+    'en': 'Respond in English. ',
+    'de': 'Antworte auf Deutsch. ',
+    'fr': 'Répondez en français. '
+}
+
+# Ürün bazında JSON alanları: alan -> (eski metin başlığı, prompt açıklaması)
+# Başlık, model JSON yerine başlıklı metin döndürdüğünde yanıtı kurtarmak için kullanılır.
+DAILY_FIELDS = {
+    'general': ('GENEL', 'Günün genel enerjisi ve öneriler (2-3 cümle)'),
+    'love': ('AŞK', 'Aşk hayatı ve ilişkiler (2-3 cümle)'),
+    'career': ('KARİYER', 'İş hayatı ve fırsatlar (2-3 cümle)'),
+    'health': ('SAĞLIK', 'Fiziksel ve mental sağlık (2-3 cümle)'),
+    'money': ('FİNANS', 'Ekonomik durum ve harcamalar (2-3 cümle)'),
+}
+
+WEEKLY_FIELDS = {
+    'general': ('GENEL', 'Haftalık genel enerji ve öneriler (4-5 cümle)'),
+    'love': ('AŞK', 'Aşk hayatı ve ilişkiler (4-5 cümle)'),
+    'career': ('KARİYER', 'İş hayatı ve kariyer fırsatları (4-5 cümle)'),
+    'health': ('SAĞLIK', 'Fiziksel ve mental sağlık (3-4 cümle)'),
+    'money': ('FİNANS', 'Ekonomik durum ve yatırımlar (3-4 cümle)'),
+    'advice': ('ÖNEMLİ GÜNLER', 'Haftanın dikkat edilmesi gereken günleri (2-3 cümle)'),
+}
+
+MONTHLY_FIELDS = {
+    'general': ('GENEL', 'Aylık genel enerji ve trendler (5-6 cümle)'),
+    'love': ('AŞK', 'Aşk hayatı, flört ve ilişkiler (5-6 cümle)'),
+    'career': ('KARİYER', 'İş hayatı, projeler ve fırsatlar (5-6 cümle)'),
+    'health': ('SAĞLIK', 'Fiziksel ve mental sağlık durumu (4-5 cümle)'),
+    'money': ('FİNANS', 'Ekonomik durum, gelir ve giderler (4-5 cümle)'),
+    'opportunities': ('FIRSATLAR', 'Ay boyunca karşılaşılabilecek fırsatlar (3-4 cümle)'),
+    'challenges': ('ZORLUKLAR', 'Dikkat edilmesi gereken zorluklar ve öneriler (3-4 cümle)'),
+}
+
+COMPATIBILITY_FIELDS = {
+    'love_compatibility': ('AŞK UYUMU', 'Romantik ilişki potansiyeli (4-5 cümle)'),
+    'friendship_compatibility': ('ARKADAŞLIK UYUMU', 'Dostluk ve arkadaşlık (4-5 cümle)'),
+    'work_compatibility': ('İŞ UYUMU', 'İş birliği ve çalışma uyumu (4-5 cümle)'),
+    'challenges': ('ZORLUKLAR', 'Olası problemler ve dikkat edilmesi gerekenler (3-4 cümle)'),
+    'advice': ('TAVSİYELER', 'İlişkiyi güçlendirmek için öneriler (3-4 cümle)'),
+}
+
+BIRTH_CHART_FIELDS = {
+    'personality': ('KİŞİLİK ANALİZİ', 'Genel karakter ve kişilik (3-4 paragraf)'),
+    'emotional': ('DUYGUSAL ANALİZ', 'Ay burcuna göre duygusal yapı (2-3 paragraf)'),
+    'career': ('KARİYER ANALİZİ', 'Güneş ve Yükselen burca göre kariyer yönelimleri (2-3 paragraf)'),
+    'relationship': ('İLİŞKİ ANALİZİ', 'İlişki stili ve aşk hayatı (2-3 paragraf)'),
+    'life_path': ('YAŞAM YOLU', 'Yaşam yolu ve misyon (2-3 paragraf)'),
+}
+
 
 class ZodiacAIService:
     """
@@ -39,64 +98,34 @@ class ZodiacAIService:
         try:
             logger.info(f"🌟 Günlük yorum oluşturuluyor: {zodiac_sign.name} - {date} ({language}) - Model: {self.openrouter.model}")
             
-            # Dil talimatı
-            language_instructions = {
-                'tr': 'Türkçe yanıt ver. ',
-                'en': 'Respond in English. ',
-                'de': 'Antworte auf Deutsch. ',
-                'fr': 'Répondez en français. '
-            }
-            lang_instruction = language_instructions.get(language, language_instructions['tr'])
-            
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
             element_display = self._get_element_display(zodiac_sign.element)
             
-            system_prompt = f"""{lang_instruction}Sen uzman bir astrolog ve burç yorumcususun. Pozitif, motive edici ve yapıcı yorumlar yaparsın."""
+            system_prompt = f"""{lang_instruction}Sen uzman bir astrolog ve burç yorumcususun. Pozitif, motive edici ve yapıcı yorumlar yaparsın. Yanıtını yalnızca geçerli JSON olarak verirsin."""
             
-            prompt = f"""{zodiac_sign.name} burcu için {date} tarihli günlük burç yorumu yap.
+            brief = f"""{zodiac_sign.name} burcu için {date} tarihli günlük burç yorumu yap.
 
 Burç Özellikleri:
 - Element: {element_display}
 - Yöneten Gezegen: {zodiac_sign.ruling_planet}
 - Güçlü Yönler: {zodiac_sign.strengths[:100]}
-- Karakteristik: {zodiac_sign.traits[:100]}
-
-Aşağıdaki başlıklar altında yorumla:
-
-1. GENEL: Günün genel enerjisi ve öneriler (2-3 cümle)
-2. AŞK: Aşk hayatı ve ilişkiler (2-3 cümle)
-3. KARİYER: İş hayatı ve fırsatlar (2-3 cümle)
-4. SAĞLIK: Fiziksel ve mental sağlık (2-3 cümle)
-5. FİNANS: Ekonomik durum ve harcamalar (2-3 cümle)
+- Karakteristik: {zodiac_sign.traits[:100]}"""
 
-Her başlığı büyük harfle yaz ve altına yorumu ekle."""
-
-            response = self.openrouter.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=800,
-                temperature=0.7
+            valid, errors, document = self._request_structured(
+                brief, DAILY_FIELDS, DAILY_SECTIONS, system_prompt,
+                max_tokens=800, language=language,
+                extra_fields={'mood_score': 'Günün ruh hali puanı (1-10 arası tam sayı)'}
+            )
+            sections = self._merge_sections(
+                valid, errors, self._get_fallback_daily_horoscope(zodiac_sign), zodiac_sign.name
             )
             
-            logger.info(f"🤖 AI Yanıtı alındı ({len(response)} karakter)")
-            
-            sections = self._parse_horoscope_response(response)
-            logger.info(f"📊 Parse edilen sections: {list(sections.keys())}")
-            
-            # Şanslı sayı ve renk
-            lucky_numbers = self._parse_lucky_numbers(zodiac_sign.lucky_numbers)
-            lucky_colors = self._parse_lucky_colors(zodiac_sign.lucky_colors)
-            
-            result = {
-                'general': sections.get('GENEL', 'Bugün sizin için güzel bir gün olacak.'),
-                'love': sections.get('AŞK', 'Aşk hayatınızda huzur var.'),
-                'career': sections.get('KARİYER', 'İşleriniz yolunda gidiyor.'),
-                'health': sections.get('SAĞLIK', 'Sağlığınıza dikkat edin.'),
-                'money': sections.get('FİNANS', 'Finansal durumunuz dengeli.'),
-                'mood_score': random.randint(6, 10),
-                'lucky_number': random.choice(lucky_numbers) if lucky_numbers else random.randint(1, 99),
-                'lucky_color': random.choice(lucky_colors) if lucky_colors else 'Mavi',
-                'ai_provider': 'openrouter'
-            }
+            try:
+                sections['mood_score'] = validate_int(document.get('mood_score'), 'mood_score', 1, 10)
+            except SchemaError:
+                sections['mood_score'] = random.randint(6, 10)
+            
+            result = self._build_daily_result(zodiac_sign, sections)
             
             logger.info(f"✅ Günlük yorum oluşturuldu: {zodiac_sign.name} - Model: {self.openrouter.model}")
             return result
@@ -105,6 +134,131 @@ Her başlığı büyük harfle yaz ve altına yorumu ekle."""
             logger.error(f"❌ Günlük yorum hatası: {zodiac_sign.name} - {e}")
             return self._get_fallback_daily_horoscope(zodiac_sign)
     
+    def generate_daily_horoscopes_batch(self, zodiac_signs, date, language='tr', retries=1):
+        """
+        Birden fazla burcun günlük yorumunu tek bir JSON isteğiyle oluştur
+        
+        Model tüm burçlar ve bölümler için tek bir JSON belgesi döndürür; belge
+        şemaya göre doğrulanır. Eksik veya geçersiz burçlar için tek burçluk
+        JSON isteğiyle `retries` kez yeniden denenir, yine olmazsa metin tabanlı
+        generate_daily_horoscope kullanılır.
+        
+        İstek iletim veya hız sınırı nedeniyle başarısız olursa burç başına
+        tekrar denenmez (aynı hataya çarpar): toplu istekte hata yukarı iletilir,
+        tek burçluk denemelerde kalan burçlar fallback yorumla tamamlanır.
+        
+        Args:
+            zodiac_signs: ZodiacSign listesi
+            date: datetime.date object
+            language: Yorum dili ('tr', 'en', 'de', 'fr')
+            
+        Returns:
+            dict: {burç id: generate_daily_horoscope ile aynı formatta dictionary}
+        
+        Raises:
+            Exception: Toplu istek gönderilemediyse (model zinciri / hız sınırı)
+        """
+        signs_by_key = {sign.slug: sign for sign in zodiac_signs}
+        logger.info(f"🌟 Toplu günlük yorum oluşturuluyor: {len(signs_by_key)} burç - {date} ({language}) - Model: {self.openrouter.model}")
+        
+        try:
+            valid, errors = self._request_daily_json(list(signs_by_key.values()), date, language)
+        except Exception as e:
+            logger.error(f"❌ Toplu yorum isteği hatası, burç başına tekrar denenmiyor: {e}")
+            raise
+        
+        results = {}
+        for key, sections in valid.items():
+            results[signs_by_key[key].pk] = self._build_daily_result(signs_by_key[key], sections)
+        
+        # Doğrulamayı geçemeyen burçlar için tek tek tekrar dene
+        unavailable = False
+        for key, error in errors.items():
+            sign = signs_by_key[key]
+            logger.warning(f"⚠️ Toplu yanıtta geçersiz kayıt: {sign.name} - {error}")
+            
+            sections = None
+            for _ in range(retries if not unavailable else 0):
+                try:
+                    single_valid, _ = self._request_daily_json([sign], date, language)
+                except Exception as e:
+                    logger.error(f"❌ Tek burç isteği hatası, kalan burçlar fallback ile tamamlanıyor: {e}")
+                    unavailable = True
+                    break
+                sections = single_valid.get(key)
+                if sections:
+                    break
+            
+            if sections:
+                results[sign.pk] = self._build_daily_result(sign, sections)
+            elif unavailable:
+                results[sign.pk] = self._get_fallback_daily_horoscope(sign)
+            else:
+                results[sign.pk] = self.generate_daily_horoscope(sign, date, language)
+        
+        logger.info(f"✅ Toplu günlük yorum tamamlandı: {len(valid)}/{len(signs_by_key)} burç ilk istekte geçerli")
+        return results
+    
+    def _request_daily_json(self, zodiac_signs, date, language):
+        """
+        Verilen burçlar için günlük yorum JSON belgesi iste ve doğrula
+        
+        Returns:
+            (valid, errors) tuple - bkz. schemas.validate_daily_batch
+        
+        Raises:
+            Exception: İstek gönderilemediyse (iletim hatası, hız sınırı, tüm modeller başarısız)
+        """
+        lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
+        sign_keys = [sign.slug for sign in zodiac_signs]
+        
+        sign_lines = '\n'.join(
+            f"- {sign.slug}: {sign.name} (Element: {self._get_element_display(sign.element)}, "
+            f"Yöneten Gezegen: {sign.ruling_planet})"
+            for sign in zodiac_signs
+        )
+        example = json.dumps({'signs': {sign_keys[0]: DAILY_ENTRY_EXAMPLE}}, ensure_ascii=False)
+        
+        system_prompt = f"""{lang_instruction}Sen uzman bir astrolog ve burç yorumcususun. Pozitif, motive edici ve yapıcı yorumlar yaparsın. Yanıtını yalnızca geçerli JSON olarak verirsin."""
+        
+        prompt = f"""{date} tarihli günlük burç yorumlarını aşağıdaki burçlar için yap:
+
+{sign_lines}
+
+Her burç için general (günün genel enerjisi), love (aşk), career (kariyer), health (sağlık)
+ve money (finans) alanlarına 2-3 cümle yaz; mood_score alanına 1-10 arası bir tam sayı ver.
+
+Yanıtın sadece şu yapıda bir JSON nesnesi olsun, anahtar olarak yukarıdaki burç kodlarını kullan:
+{example}"""
+        
+        try:
+            response = self.openrouter.generate_response(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=500 * len(zodiac_signs) + 200,
+                temperature=0.7,
+                language=language,
+                json_mode=True,
+                # Eksik burcu olan belge cache'lenmez; tek burçluk tekrar yeni yanıt alır
+                validate=lambda text: not validate_daily_batch(extract_json(text), sign_keys)[1]
+            )
+            return validate_daily_batch(extract_json(response), sign_keys)
+        except SchemaError as e:
+            logger.error(f"❌ Toplu yorum JSON hatası: {e}")
+        return {}, {key: 'Geçersiz JSON' for key in sign_keys}
+    
+    def _build_daily_result(self, zodiac_sign, sections):
+        """Doğrulanmış JSON bölümlerinden DailyHoroscope alanlarını oluştur"""
+        lucky_numbers = self._parse_lucky_numbers(zodiac_sign.lucky_numbers)
+        lucky_colors = self._parse_lucky_colors(zodiac_sign.lucky_colors)
+        
+        return {
+            'ai_provider': 'openrouter',
+            **sections,
+            'lucky_number': random.choice(lucky_numbers) if lucky_numbers else random.randint(1, 99),
+            'lucky_color': random.choice(lucky_colors) if lucky_colors else 'Mavi',
+        }
+    
     def generate_weekly_horoscope(self, zodiac_sign, week_start, language='tr'):
         """
         Haftalık burç yorumu oluştur
@@ -121,20 +275,10 @@ Her başlığı büyük harfle yaz ve altına yorumu ekle."""
             week_end = week_start + timedelta(days=6)
             logger.info(f"📅 Haftalık yorum oluşturuluyor: {zodiac_sign.name} - {week_start} to {week_end} ({language})")
             
-            # Dil talimatı
-            language_instructions = {
-                'tr': 'Türkçe yanıt ver. ',
-                'en': 'Respond in English. ',
-                'de': 'Antworte auf Deutsch. ',
-                'fr': 'Répondez en français. '
-            }
-            lang_instruction = language_instructions.get(language, language_instructions['tr'])
-            
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
             element_display = self._get_element_display(zodiac_sign.element)
             
-            prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun.
-
-{zodiac_sign.name} burcu için {week_start.strftime('%d.%m.%Y')} - {week_end.strftime('%d.%m.%Y')} tarihleri arası haftalık burç yorumu yap.
+            brief = f"""{zodiac_sign.name} burcu için {week_start.strftime('%d.%m.%Y')} - {week_end.strftime('%d.%m.%Y')} tarihleri arası haftalık burç yorumu yap.
 
 Burç Özellikleri:
 - Element: {element_display}
@@ -142,39 +286,19 @@ Burç Özellikleri:
 - Güçlü Yönler: {zodiac_sign.strengths[:100]}
 - Zayıf Yönler: {zodiac_sign.weaknesses[:100]}
 
-Aşağıdaki başlıklar altında detaylı yorumla:
+Pozitif, motive edici ve detaylı ol."""
 
-1. GENEL: Haftalık genel enerji ve öneriler (4-5 cümle)
-2. AŞK: Aşk hayatı ve ilişkiler (4-5 cümle)
-3. KARİYER: İş hayatı ve kariyer fırsatları (4-5 cümle)
-4. SAĞLIK: Fiziksel ve mental sağlık (3-4 cümle)
-5. FİNANS: Ekonomik durum ve yatırımlar (3-4 cümle)
-6. ÖNEMLİ GÜNLER: Haftanın dikkat edilmesi gereken günleri (2-3 cümle)
+            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun. Detaylı, içgörü dolu ve motive edici haftalık burç yorumları yazıyorsun. Yanıtını yalnızca geçerli JSON olarak verirsin."""
 
-Her başlığı büyük harfle yaz ve altına yorumu ekle. Pozitif, motive edici ve detaylı ol."""
-
-            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun. Detaylı, içgörü dolu ve motive edici haftalık burç yorumları yazıyorsun."""
-
-            response = self.openrouter.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1000,
-                temperature=0.7
+            valid, errors, _ = self._request_structured(
+                brief, WEEKLY_FIELDS, WEEKLY_SECTIONS, system_prompt,
+                max_tokens=1000, language=language
+            )
+            result = self._merge_sections(
+                valid, errors, self._get_fallback_weekly_horoscope(zodiac_sign), zodiac_sign.name
             )
             
-            sections = self._parse_horoscope_response(response)
-            
-            result = {
-                'general': sections.get('GENEL', 'Bu hafta sizin için önemli gelişmeler olabilir.'),
-                'love': sections.get('AŞK', 'Aşk hayatınızda hareketli bir hafta.'),
-                'career': sections.get('KARİYER', 'Kariyerinizde olumlu adımlar atabilirsiniz.'),
-                'health': sections.get('SAĞLIK', 'Sağlığınıza özen gösterin.'),
-                'money': sections.get('FİNANS', 'Finansal konularda dengeli olun.'),
-                'advice': sections.get('ÖNEMLİ GÜNLER', 'Hafta ortası önemli olabilir.'),
-                'ai_provider': 'openrouter'
-            }
-            
-            logger.info(f"✅ Haftalık yorum oluşturuldu: {zodiac_sign.name} - Provider: openrouter")
+            logger.info(f"✅ Haftalık yorum oluşturuldu: {zodiac_sign.name} - Provider: {result['ai_provider']}")
             return result
             
         except Exception as e:
@@ -202,20 +326,10 @@ Her başlığı büyük harfle yaz ve altına yorumu ekle. Pozitif, motive edici
             
             logger.info(f"📆 Aylık yorum oluşturuluyor: {zodiac_sign.name} - {month_names[month]} {year} ({language})")
             
-            # Dil talimatı
-            language_instructions = {
-                'tr': 'Türkçe yanıt ver. ',
-                'en': 'Respond in English. ',
-                'de': 'Antworte auf Deutsch. ',
-                'fr': 'Répondez en français. '
-            }
-            lang_instruction = language_instructions.get(language, language_instructions['tr'])
-            
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
             element_display = self._get_element_display(zodiac_sign.element)
             
-            prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun.
-
-{zodiac_sign.name} burcu için {month_names[month]} {year} ayı burç yorumu yap.
+            brief = f"""{zodiac_sign.name} burcu için {month_names[month]} {year} ayı burç yorumu yap.
 
 Burç Özellikleri:
 - Element: {element_display}
@@ -223,42 +337,19 @@ Burç Özellikleri:
 - Karakteristik: {zodiac_sign.traits[:150]}
 - Güçlü Yönler: {zodiac_sign.strengths[:100]}
 
-Aşağıdaki başlıklar altında kapsamlı yorumla:
-
-1. GENEL: Aylık genel enerji ve trendler (5-6 cümle)
-2. AŞK: Aşk hayatı, flört ve ilişkiler (5-6 cümle)
-3. KARİYER: İş hayatı, projeler ve fırsatlar (5-6 cümle)
-4. SAĞLIK: Fiziksel ve mental sağlık durumu (4-5 cümle)
-5. FİNANS: Ekonomik durum, gelir ve giderler (4-5 cümle)
-6. FIRSATLAR: Ay boyunca karşılaşabileceğiniz fırsatlar (3-4 cümle)
-7. ZORLUKLAR: Dikkat edilmesi gereken zorluklar (3-4 cümle)
-8. TAVSİYELER: Ay boyunca yapılması gerekenler (3-4 cümle)
+Detaylı, içgörü dolu ve faydalı ol."""
 
-Her başlığı büyük harfle yaz. Detaylı, içgörü dolu ve faydalı ol."""
+            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun. Kapsamlı, içgörü dolu ve faydalı aylık burç yorumları yazıyorsun. Yanıtını yalnızca geçerli JSON olarak verirsin."""
 
-            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve burç yorumcususun. Kapsamlı, içgörü dolu ve faydalı aylık burç yorumları yazıyorsun."""
-
-            response = self.openrouter.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1200,
-                temperature=0.7
+            valid, errors, _ = self._request_structured(
+                brief, MONTHLY_FIELDS, MONTHLY_SECTIONS, system_prompt,
+                max_tokens=1200, language=language
+            )
+            result = self._merge_sections(
+                valid, errors, self._get_fallback_monthly_horoscope(zodiac_sign), zodiac_sign.name
             )
             
-            sections = self._parse_horoscope_response(response)
-            
-            result = {
-                'general': sections.get('GENEL', 'Bu ay sizin için bereketli olacak.'),
-                'love': sections.get('AŞK', 'Aşk hayatınızda yeni başlangıçlar.'),
-                'career': sections.get('KARİYER', 'Kariyerinizde önemli gelişmeler yaşanabilir.'),
-                'health': sections.get('SAĞLIK', 'Sağlığınıza dikkat edin.'),
-                'money': sections.get('FİNANS', 'Finansal durumunuz dengeli seyredecek.'),
-                'opportunities': sections.get('FIRSATLAR', 'Yeni fırsatlar kapınızı çalabilir.'),
-                'challenges': sections.get('ZORLUKLAR', 'Bazı zorluklarla karşılaşabilirsiniz.'),
-                'ai_provider': 'openrouter'
-            }
-            
-            logger.info(f"✅ Aylık yorum oluşturuldu: {zodiac_sign.name} - Provider: openrouter")
+            logger.info(f"✅ Aylık yorum oluşturuldu: {zodiac_sign.name} - Provider: {result['ai_provider']}")
             return result
             
         except Exception as e:
@@ -280,71 +371,199 @@ Her başlığı büyük harfle yaz. Detaylı, içgörü dolu ve faydalı ol."""
         try:
             logger.info(f"💕 Uyumluluk analizi: {sign1.name} & {sign2.name} ({language})")
             
-            # Dil talimatı
-            language_instructions = {
-                'tr': 'Türkçe yanıt ver. ',
-                'en': 'Respond in English. ',
-                'de': 'Antworte auf Deutsch. ',
-                'fr': 'Répondez en français. '
-            }
-            lang_instruction = language_instructions.get(language, language_instructions['tr'])
-            
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
             element1 = self._get_element_display(sign1.element)
             element2 = self._get_element_display(sign2.element)
             
-            prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve ilişki danışmanısın.
-
-{sign1.name} ve {sign2.name} burçları arasındaki uyumu analiz et.
+            brief = f"""{sign1.name} ve {sign2.name} burçları arasındaki uyumu analiz et.
 
 Burç Bilgileri:
 {sign1.name}: Element={element1}, Gezegen={sign1.ruling_planet}, Kalite={sign1.get_quality_display()}
 {sign2.name}: Element={element2}, Gezegen={sign2.ruling_planet}, Kalite={sign2.get_quality_display()}
 
-Aşağıdaki başlıklar altında analiz yap:
-
-1. AŞK UYUMU: Romantik ilişki potansiyeli (4-5 cümle)
-2. ARKADAŞLIK UYUMU: Dostluk ve arkadaşlık (4-5 cümle)
-3. İŞ UYUMU: İş birliği ve çalışma uyumu (4-5 cümle)
-4. ZORLUKLAR: Olası problemler ve dikkat edilmesi gerekenler (3-4 cümle)
-5. TAVSİYELER: İlişkiyi güçlendirmek için öneriler (3-4 cümle)
-
-Her başlığı büyük harfle yaz. Dürüst, yapıcı ve faydalı ol."""
+Dürüst, yapıcı ve faydalı ol."""
 
-            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve ilişki danışmanısın. Burç uyumları hakkında detaylı, yapıcı ve faydalı analizler yapıyorsun."""
+            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrolog ve ilişki danışmanısın. Burç uyumları hakkında detaylı, yapıcı ve faydalı analizler yapıyorsun. Yanıtını yalnızca geçerli JSON olarak verirsin."""
 
-            response = self.openrouter.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=1000,
-                temperature=0.7
+            valid, errors, _ = self._request_structured(
+                brief, COMPATIBILITY_FIELDS, COMPATIBILITY_SECTIONS, system_prompt,
+                max_tokens=1000, language=language
+            )
+            result = self._merge_sections(
+                valid, errors, self._get_fallback_compatibility(sign1, sign2), f"{sign1.name} & {sign2.name}"
             )
             
-            sections = self._parse_horoscope_response(response)
+            logger.info(f"✅ Uyumluluk analizi oluşturuldu: {sign1.name} & {sign2.name} - Provider: {result['ai_provider']}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Uyumluluk analizi hatası: {sign1.name} & {sign2.name} - {e}")
+            return self._get_fallback_compatibility(sign1, sign2)
+    
+    def generate_birth_chart_analysis(self, sun_sign, moon_sign, ascendant_sign, planets_info, language='tr'):
+        """
+        Doğum haritasının beş analiz bölümünü tek JSON isteğiyle oluştur
+        
+        Args:
+            sun_sign, moon_sign, ascendant_sign: ZodiacSign instance'ları
+            planets_info: AstronomyService.get_planet_info_for_ai çıktısı
+            language: Yorum dili ('tr', 'en', 'de', 'fr')
+            
+        Returns:
+            dict: personality, emotional, career, relationship, life_path ve ai_provider
+        """
+        label = f"doğum haritası ({sun_sign.name}/{moon_sign.name}/{ascendant_sign.name})"
+        try:
+            logger.info(f"🌌 Doğum haritası analizi oluşturuluyor: {label} ({language})")
             
-            # Uyum skoru hesapla (element uyumuna göre)
-            compatibility_score = self._calculate_compatibility_score(sign1, sign2)
+            lang_instruction = LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS['tr'])
             
-            result = {
-                'compatibility_score': compatibility_score,
-                'love_compatibility': sections.get('AŞK UYUMU', 'Aşk uyumunuz yüksek.'),
-                'friendship_compatibility': sections.get('ARKADAŞLIK UYUMU', 'İyi arkadaş olabilirsiniz.'),
-                'work_compatibility': sections.get('İŞ UYUMU', 'İş birliğiniz verimli olabilir.'),
-                'challenges': sections.get('ZORLUKLAR', 'Bazı zorluklarla karşılaşabilirsiniz.'),
-                'advice': sections.get('TAVSİYELER', 'İletişime önem verin.'),
-                'ai_provider': 'openrouter'
-            }
+            brief = f"""Kişi Bilgileri:
+- Güneş Burcu: {sun_sign.name}
+- Ay Burcu: {moon_sign.name}
+- Yükselen Burç: {ascendant_sign.name}
+
+{planets_info}
+
+Bu doğum haritasını analiz et. Güneş, Ay ve Yükselen burcun yanı sıra diğer gezegenlerin
+etkilerini de dikkate al. Paragrafları boş satırla (\\n\\n) ayır."""
+
+            system_prompt = f"""{lang_instruction}Sen profesyonel bir astrologsun. Kişiye özel, derinlikli doğum haritası analizleri yaparsın. Yanıtını yalnızca geçerli JSON olarak verirsin."""
+
+            valid, errors, _ = self._request_structured(
+                brief, BIRTH_CHART_FIELDS, BIRTH_CHART_SECTIONS, system_prompt,
+                max_tokens=3000, language=language
+            )
+            result = self._merge_sections(valid, errors, self._get_fallback_birth_chart(), label)
             
-            logger.info(f"✅ Uyumluluk analizi oluşturuldu: {sign1.name} & {sign2.name} - Provider: openrouter")
+            logger.info(f"✅ Doğum haritası analizi oluşturuldu: {label} - Provider: {result['ai_provider']}")
             return result
             
         except Exception as e:
-            logger.error(f"❌ Uyumluluk analizi hatası: {sign1.name} & {sign2.name} - {e}")
-            return self._get_fallback_compatibility(sign1, sign2)
+            logger.error(f"❌ Doğum haritası analizi hatası: {label} - {e}")
+            return self._get_fallback_birth_chart()
     
     # Helper Methods
     
+    def _structured_prompt(self, brief, fields, extra_fields=None):
+        """Bağlam + alan açıklamaları + beklenen JSON yapısı"""
+        descriptions = {field: description for field, (_, description) in fields.items()}
+        descriptions.update(extra_fields or {})
+        
+        field_lines = '\n'.join(f"- {field}: {description}" for field, description in descriptions.items())
+        example = json.dumps({field: '...' for field in descriptions}, ensure_ascii=False)
+        
+        return f"""{brief}
+
+Yorumu aşağıdaki alanlara yaz:
+{field_lines}
+
+Yanıtın sadece şu yapıda bir JSON nesnesi olsun:
+{example}"""
+    
+    def _request_structured(self, brief, fields, sections, system_prompt, max_tokens, language, extra_fields=None):
+        """
+        Bölümleri tek JSON isteğiyle üret ve alan alan doğrula
+        
+        Bozuk JSON önce yerel olarak onarılır (schemas.repair_json); model JSON yerine
+        başlıklı metin döndürdüyse başlıklardan kurtarılır. Yine eksik/geçersiz kalan
+        alanlar için yalnızca o alanları isteyen küçük bir onarım isteği atılır,
+        yorumun tamamı yeniden üretilmez.
+        
+        Args:
+            brief: Prompt'un bağlam kısmı
+            fields: {alan: (başlık, açıklama)} - bkz. DAILY_FIELDS
+            sections: schemas'taki bölüm şeması (alan -> (en az, en fazla karakter))
+            extra_fields: Şemada olmayan ek alanlar {alan: açıklama} (ör. mood_score)
+            
+        Returns:
+            (valid, errors, document) tuple - document ilk yanıtın ham nesnesidir
+        """
+        response = self.openrouter.generate_response(
+            prompt=self._structured_prompt(brief, fields, extra_fields),
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            language=language,
+            json_mode=True,
+            validate=lambda text: self._is_complete(text, sections)
+        )
+        valid, errors, document = self._parse_structured(response, fields, sections)
+        
+        # Hiç geçerli alan yoksa onarım tam yeniden üretim kadar pahalıdır; çağıran fallback kullanır
+        if valid and errors:
+            missing = {field: fields[field] for field in errors}
+            logger.info(f"🔧 Eksik alanlar yeniden isteniyor: {', '.join(missing)}")
+            try:
+                response = self.openrouter.generate_response(
+                    prompt=self._structured_prompt(brief, missing),
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens * len(missing) // len(fields) + 100,
+                    temperature=0.7,
+                    language=language,
+                    json_mode=True,
+                    validate=lambda text: self._is_complete(text, {field: sections[field] for field in missing})
+                )
+                repaired, errors, _ = self._parse_structured(
+                    response, missing, {field: sections[field] for field in missing}
+                )
+                valid.update(repaired)
+            except Exception as e:
+                logger.error(f"❌ Onarım isteği hatası: {e}")
+        
+        return valid, errors, document
+    
+    def _unwrap(self, document):
+        """{"weekly": {...}} gibi tek anahtarlı sarmalayıcıları aç"""
+        if isinstance(document, dict) and len(document) == 1:
+            (inner,) = document.values()
+            if isinstance(inner, dict):
+                return inner
+        return document
+    
+    def _is_complete(self, response, sections):
+        """Yanıt tüm bölümleri geçerli JSON olarak içeriyor mu (yalnızca böyle yanıtlar cache'lenir)"""
+        _, errors = validate_sections(self._unwrap(extract_json(response)), sections)
+        return not errors
+    
+    def _parse_structured(self, response, fields, sections):
+        """Yanıtı JSON olarak (olmazsa başlıklardan) ayrıştır ve doğrula"""
+        try:
+            document = extract_json(response)
+        except SchemaError as e:
+            logger.warning(f"⚠️ JSON ayrıştırılamadı ({e}), başlıklardan kurtarılıyor")
+            headed = self._parse_horoscope_response(response or '')
+            document = {
+                field: headed.get(heading) or headed.get(field.upper())
+                for field, (heading, _) in fields.items()
+            }
+        
+        document = self._unwrap(document)
+        
+        try:
+            valid, errors = validate_sections(document, sections)
+        except SchemaError as e:
+            valid, errors = {}, {field: str(e) for field in sections}
+        return valid, errors, document if isinstance(document, dict) else {}
+    
+    def _merge_sections(self, valid, errors, fallback, label):
+        """
+        Geçerli bölümleri yedek metinlerle birleştir (kısmi sonuç saklanır)
+        
+        Hiç geçerli bölüm yoksa SchemaError fırlatır; çağıran tam fallback'e düşer.
+        """
+        if not valid:
+            raise SchemaError(f"Geçerli bölüm yok: {', '.join(errors)}")
+        if errors:
+            logger.warning(f"⚠️ Kısmi yorum ({label}): {', '.join(errors)} yedek metinle dolduruldu")
+        return {
+            **fallback,
+            **valid,
+            'ai_provider': 'partial' if errors else 'openrouter'
+        }
+    
     def _parse_horoscope_response(self, response):
-        """AI yanıtını bölümlere ayır"""
+        """Başlıklı serbest metni bölümlere ayır (JSON dönmeyen yanıtları kurtarmak için)"""
         sections = {}
         lines = response.split('\n')
         current_section = None
@@ -473,3 +692,17 @@ Her başlığı büyük harfle yaz. Dürüst, yapıcı ve faydalı ol."""
             'advice': "İletişime önem verin. Birbirinizi anlamaya çalışın.",
             'ai_provider': 'fallback'
         }
+    
+    def _get_fallback_birth_chart(self):
+        """AI başarısız olursa fallback doğum haritası bölümleri"""
+        titles = {
+            'personality': "Kişilik Analizi",
+            'emotional': "Duygusal Analiz",
+            'career': "Kariyer Analizi",
+            'relationship': "İlişki Analizi",
+            'life_path': "Yaşam Yolu",
+        }
+        return {
+            **{field: f"{title} şu anda oluşturulamadı. Lütfen daha sonra tekrar deneyin." for field, title in titles.items()},
+            'ai_provider': 'fallback'
+        }
@@ -0,0 +1,157 @@
+"""
+Süreç içi güneş burcu tablosu
+Yılın her günü (artık yıl takvimiyle 1-366) için burç, ZodiacSign satırlarından
+süreç başına bir kez hesaplanır; tarih -> burç araması veritabanına gitmez.
+ZodiacSign kaydedildiğinde/silindiğinde paylaşılan cache'deki sürüm artırılır ve
+tüm worker'lar tabloyu bir sonraki erişimde yeniden kurar (bkz. tarot.deck).
+
+Toplu işler için classify_dates bir tarih listesini veya NumPy datetime64
+dizisini tek çağrıda sınıflandırır.
+"""
+import copy
+import threading
+import logging
+from datetime import date, timedelta
+
+from django.core.cache import cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yalnızca dizi girdileri için gerekli
+    np = None
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'zodiac:sign_table:version'
+
+# 29 Şubat dahil tüm günleri kapsayan referans (artık) yıl
+_REFERENCE_YEAR = 2000
+_DAYS = 366
+
+# Ay başlarının yıl içindeki sıfır tabanlı ofseti (artık yıl): _MONTH_OFFSETS[ay]
+_MONTH_OFFSETS = (0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+
+
+def day_of_year(month, day):
+    """(ay, gün) -> artık yıl takvimine göre 1-366; geçersiz tarihte ValueError"""
+    return date(_REFERENCE_YEAR, month, day).timetuple().tm_yday
+
+
+class SignTable:
+    """Gün -> burç eşlemesi (salt okunur)"""
+
+    __slots__ = ('days', 'signs', 'lookup', 'version')
+
+    def __init__(self, signs, version):
+        self.signs = {sign.pk: sign for sign in signs}
+        days = [None] * (_DAYS + 1)
+        for sign in signs:
+            try:
+                start = date(_REFERENCE_YEAR, sign.start_month, sign.start_day)
+                end = date(_REFERENCE_YEAR, sign.end_month, sign.end_day)
+            except ValueError:
+                logger.warning(f"⚠️ Geçersiz burç tarih aralığı: {sign.name}")
+                continue
+            # Yıl geçişi olan burçlar (örn: Aralık 22 - Ocak 19)
+            span = (end - start).days % _DAYS
+            for offset in range(span + 1):
+                days[(start + timedelta(days=offset)).timetuple().tm_yday] = sign.pk
+        self.days = tuple(days)
+        # NumPy ile toplu sınıflandırma için; boş günler 0
+        self.lookup = np.array([pk or 0 for pk in days], dtype=np.int64) if np is not None else None
+        self.version = version
+
+    def sign_id(self, month, day):
+        return self.days[day_of_year(month, day)]
+
+    def get(self, month, day):
+        """Burcun kopyası (çağıranlar tablodaki örneği değiştiremesin)"""
+        sign = self.signs.get(self.sign_id(month, day))
+        return copy.copy(sign) if sign is not None else None
+
+
+_table = None
+_lock = threading.Lock()
+
+
+def _current_version():
+    return cache.get(VERSION_KEY) or 0
+
+
+def _load(version):
+    from .models import ZodiacSign
+
+    table = SignTable(list(ZodiacSign.objects.all()), version)
+    missing = table.days[1:].count(None)
+    if missing:
+        logger.warning(f"⚠️ Burç tablosunda {missing} gün boş (ZodiacSign aralıklarını kontrol edin)")
+    logger.info(f"♈ Burç tablosu yüklendi: {len(table.signs)} burç (sürüm {version})")
+    return table
+
+
+def get_table():
+    """Süreç içi tabloyu getir; sürüm değiştiyse yeniden kur"""
+    global _table
+
+    version = _current_version()
+    table = _table
+    if table is not None and table.version == version:
+        return table
+
+    with _lock:
+        if _table is None or _table.version != version:
+            _table = _load(version)
+        return _table
+
+
+def sign_for(month, day):
+    """Doğum ayı/gününe göre ZodiacSign (geçersiz tarihte None)"""
+    try:
+        return get_table().get(month, day)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_dates(dates):
+    """
+    Birden fazla doğum tarihini tek çağrıda burç id'lerine çevir
+
+    Args:
+        dates: date/datetime listesi veya NumPy datetime64 dizisi
+
+    Returns:
+        Liste girdisinde burç id listesi (geçersiz/boş tarihte None);
+        NumPy girdisinde int64 dizi (bulunamayan günlerde 0).
+        Burç örnekleri için get_table().signs kullanılır.
+    """
+    table = get_table()
+
+    if np is not None and isinstance(dates, np.ndarray):
+        days = dates.astype('datetime64[D]')
+        result = np.zeros(days.shape, dtype=np.int64)
+        valid = ~np.isnat(days)
+        days = days[valid]
+        months = days.astype('datetime64[M]')
+        month_index = (months.astype(np.int64) % 12) + 1
+        day_index = (days - months).astype(np.int64) + 1
+        result[valid] = table.lookup[np.asarray(_MONTH_OFFSETS, dtype=np.int64)[month_index] + day_index]
+        return result
+
+    days = table.days
+    return [
+        days[_MONTH_OFFSETS[value.month] + value.day] if value is not None else None
+        for value in dates
+    ]
+
+
+def invalidate():
+    """Tabloyu tüm süreçlerde geçersiz kıl (ZodiacSign.save/delete çağırır)"""
+    global _table
+
+    if not cache.add(VERSION_KEY, 1, None):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+    with _lock:
+        _table = None
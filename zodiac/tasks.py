@@ -0,0 +1,152 @@
+"""
+Burç arka plan görevleri (run_jobs worker'ı tarafından yürütülür)
+"""
+import logging
+from datetime import date as date_cls, datetime
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from tarot.jobs import register
+from .models import ZodiacSign, BirthChart, UserDailyHoroscope
+from .services import ZodiacAIService
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@register('zodiac.daily_horoscope')
+def daily_horoscope(sign_id, date, language='tr'):
+    """Genel günlük burç yorumunu üret (ana sayfa ve günlük yorumlar sayfası)"""
+    from .views import generate_daily_horoscope
+
+    sign = ZodiacSign.objects.get(pk=sign_id)
+    horoscope = generate_daily_horoscope(sign, date_cls.fromisoformat(date), language)
+    return {'horoscope_id': horoscope.pk}
+
+
+@register('zodiac.weekly_horoscope')
+def weekly_horoscope(sign_id, week_start, language='tr'):
+    """Genel haftalık burç yorumunu üret (haftalık yorumlar sayfası)"""
+    from .views import generate_weekly_horoscope
+
+    sign = ZodiacSign.objects.get(pk=sign_id)
+    horoscope = generate_weekly_horoscope(sign, date_cls.fromisoformat(week_start), language)
+    if not horoscope:
+        # Hata fırlat ki iş backoff ile yeniden denensin
+        raise RuntimeError(f"Haftalık yorum oluşturulamadı: {sign.name} - {week_start}")
+    return {'horoscope_id': horoscope.pk}
+
+
+@register('zodiac.monthly_horoscope')
+def monthly_horoscope(sign_id, year, month, language='tr'):
+    """Genel aylık burç yorumunu üret (aylık yorumlar sayfası)"""
+    from .views import generate_monthly_horoscope
+
+    sign = ZodiacSign.objects.get(pk=sign_id)
+    horoscope = generate_monthly_horoscope(sign, year, month, language)
+    if not horoscope:
+        raise RuntimeError(f"Aylık yorum oluşturulamadı: {sign.name} - {year}-{month:02d}")
+    return {'horoscope_id': horoscope.pk}
+
+
+@register('zodiac.user_daily_horoscope')
+def user_daily_horoscope(user_id, sign_id, date):
+    """Kullanıcıya özel günlük burç yorumunu üret ve kaydet"""
+    user = User.objects.get(pk=user_id)
+    sign = ZodiacSign.objects.get(pk=sign_id)
+    day = date_cls.fromisoformat(date)
+
+    horoscope_data = ZodiacAIService().generate_daily_horoscope(sign, day)
+
+    # get_or_create kullan - race condition'ı önle
+    daily_horoscope, created = UserDailyHoroscope.objects.get_or_create(
+        user=user,
+        date=day,
+        defaults={
+            'zodiac_sign': sign,
+            **horoscope_data
+        }
+    )
+    if created:
+        logger.info(f"Günlük yorum oluşturuldu: {user.username} - {sign.name}")
+
+    return {
+        'horoscope_id': daily_horoscope.pk,
+        'redirect_url': reverse('zodiac:my_daily_horoscope'),
+    }
+
+
+@register('zodiac.compatibility')
+def compatibility(user_id, sign1_id, sign2_id):
+    """Burç uyumu analizini üret ve kaydet"""
+    from .views import generate_compatibility
+
+    user = User.objects.get(pk=user_id)
+    sign1 = ZodiacSign.objects.get(pk=sign1_id)
+    sign2 = ZodiacSign.objects.get(pk=sign2_id)
+
+    reading = generate_compatibility(user, sign1, sign2)
+    if not reading:
+        # Hata fırlat ki iş backoff ile yeniden denensin
+        raise RuntimeError(f"Uyum analizi oluşturulamadı: {sign1.name} - {sign2.name}")
+
+    return {
+        'compatibility_id': reading.pk,
+        'redirect_url': f"{reverse('zodiac:compatibility')}?reading={reading.pk}",
+    }
+
+
+@register('zodiac.birth_chart')
+def birth_chart(user_id, name, birth_datetime, birth_place):
+    """Doğum haritasını hesapla, beş analiz bölümünü üret ve kaydet"""
+    from .views_advanced import _calculate_birth_chart_positions
+
+    user = User.objects.get(pk=user_id)
+    date_obj = datetime.fromisoformat(birth_datetime)
+
+    positions, error = _calculate_birth_chart_positions(date_obj, birth_place)
+    if error:
+        raise ValueError(error)
+
+    # Beş bölüm tek JSON isteğinde üretilir; eksik bölümler ayrıca onarılır
+    analyses = ZodiacAIService().generate_birth_chart_analysis(
+        positions['sun_sign'], positions['moon_sign'],
+        positions['ascendant_sign'], positions['planets_info']
+    )
+
+    chart = BirthChart.objects.create(
+        user=user,
+        name=name,
+        birth_date=date_obj.date(),
+        birth_time=date_obj.time(),
+        birth_place=birth_place,
+        latitude=positions['latitude'],
+        longitude=positions['longitude'],
+        sun_sign=positions['sun_sign'],
+        moon_sign=positions['moon_sign'],
+        rising_sign=positions['ascendant_sign'],
+        personality_analysis=analyses['personality'],
+        emotional_analysis=analyses['emotional'],
+        career_analysis=analyses['career'],
+        relationship_analysis=analyses['relationship'],
+        life_path_analysis=analyses['life_path'],
+        # Harita motoru yoksa (efemeris yok) detay alanları boş kalır
+        **(positions['chart']._asdict() if positions['chart'] else {}),
+        ai_provider=analyses['ai_provider']
+    )
+
+    return {
+        'chart_id': chart.pk,
+        'redirect_url': f"{reverse('zodiac:birth_chart')}?chart={chart.pk}",
+    }
+
+
+@register('zodiac.geocode')
+def geocode(place_name):
+    """Gazetteer'da bulunamayan doğum yerini Nominatim ile çöz ve geocode tablosuna yaz"""
+    from .geocoding import geocode_remote
+
+    place = geocode_remote(place_name)
+    return {'found': place is not None}
@@ -1,3 +1,129 @@
-from django.test import TestCase
+import json
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase
+
+from . import chart, views
+from .schemas import SchemaError, extract_json, repair_json, validate_text
+from .services import ZodiacAIService
+
+
+class RepairJsonTests(SimpleTestCase):
+    """max_tokens ile kesilmiş model yanıtları"""
+
+    def assertRepairs(self, text, expected):
+        self.assertEqual(json.loads(repair_json(text)), expected)
+
+    def test_truncated_key_is_dropped(self):
+        self.assertRepairs('{"general": "Güzel bir gün", "lo', {'general': 'Güzel bir gün'})
+
+    def test_complete_key_without_value_is_dropped(self):
+        self.assertRepairs('{"general": "Güzel bir gün", "love"', {'general': 'Güzel bir gün'})
+        self.assertRepairs('{"general": "Güzel bir gün", "love" ', {'general': 'Güzel bir gün'})
+
+    def test_truncated_first_key(self):
+        self.assertRepairs('{"gen', {})
+
+    def test_truncated_key_in_nested_object(self):
+        self.assertRepairs('{"aries": {"general": "Güzel", "lo', {'aries': {'general': 'Güzel'}})
+
+    def test_truncated_key_after_escape(self):
+        self.assertRepairs('{"general": "Güzel", "lo\\', {'general': 'Güzel'})
+
+    def test_key_with_colon_gets_null(self):
+        self.assertRepairs('{"general": "Güzel", "love":', {'general': 'Güzel', 'love': None})
+
+    def test_truncated_value_is_closed(self):
+        self.assertRepairs('{"general": "Güzel", "love": "Sevgi', {'general': 'Güzel', 'love': 'Sevgi'})
+
+    def test_truncated_array_value_is_kept(self):
+        self.assertRepairs('{"signs": ["aries", "tau', {'signs': ['aries', 'tau']})
+
+    def test_trailing_comma(self):
+        self.assertRepairs('{"general": "Güzel",', {'general': 'Güzel'})
+
+    def test_unescaped_newline(self):
+        self.assertRepairs('{"general": "satır\nsonu", "lo', {'general': 'satır\nsonu'})
+
+
+class ExtractJsonTests(SimpleTestCase):
+    def test_fenced_json(self):
+        self.assertEqual(extract_json('```json\n{"general": "Güzel"}\n```'), {'general': 'Güzel'})
+
+    def test_truncated_response_is_repaired(self):
+        self.assertEqual(
+            extract_json('{"aries": {"general": "Güzel"}, "taurus": {"general": "Sakin", "lo'),
+            {'aries': {'general': 'Güzel'}, 'taurus': {'general': 'Sakin'}},
+        )
+
+    def test_no_object(self):
+        with self.assertRaises(SchemaError):
+            extract_json('Üzgünüm, yanıt veremiyorum.')
+
+
+class MonthlyHoroscopesWindowTests(SimpleTestCase):
+    """Aylık sayfa yalnızca bugünün çevresindeki ayları açar"""
+
+    def _get(self, **params):
+        return views.monthly_horoscopes(RequestFactory().get('/burclar/aylik/', params))
+
+    def test_far_month_is_not_found(self):
+        with self.assertRaises(Http404):
+            self._get(year=1999, month=1)
+
+    def test_invalid_month_is_not_found(self):
+        for params in ({'year': 2026, 'month': 13}, {'year': 'x', 'month': 1}):
+            with self.subTest(params=params), self.assertRaises(Http404):
+                self._get(**params)
+
+
+class AscendantTests(SimpleTestCase):
+    """Yükselen sayfası ile doğum haritası aynı ev hesabını kullanır"""
+
+    def test_matches_chart_houses(self):
+        for jd, latitude, longitude in [(2451545.3, 41.0, 29.0), (2460000.7, -33.9, 151.2), (2445000.1, 69.6, 18.9)]:
+            full_chart = chart.compute_chart(jd, latitude, longitude)
+            if full_chart is None:
+                self.skipTest("Efemeris yok")
+            with self.subTest(jd=jd, latitude=latitude):
+                self.assertEqual(chart.ascendant(jd, latitude, longitude), full_chart.house_positions['ascendant'])
+
+
+class ValidateTextTests(SimpleTestCase):
+    def test_long_text_is_cut_at_sentence_end(self):
+        self.assertEqual(validate_text('Bir cümle. İkinci uzun cümle', 'general', 5, 20), 'Bir cümle.')
+
+    def test_long_text_without_sentence_end_is_rejected(self):
+        with self.assertRaises(SchemaError):
+            validate_text('Nokta olmayan çok uzun bir metin', 'general', 5, 20)
+
+    def test_cut_shorter_than_minimum_is_rejected(self):
+        with self.assertRaises(SchemaError):
+            validate_text('Kısa. Sonra gelen çok uzun cümle', 'general', 10, 20)
+
+
+class DailyBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.signs = [mock.Mock(pk=number, slug=f'sign{number}') for number in range(3)]
+        with mock.patch('zodiac.services.OpenRouterService'):
+            self.service = ZodiacAIService()
+        self.service.generate_daily_horoscope = mock.Mock()
+
+    def test_transport_failure_is_not_retried_per_sign(self):
+        with mock.patch.object(self.service, '_request_daily_json', side_effect=Exception('Tüm modeller başarısız')) as request:
+            with self.assertRaises(Exception):
+                self.service.generate_daily_horoscopes_batch(self.signs, date(2026, 1, 1))
+        self.assertEqual(request.call_count, 1)
+        self.service.generate_daily_horoscope.assert_not_called()
+
+    def test_single_sign_transport_failure_stops_remaining_retries(self):
+        invalid = {sign.slug: 'Geçersiz JSON' for sign in self.signs}
+        with mock.patch.object(
+            self.service, '_request_daily_json', side_effect=[({}, invalid), Exception('hız sınırı aşıldı')]
+        ) as request:
+            results = self.service.generate_daily_horoscopes_batch(self.signs, date(2026, 1, 1))
+        self.assertEqual(request.call_count, 2)
+        self.service.generate_daily_horoscope.assert_not_called()
+        self.assertEqual({result['ai_provider'] for result in results.values()}, {'fallback'})
@@ -1,6 +1,6 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
@@ -10,9 +10,12 @@ import logging
 
 from .models import (
     ZodiacSign, DailyHoroscope, WeeklyHoroscope,
-    MonthlyHoroscope, CompatibilityReading, BirthChart
+    MonthlyHoroscope, CompatibilityReading, BirthChart, horoscope_language
 )
 from tarot.services import AIService, ImageGenerationService
+from tarot.async_utils import async_login_required, arender
+from tarot.singleflight import single_flight
+from tarot import jobs
 from .services import ZodiacAIService
 
 logger = logging.getLogger(__name__)
@@ -52,10 +55,8 @@ def zodiac_signs_list(request):
 
 def zodiac_sign_detail(request, sign_slug):
     """Burç detayı"""
-    from django.utils.translation import get_language
-    
     zodiac_sign = get_object_or_404(ZodiacSign, slug=sign_slug)
-    current_language = get_language()
+    current_language = horoscope_language()
     
     # Jeton kontrolü
     if request.user.is_authenticated:
@@ -81,11 +82,12 @@ def zodiac_sign_detail(request, sign_slug):
     today = timezone.now().date()
     daily_horoscope = DailyHoroscope.objects.filter(
         zodiac_sign=zodiac_sign,
-        date=today
+        date=today,
+        language=current_language
     ).first()
     
-    # Yoksa oluştur (dil-aware)
-    if not daily_horoscope or (daily_horoscope and current_language != 'tr'):
+    # Yoksa oluştur - sonraki ziyaretler bu dilde DB'den okunur
+    if not daily_horoscope:
         daily_horoscope = generate_daily_horoscope(zodiac_sign, today, current_language)
     
     # AI ile burç görseli oluştur (isteğe bağlı)
@@ -134,21 +136,22 @@ def zodiac_sign_detail(request, sign_slug):
 
 def daily_horoscopes(request):
     """Tüm burçların günlük yorumları"""
-    from django.utils.translation import get_language
-    
     today = timezone.now().date()
-    current_language = get_language()
+    current_language = horoscope_language()
     zodiac_signs = ZodiacSign.objects.all().order_by('order')
     
+    # Bugünün bu dildeki tüm yorumları tek sorguda
+    existing = {
+        h.zodiac_sign_id: h
+        for h in DailyHoroscope.objects.filter(date=today, language=current_language)
+    }
+    
     horoscopes = []
     for sign in zodiac_signs:
-        horoscope = DailyHoroscope.objects.filter(
-            zodiac_sign=sign,
-            date=today
-        ).first()
+        horoscope = existing.get(sign.id)
         
-        # Yoksa oluştur (dil-aware)
-        if not horoscope or (horoscope and current_language != 'tr'):
+        # Yoksa oluştur
+        if not horoscope:
             horoscope = generate_daily_horoscope(sign, today, current_language)
         
         horoscopes.append({
@@ -194,8 +197,8 @@ def technology(request):
     return render(request, 'zodiac/technology.html', context)
 
 
-@login_required
-def ai_zodiac_assistant(request):
+@async_login_required
+async def ai_zodiac_assistant(request):
     """AI Burç Asistanı - Kullanıcı soruları"""
     zodiac_signs = ZodiacSign.objects.all().order_by('order')
     response_text = None
@@ -209,7 +212,7 @@ def ai_zodiac_assistant(request):
             try:
                 user_sign = None
                 if user_sign_id:
-                    user_sign = get_object_or_404(ZodiacSign, id=user_sign_id)
+                    user_sign = await aget_object_or_404(ZodiacSign, id=user_sign_id)
                 
                 ai_service = AIService()
                 
@@ -234,10 +237,11 @@ Kullanıcının Sorusu: {question}
 
 Lütfen soruya detaylı, anlayışlı ve faydalı bir şekilde cevap ver. Astroloji bilgin ile kullanıcıya yol göster."""
 
-                response_text = ai_service.generate_interpretation(
+                response_text = await ai_service.agenerate_interpretation(
                     question=prompt,
                     cards=[],
-                    spread_name="Burç Danışmanlığı"
+                    spread_name="Burç Danışmanlığı",
+                    user_id=request.user.pk
                 )
                 
             except Exception as e:
@@ -251,14 +255,15 @@ Lütfen soruya detaylı, anlayışlı ve faydalı bir şekilde cevap ver. Astrol
         'response_text': response_text,
         'error': error,
     }
-    return render(request, 'zodiac/ai_assistant.html', context)
+    return await arender(request, 'zodiac/ai_assistant.html', context)
 
 
 @login_required
 def compatibility_check(request):
-    """Burç uyumu kontrolü"""
+    """Burç uyumu kontrolü - yeni analiz arka plan işi olarak üretilir"""
     zodiac_signs = ZodiacSign.objects.all().order_by('order')
     compatibility = None
+    pending_job = None
     error = None
     
     if request.method == 'POST':
@@ -282,46 +287,73 @@ def compatibility_check(request):
                         Q(sign1=sign2, sign2=sign1)
                     ).first()
                     
-                    # Yoksa oluştur
+                    # Yoksa kuyruğa al
                     if not compatibility:
-                        compatibility = generate_compatibility(request.user, sign1, sign2)
-                        
-                        if not compatibility:
-                            error = "Uyum analizi oluşturulurken bir hata oluştu. Lütfen tekrar deneyin."
+                        pair = sorted([sign1.pk, sign2.pk])
+                        pending_job = jobs.enqueue(
+                            'zodiac.compatibility',
+                            payload={
+                                'user_id': request.user.pk,
+                                'sign1_id': sign1.pk,
+                                'sign2_id': sign2.pk,
+                            },
+                            key=f"compatibility:{request.user.pk}:{pair[0]}:{pair[1]}",
+                            user=request.user
+                        )
                             
             except Exception as e:
                 error = f"Bir hata oluştu: {str(e)}"
         else:
             error = "Lütfen iki burç seçin."
     
+    elif request.GET.get('reading', '').isdigit():
+        compatibility = CompatibilityReading.objects.filter(
+            user=request.user,
+            pk=request.GET['reading']
+        ).first()
+    
     context = {
         'title': 'Burç Uyumu',
         'zodiac_signs': zodiac_signs,
         'compatibility': compatibility,
+        'pending_job': pending_job,
         'error': error,
     }
     return render(request, 'zodiac/compatibility.html', context)
 
 
 def weekly_horoscopes(request):
-    """Tüm burçların haftalık yorumları"""
+    """
+    Tüm burçların haftalık yorumları
+
+    Eksik yorumlar istek içinde üretilmez, arka plan işi olarak kuyruğa alınır;
+    sayfa hazır olanları gösterir.
+    """
     today = timezone.now().date()
     # Haftanın başlangıcını bul (Pazartesi)
     week_start = today - timedelta(days=today.weekday())
     week_end = week_start + timedelta(days=6)
     
+    current_language = horoscope_language()
     zodiac_signs = ZodiacSign.objects.all().order_by('order')
     
+    existing = {
+        h.zodiac_sign_id: h
+        for h in WeeklyHoroscope.objects.filter(week_start=week_start, language=current_language)
+    }
+    
     horoscopes = []
     for sign in zodiac_signs:
-        horoscope = WeeklyHoroscope.objects.filter(
-            zodiac_sign=sign,
-            week_start=week_start
-        ).first()
+        horoscope = existing.get(sign.id)
         
-        # Yoksa oluştur
+        # Yoksa kuyruğa al
         if not horoscope:
-            horoscope = generate_weekly_horoscope(sign, week_start)
+            jobs.enqueue(
+                'zodiac.weekly_horoscope',
+                payload={'sign_id': sign.pk, 'week_start': week_start.isoformat(), 'language': current_language},
+                key=f"weekly_horoscope:{sign.pk}:{week_start.isoformat()}:{current_language}",
+                throttle=300
+            )
         
         horoscopes.append({
             'sign': sign,
@@ -337,13 +369,31 @@ def weekly_horoscopes(request):
     return render(request, 'zodiac/weekly_horoscopes.html', context)
 
 
+# Aylık sayfada bugünün ayından en fazla bu kadar ay geri/ileri gidilebilir
+MONTHLY_WINDOW = 1
+
+
+def _month_offset(year, month, today):
+    return (year - today.year) * 12 + (month - today.month)
+
+
 def monthly_horoscopes(request):
-    """Tüm burçların aylık yorumları"""
+    """
+    Tüm burçların aylık yorumları
+
+    Yalnızca bugünün ayı ve MONTHLY_WINDOW kadar komşu ay açılabilir; eksik
+    yorumlar arka plan işi olarak kuyruğa alınır.
+    """
     today = timezone.now().date()
     
     # URL'den ay ve yıl parametresi al, yoksa bu ay
-    year = int(request.GET.get('year', today.year))
-    month = int(request.GET.get('month', today.month))
+    try:
+        year = int(request.GET.get('year', today.year))
+        month = int(request.GET.get('month', today.month))
+    except ValueError:
+        raise Http404("Geçersiz tarih")
+    if not 1 <= month <= 12 or abs(_month_offset(year, month, today)) > MONTHLY_WINDOW:
+        raise Http404("Bu ay için yorum bulunmuyor")
     
     # Ay isimleri
     month_names = [
@@ -351,30 +401,39 @@ def monthly_horoscopes(request):
         'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'
     ]
     
+    current_language = horoscope_language()
     zodiac_signs = ZodiacSign.objects.all().order_by('order')
     
+    existing = {
+        h.zodiac_sign_id: h
+        for h in MonthlyHoroscope.objects.filter(year=year, month=month, language=current_language)
+    }
+    
     horoscopes = []
     for sign in zodiac_signs:
-        horoscope = MonthlyHoroscope.objects.filter(
-            zodiac_sign=sign,
-            year=year,
-            month=month
-        ).first()
+        horoscope = existing.get(sign.id)
         
-        # Yoksa oluştur
+        # Yoksa kuyruğa al
         if not horoscope:
-            horoscope = generate_monthly_horoscope(sign, year, month)
+            jobs.enqueue(
+                'zodiac.monthly_horoscope',
+                payload={'sign_id': sign.pk, 'year': year, 'month': month, 'language': current_language},
+                key=f"monthly_horoscope:{sign.pk}:{year}-{month:02d}:{current_language}",
+                throttle=300
+            )
         
         horoscopes.append({
             'sign': sign,
             'horoscope': horoscope
         })
     
-    # Önceki ve sonraki ay hesapla
+    # Önceki ve sonraki ay hesapla (pencere dışındaysa bağlantı gösterilmez)
     prev_month = month - 1 if month > 1 else 12
     prev_year = year if month > 1 else year - 1
     next_month = month + 1 if month < 12 else 1
     next_year = year if month < 12 else year + 1
+    has_prev = _month_offset(prev_year, prev_month, today) >= -MONTHLY_WINDOW
+    has_next = _month_offset(next_year, next_month, today) <= MONTHLY_WINDOW
     
     context = {
         'title': f'{month_names[month]} {year} Burç Yorumları',
@@ -386,6 +445,8 @@ def monthly_horoscopes(request):
         'prev_month': prev_month,
         'next_year': next_year,
         'next_month': next_month,
+        'has_prev': has_prev,
+        'has_next': has_next,
     }
     return render(request, 'zodiac/monthly_horoscopes.html', context)
 
@@ -395,28 +456,46 @@ def monthly_horoscopes(request):
 def generate_daily_horoscope(zodiac_sign, date, language='tr'):
     """
     AI ile günlük burç yorumu oluştur - ZodiacAIService kullanır
+    
+    Aynı burç/tarih/dil için eşzamanlı gelen istekler single-flight ile
+    birleştirilir: bir worker üretirken diğerleri onun sonucunu bekler.
     """
+    return single_flight(
+        daily_horoscope_flight_key(zodiac_sign, date, language),
+        lambda: _generate_daily_horoscope(zodiac_sign, date, language),
+        result_timeout=300
+    )
+
+
+def daily_horoscope_flight_key(zodiac_sign, date, language='tr'):
+    """generate_daily_horoscope'un single-flight sonuç anahtarı"""
+    return f"daily_horoscope:{zodiac_sign.pk}:{date.isoformat()}:{language}"
+
+
+def _generate_daily_horoscope(zodiac_sign, date, language='tr'):
+    """Günlük burç yorumunu üret ve kaydet (single-flight lideri çalıştırır)"""
     try:
         # Önce database'de var mı kontrol et (cache gibi çalışır)
-        # NOT: Cache language-aware olmalı
         existing = DailyHoroscope.objects.filter(
             zodiac_sign=zodiac_sign,
-            date=date
+            date=date,
+            language=language
         ).first()
         
-        if existing and language == 'tr':  # Sadece Türkçe için cache kullan
-            logger.info(f"📦 Cache'den alındı: {zodiac_sign.name} - {date}")
+        if existing:
+            logger.info(f"📦 Cache'den alındı: {zodiac_sign.name} - {date} ({language})")
             return existing
         
         # Yeni yorum oluştur
         ai_service = ZodiacAIService()
         result = ai_service.generate_daily_horoscope(zodiac_sign, date, language)
         
-        # Database'e kaydet
-        horoscope = DailyHoroscope.objects.create(
+        # Database'e kaydet (yarış durumunda mevcut satır kullanılır)
+        horoscope, _ = DailyHoroscope.objects.get_or_create(
             zodiac_sign=zodiac_sign,
             date=date,
-            **result
+            language=language,
+            defaults=result
         )
         
         return horoscope
@@ -424,19 +503,56 @@ def generate_daily_horoscope(zodiac_sign, date, language='tr'):
     except Exception as e:
         logger.error(f"❌ Horoscope generation error for {zodiac_sign.name}: {e}")
         # Fallback
-        return DailyHoroscope.objects.create(
+        horoscope, _ = DailyHoroscope.objects.get_or_create(
             zodiac_sign=zodiac_sign,
             date=date,
-            general=f"Bugün {zodiac_sign.name} burcu için enerjik bir gün olacak.",
-            love="Aşk hayatınızda olumlu gelişmeler sizi bekliyor.",
-            career="Kariyerinizde yeni fırsatlar doğabilir.",
-            health="Sağlığınıza özen gösterin.",
-            money="Finansal konularda dikkatli olun.",
-            mood_score=7,
-            lucky_number=random.randint(1, 99),
-            lucky_color='Mavi',
-            ai_provider='fallback'
+            language=language,
+            defaults={
+                'general': f"Bugün {zodiac_sign.name} burcu için enerjik bir gün olacak.",
+                'love': "Aşk hayatınızda olumlu gelişmeler sizi bekliyor.",
+                'career': "Kariyerinizde yeni fırsatlar doğabilir.",
+                'health': "Sağlığınıza özen gösterin.",
+                'money': "Finansal konularda dikkatli olun.",
+                'mood_score': 7,
+                'lucky_number': random.randint(1, 99),
+                'lucky_color': 'Mavi',
+                'ai_provider': 'fallback'
+            }
         )
+        return horoscope
+
+
+def generate_daily_horoscopes_bulk(zodiac_signs, date, language='tr'):
+    """
+    Eksik burçların günlük yorumlarını tek JSON isteği ve tek bulk_create ile üret
+    
+    Returns:
+        list: Verilen burç sırasıyla DailyHoroscope kayıtları
+    """
+    existing = {
+        h.zodiac_sign_id: h
+        for h in DailyHoroscope.objects.filter(zodiac_sign__in=zodiac_signs, date=date, language=language)
+    }
+    missing = [sign for sign in zodiac_signs if sign.id not in existing]
+    
+    if missing:
+        results = ZodiacAIService().generate_daily_horoscopes_batch(missing, date, language)
+        
+        # Yarış durumunda başka süreçte oluşmuş satırlar atlanır
+        DailyHoroscope.objects.bulk_create(
+            [
+                DailyHoroscope(zodiac_sign=sign, date=date, language=language, **results[sign.pk])
+                for sign in missing
+            ],
+            ignore_conflicts=True
+        )
+        existing.update({
+            h.zodiac_sign_id: h
+            for h in DailyHoroscope.objects.filter(zodiac_sign__in=missing, date=date, language=language)
+        })
+        logger.info(f"💾 {len(missing)} günlük yorum toplu kaydedildi: {date} ({language})")
+    
+    return [existing[sign.id] for sign in zodiac_signs if sign.id in existing]
 
 
 def generate_weekly_horoscope_old(zodiac_sign, week_start):
@@ -445,204 +561,97 @@ def generate_weekly_horoscope_old(zodiac_sign, week_start):
 
 
 def generate_compatibility(user, sign1, sign2):
-    """AI ile burç uyumu analizi oluştur"""
+    """AI ile burç uyumu analizi oluştur ve kaydet (tamamen başarısızsa None)"""
     try:
-        ai_service = AIService()
-        
-        prompt = f"""Sen profesyonel bir astrolog ve ilişki danışmanısın.
-
-{sign1.name} ve {sign2.name} burçları arasındaki uyumu analiz et.
-
-Burç Bilgileri:
-{sign1.name}: Element={sign1.get_element_display()}, Gezegen={sign1.ruling_planet}
-{sign2.name}: Element={sign2.get_element_display()}, Gezegen={sign2.ruling_planet}
-
-Aşağıdaki başlıklar altında analiz yap:
-
-1. AŞK UYUMU: Romantik ilişki potansiyeli (3-4 cümle)
-2. ARKADAŞLIK UYUMU: Dostluk ve arkadaşlık (3-4 cümle)
-3. İŞ UYUMU: İş birliği ve çalışma uyumu (3-4 cümle)
-4. ZORLUKLAR: Olası problemler ve dikkat edilmesi gerekenler (2-3 cümle)
-5. TAVSİYELER: İlişkiyi güçlendirmek için öneriler (2-3 cümle)
-
-Her başlığı büyük harfle yaz. Dürüst, yapıcı ve faydalı ol."""
-
-        response = ai_service.generate_interpretation(
-            question=prompt,
-            cards=[],
-            spread_name="Burç Uyumu"
-        )
-        
-        sections = parse_horoscope_response(response)
-        
-        # Uyum skoru hesapla (basit)
-        element_compatibility = {
-            ('fire', 'fire'): 85, ('fire', 'air'): 90, ('fire', 'water'): 50, ('fire', 'earth'): 60,
-            ('earth', 'earth'): 85, ('earth', 'water'): 90, ('earth', 'air'): 50, ('earth', 'fire'): 60,
-            ('air', 'air'): 85, ('air', 'fire'): 90, ('air', 'earth'): 50, ('air', 'water'): 60,
-            ('water', 'water'): 85, ('water', 'earth'): 90, ('water', 'fire'): 50, ('water', 'air'): 60,
-        }
+        result = ZodiacAIService().generate_compatibility_analysis(sign1, sign2)
+        if result['ai_provider'] == 'fallback':
+            return None
         
-        score = element_compatibility.get((sign1.element, sign2.element), 70)
-        
-        compatibility = CompatibilityReading.objects.create(
-            user=user,
-            sign1=sign1,
-            sign2=sign2,
-            compatibility_score=score,
-            love_compatibility=sections.get('AŞK UYUMU', 'Aşk uyumunuz yüksek.'),
-            friendship_compatibility=sections.get('ARKADAŞLIK UYUMU', 'İyi arkadaş olabilirsiniz.'),
-            work_compatibility=sections.get('İŞ UYUMU', 'İş birliğiniz verimli olabilir.'),
-            challenges=sections.get('ZORLUKLAR', 'Bazı zorluklarla karşılaşabilirsiniz.'),
-            advice=sections.get('TAVSİYELER', 'İletişime önem verin.'),
-            ai_provider='gemini'
-        )
-        
-        return compatibility
+        return CompatibilityReading.objects.create(user=user, sign1=sign1, sign2=sign2, **result)
         
     except Exception as e:
-        print(f"Compatibility generation error: {e}")
+        logger.error(f"❌ Compatibility generation error: {e}")
         return None
 
 
-def parse_horoscope_response(response):
-    """AI yanıtını bölümlere ayır"""
-    sections = {}
-    lines = response.split('\n')
-    current_section = None
-    current_content = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Başlık kontrolü (büyük harfle başlıyorsa)
-        if line.isupper() or (line and line[0].isupper() and ':' in line):
-            # Önceki bölümü kaydet
-            if current_section and current_content:
-                sections[current_section] = ' '.join(current_content).strip()
-            
-            # Yeni bölüm başlat
-            current_section = line.replace(':', '').strip().upper()
-            current_content = []
-        elif current_section:
-            current_content.append(line)
-    
-    # Son bölümü kaydet
-    if current_section and current_content:
-        sections[current_section] = ' '.join(current_content).strip()
+def generate_weekly_horoscope(zodiac_sign, week_start, language='tr'):
+    """
+    AI ile haftalık burç yorumu oluştur ve (burç, hafta, dil) için kaydet
     
-    return sections
+    Eşzamanlı istekler single-flight ile tek üretimde birleştirilir.
+    """
+    return single_flight(
+        f"weekly_horoscope:{zodiac_sign.pk}:{week_start.isoformat()}:{language}",
+        lambda: _generate_weekly_horoscope(zodiac_sign, week_start, language),
+        result_timeout=300
+    )
 
 
-def generate_weekly_horoscope(zodiac_sign, week_start):
-    """AI ile haftalık burç yorumu oluştur"""
+def _generate_weekly_horoscope(zodiac_sign, week_start, language='tr'):
     try:
-        ai_service = AIService()
-        week_end = week_start + timedelta(days=6)
-        
-        prompt = f"""Sen profesyonel bir astrolog ve burç yorumcususun.
-
-{zodiac_sign.name} burcu için {week_start} - {week_end} tarihleri arası haftalık burç yorumu yap.
-
-Burç Özellikleri:
-- Element: {zodiac_sign.element}
-- Yöneten Gezegen: {zodiac_sign.ruling_planet}
-- Güçlü Yönler: {zodiac_sign.strengths[:100]}
-
-Aşağıdaki başlıklar altında detaylı yorumla:
-
-1. GENEL: Haftalık genel enerji ve öneriler (4-5 cümle)
-2. AŞK: Aşk hayatı ve ilişkiler (4-5 cümle)
-3. KARİYER: İş hayatı ve kariyer fırsatları (4-5 cümle)
-4. SAĞLIK: Fiziksel ve mental sağlık (3-4 cümle)
-5. FİNANS: Ekonomik durum ve yatırımlar (3-4 cümle)
-6. ÖNEMLİ GÜNLER: Haftanın dikkat edilmesi gereken günleri (2-3 cümle)
-
-Her başlığı büyük harfle yaz ve altına yorumu ekle. Pozitif, motive edici ve detaylı ol."""
-
-        response = ai_service.generate_interpretation(
-            question=prompt,
-            cards=[],
-            spread_name="Haftalık Burç"
-        )
+        existing = WeeklyHoroscope.objects.filter(
+            zodiac_sign=zodiac_sign,
+            week_start=week_start,
+            language=language
+        ).first()
+        if existing:
+            return existing
         
-        sections = parse_horoscope_response(response)
+        result = ZodiacAIService().generate_weekly_horoscope(zodiac_sign, week_start, language)
         
-        horoscope = WeeklyHoroscope.objects.create(
+        horoscope, _ = WeeklyHoroscope.objects.get_or_create(
             zodiac_sign=zodiac_sign,
             week_start=week_start,
-            general=sections.get('GENEL', 'Bu hafta sizin için önemli gelişmeler olabilir.'),
-            love=sections.get('AŞK', 'Aşk hayatınızda hareketli bir hafta.'),
-            career=sections.get('KARİYER', 'Kariyerinizde olumlu adımlar atabilirsiniz.'),
-            health=sections.get('SAĞLIK', 'Sağlığınıza özen gösterin.'),
-            money=sections.get('FİNANS', 'Finansal konularda dengeli olun.'),
-            important_days=sections.get('ÖNEMLİ GÜNLER', 'Hafta ortası önemli.'),
-            ai_provider='gemini'
+            language=language,
+            defaults={
+                'week_end': week_start + timedelta(days=6),
+                **result
+            }
         )
         
         return horoscope
         
     except Exception as e:
-        print(f"Weekly horoscope generation error: {e}")
+        logger.error(f"❌ Weekly horoscope generation error for {zodiac_sign.name}: {e}")
         return None
 
 
-def generate_monthly_horoscope(zodiac_sign, year, month):
-    """AI ile aylık burç yorumu oluştur"""
-    try:
-        ai_service = AIService()
-        month_names = [
-            '', 'Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
-            'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'
-        ]
-        
-        prompt = f"""Sen profesyonel bir astrolog ve burç yorumcususun.
+def generate_monthly_horoscope(zodiac_sign, year, month, language='tr'):
+    """
+    AI ile aylık burç yorumu oluştur ve (burç, ay, dil) için kaydet
+    
+    Eşzamanlı istekler single-flight ile tek üretimde birleştirilir.
+    """
+    return single_flight(
+        f"monthly_horoscope:{zodiac_sign.pk}:{year}-{month:02d}:{language}",
+        lambda: _generate_monthly_horoscope(zodiac_sign, year, month, language),
+        result_timeout=300
+    )
 
-{zodiac_sign.name} burcu için {month_names[month]} {year} ayı burç yorumu yap.
 
-Burç Özellikleri:
-- Element: {zodiac_sign.element}
-- Yöneten Gezegen: {zodiac_sign.ruling_planet}
-- Karakteristik: {zodiac_sign.traits[:150]}
-
-Aşağıdaki başlıklar altında kapsamlı yorumla:
-
-1. GENEL: Aylık genel enerji ve trendler (5-6 cümle)
-2. AŞK: Aşk hayatı, flört ve ilişkiler (5-6 cümle)
-3. KARİYER: İş hayatı, projeler ve fırsatlar (5-6 cümle)
-4. SAĞLIK: Fiziksel ve mental sağlık durumu (4-5 cümle)
-5. FİNANS: Ekonomik durum, gelir ve giderler (4-5 cümle)
-6. ÖNEMLİ TARİHLER: Ayın kritik günleri ve olayları (3-4 cümle)
-7. TAVSİYELER: Ay boyunca yapılması gerekenler (3-4 cümle)
-
-Her başlığı büyük harfle yaz. Detaylı, içgörü dolu ve faydalı ol."""
-
-        response = ai_service.generate_interpretation(
-            question=prompt,
-            cards=[],
-            spread_name="Aylık Burç"
-        )
+def _generate_monthly_horoscope(zodiac_sign, year, month, language='tr'):
+    try:
+        existing = MonthlyHoroscope.objects.filter(
+            zodiac_sign=zodiac_sign,
+            year=year,
+            month=month,
+            language=language
+        ).first()
+        if existing:
+            return existing
         
-        sections = parse_horoscope_response(response)
+        result = ZodiacAIService().generate_monthly_horoscope(zodiac_sign, year, month, language)
         
-        horoscope = MonthlyHoroscope.objects.create(
+        horoscope, _ = MonthlyHoroscope.objects.get_or_create(
             zodiac_sign=zodiac_sign,
             year=year,
             month=month,
-            general=sections.get('GENEL', 'Bu ay sizin için bereketli olacak.'),
-            love=sections.get('AŞK', 'Aşk hayatınızda yeni başlangıçlar.'),
-            career=sections.get('KARİYER', 'Kariyerinizde önemli gelişmeler yaşanabilir.'),
-            health=sections.get('SAĞLIK', 'Sağlığınıza dikkat edin.'),
-            money=sections.get('FİNANS', 'Finansal durumunuz dengeli seyredecek.'),
-            important_dates=sections.get('ÖNEMLİ TARİHLER', 'Ay ortası önemli.'),
-            advice=sections.get('TAVSİYELER', 'Sabırlı ve planlı olun.'),
-            ai_provider='gemini'
+            language=language,
+            defaults=result
         )
         
         return horoscope
         
     except Exception as e:
-        print(f"Monthly horoscope generation error: {e}")
+        logger.error(f"❌ Monthly horoscope generation error for {zodiac_sign.name}: {e}")
         return None
@@ -16,6 +16,8 @@ from .models import (
     PersonalHoroscope
 )
 from tarot.services import AIService
+from tarot.async_utils import async_login_required, arender
+from tarot import jobs
 from .astronomy import AstronomyService
 
 logger = logging.getLogger(__name__)
@@ -38,8 +40,9 @@ def moon_sign_calculator(request):
             
             # Swiss Ephemeris ile gerçek hesaplama
             astro_service = AstronomyService()
+            lat, lon, tz = astro_service.get_location(birth_place)
             moon_zodiac = astro_service.calculate_moon_sign(
-                birth_date=date_obj,
+                birth_date=astro_service.to_universal_time(date_obj, tz),
                 birth_place=birth_place
             )
             
@@ -81,8 +84,8 @@ temsil eder.
                 birth_date=date_obj.date(),
                 birth_time=datetime.strptime(birth_time, '%H:%M').time() if birth_time else None,
                 birth_place=birth_place,
-                latitude=41.0082,  # Örnek: İstanbul
-                longitude=28.9784,
+                latitude=lat,
+                longitude=lon,
                 moon_sign=moon_zodiac,
                 interpretation=interpretation
             )
@@ -128,12 +131,12 @@ def ascendant_calculator(request):
             # Swiss Ephemeris ile gerçek hesaplama
             astro_service = AstronomyService()
             
-            # Koordinatları al
-            lat, lon = astro_service.get_coordinates(birth_place)
+            # Koordinatları ve saat dilimini al
+            lat, lon, tz = astro_service.get_location(birth_place)
             
-            # Yükselen burcu hesapla
+            # Yükselen burcu hesapla (girilen saat doğum yerinin yerel saatidir)
             ascendant_zodiac = astro_service.calculate_ascendant(
-                birth_date=date_obj,
+                birth_date=astro_service.to_universal_time(date_obj, tz),
                 latitude=lat,
                 longitude=lon
             )
@@ -201,10 +204,75 @@ temsil eder.
     return render(request, 'zodiac/ascendant.html', context)
 
 
-@login_required
-def birth_chart(request):
-    """Doğum Haritası Oluşturma"""
+def _calculate_birth_chart_positions(date_obj, birth_place):
+    """
+    Doğum haritasının astronomik kısmı (harita motoru + geocoding)
+    Yalnızca doğum haritası işi (AIJob) içinden, senkron çağrılır.
+    
+    Returns:
+        dict veya hata durumunda (None, hata mesajı)
+    """
+    astro_service = AstronomyService()
+    
+    # Koordinatları ve saat dilimini al
+    lat, lon, tz = astro_service.get_location(birth_place)
+    
+    # Güneş Burcu (yerel doğum tarihinden)
+    sun_sign = ZodiacSign.get_sign_by_date(date_obj.month, date_obj.day)
+    
+    if not sun_sign:
+        return None, 'Güneş burcu hesaplanamadı. Lütfen geçerli bir tarih girin.'
+    
+    # Efemeris ve evler UT ister; girilen saat doğum yerinin yerel saatidir
+    ut = astro_service.to_universal_time(date_obj, tz)
+    
+    # Tam harita (gezegenler, evler, açılar); Ay ve Yükselen de buradan gelir
+    chart = astro_service.calculate_chart(ut, lat, lon)
+    
+    if chart:
+        signs = astro_service.signs_by_order()
+        moon_sign = signs.get(chart.planet_positions['moon']['sign'])
+        ascendant_sign = signs.get(chart.house_positions['whole_sign'][0])
+    else:
+        # Ay Burcu (Swiss Ephemeris)
+        moon_sign = astro_service.calculate_moon_sign(
+            birth_date=ut,
+            birth_place=birth_place
+        )
+        
+        # Yükselen Burç (Swiss Ephemeris)
+        ascendant_sign = astro_service.calculate_ascendant(
+            birth_date=ut,
+            latitude=lat,
+            longitude=lon
+        )
+    
+    if not moon_sign or not ascendant_sign:
+        return None, '❌ Burç hesaplamaları yapılamadı. Lütfen bilgileri kontrol edin.'
+    
+    planets = astro_service.calculate_all_planets(ut, lat, lon, chart=chart)
+    
+    return {
+        'latitude': lat,
+        'longitude': lon,
+        'sun_sign': sun_sign,
+        'moon_sign': moon_sign,
+        'ascendant_sign': ascendant_sign,
+        'chart': chart,
+        'planets_info': astro_service.get_planet_info_for_ai(planets, chart.aspects if chart else None),
+    }, None
+
+
+@async_login_required
+async def birth_chart(request):
+    """
+    Doğum Haritası Oluşturma
+    
+    Hesaplama ve AI analizi arka plan işi olarak kuyruğa alınır; sayfa işin
+    durumunu sorgular ve bitince ?chart=<id> ile haritayı gösterir.
+    """
     chart = None
+    pending_job = None
     
     if request.method == 'POST':
         try:
@@ -221,133 +289,30 @@ def birth_chart(request):
             date_str = f"{birth_date} {birth_time}"
             date_obj = datetime.strptime(date_str, '%Y-%m-%d %H:%M')
             
-            # Swiss Ephemeris ile gerçek hesaplama
-            astro_service = AstronomyService()
-            
-            # Koordinatları al
-            lat, lon = astro_service.get_coordinates(birth_place)
-            
-            # Güneş Burcu (doğum tarihinden)
-            sun_sign = ZodiacSign.get_sign_by_date(date_obj.month, date_obj.day)
-            
-            if not sun_sign:
-                messages.error(request, 'Güneş burcu hesaplanamadı. Lütfen geçerli bir tarih girin.')
-                return redirect('zodiac:birth_chart')
-            
-            # Ay Burcu (Swiss Ephemeris)
-            moon_sign = astro_service.calculate_moon_sign(
-                birth_date=date_obj,
-                birth_place=birth_place
-            )
-            
-            # Yükselen Burç (Swiss Ephemeris)
-            ascendant_sign = astro_service.calculate_ascendant(
-                birth_date=date_obj,
-                latitude=lat,
-                longitude=lon
-            )
-            
-            if not moon_sign or not ascendant_sign:
-                messages.error(request, '❌ Burç hesaplamaları yapılamadı. Lütfen bilgileri kontrol edin.')
-                return redirect('zodiac:birth_chart')
-            
-            # Tüm gezegenleri hesapla
-            planets = astro_service.calculate_all_planets(date_obj, lat, lon)
-            planets_info = astro_service.get_planet_info_for_ai(planets)
-            
-            # AI ile kapsamlı analiz
-            ai_service = AIService()
-            
-            # Kişilik Analizi
-            personality_prompt = f"""Sen profesyonel bir astrologsun.
-
-Kişi Bilgileri:
-- Güneş Burcu: {sun_sign.name}
-- Ay Burcu: {moon_sign.name}
-- Yükselen Burç: {ascendant_sign.name}
-
-{planets_info}
-
-Bu doğum haritasına göre kişinin genel karakterini ve kişiliğini detaylı analiz et.
-Güneş, Ay ve Yükselen burcun yanı sıra diğer gezegenlerin etkilerini de dikkate al.
-3-4 paragraf yaz."""
-
-            personality = ai_service.generate_interpretation(
-                question=personality_prompt,
-                cards=[],
-                spread_name="Kişilik Analizi"
+            pending_job = await jobs.aenqueue(
+                'zodiac.birth_chart',
+                payload={
+                    'user_id': request.user.pk,
+                    'name': name,
+                    'birth_datetime': date_obj.isoformat(),
+                    'birth_place': birth_place,
+                },
+                key=f"birth_chart:{request.user.pk}:{date_obj.isoformat()}:{birth_place}",
+                user=request.user
             )
             
-            # Duygusal Analiz
-            emotional_prompt = f"""Ay Burcu {moon_sign.name} olan bu kişinin duygusal yapısını analiz et.
-2-3 paragraf yaz."""
-
-            emotional = ai_service.generate_interpretation(
-                question=emotional_prompt,
-                cards=[],
-                spread_name="Duygusal Analiz"
-            )
-            
-            # Kariyer Analizi
-            career_prompt = f"""Güneş Burcu {sun_sign.name} ve Yükselen {ascendant_sign.name} olan bu kişinin kariyer yönelimlerini analiz et.
-2-3 paragraf yaz."""
-
-            career = ai_service.generate_interpretation(
-                question=career_prompt,
-                cards=[],
-                spread_name="Kariyer Analizi"
-            )
-            
-            # İlişki Analizi
-            relationship_prompt = f"""Bu kişinin ilişki stilini ve aşk hayatını analiz et.
-Güneş: {sun_sign.name}, Ay: {moon_sign.name}
-2-3 paragraf yaz."""
-
-            relationship = ai_service.generate_interpretation(
-                question=relationship_prompt,
-                cards=[],
-                spread_name="İlişki Analizi"
-            )
-            
-            # Yaşam Yolu
-            life_path_prompt = f"""Bu doğum haritasına göre kişinin yaşam yolu ve misyonunu analiz et.
-2-3 paragraf yaz."""
-
-            life_path = ai_service.generate_interpretation(
-                question=life_path_prompt,
-                cards=[],
-                spread_name="Yaşam Yolu"
-            )
-            
-            # Doğum haritasını kaydet
-            chart = BirthChart.objects.create(
-                user=request.user,
-                name=name,
-                birth_date=date_obj.date(),
-                birth_time=date_obj.time(),
-                birth_place=birth_place,
-                latitude=lat,
-                longitude=lon,
-                sun_sign=sun_sign,
-                moon_sign=moon_sign,
-                rising_sign=ascendant_sign,
-                personality_analysis=personality,
-                emotional_analysis=emotional,
-                career_analysis=career,
-                relationship_analysis=relationship,
-                life_path_analysis=life_path,
-                planet_positions={},
-                house_positions={},
-                aspects={},
-                ai_provider='openai'
-            )
-            
-            messages.success(request, f'✨ Doğum haritanız oluşturuldu!')
+            messages.info(request, '✨ Doğum haritanız hazırlanıyor, birkaç saniye sürebilir.')
             
         except Exception as e:
             messages.error(request, f'Oluşturma hatası: {str(e)}')
             logger.error(f"Doğum haritası hatası: {e}")
     
+    elif request.GET.get('chart', '').isdigit():
+        chart = await BirthChart.objects.filter(
+            user=request.user,
+            pk=request.GET['chart']
+        ).select_related('sun_sign', 'moon_sign', 'rising_sign').afirst()
+    
     # Geçmiş haritalar
     past_charts = BirthChart.objects.filter(
         user=request.user
@@ -356,6 +321,7 @@ Güneş: {sun_sign.name}, Ay: {moon_sign.name}
     context = {
         'title': 'Doğum Haritası',
         'chart': chart,
+        'pending_job': pending_job,
         'past_charts': past_charts,
     }
-    return render(request, 'zodiac/birth_chart.html', context)
+    return await arender(request, 'zodiac/birth_chart.html', context)
@@ -14,6 +14,8 @@ from .models import (
     UserMonthlyHoroscope, PersonalHoroscope
 )
 from .services import ZodiacAIService
+from tarot import jobs
+from tarot.models import AIJob
 
 logger = logging.getLogger(__name__)
 
@@ -37,29 +39,32 @@ def my_daily_horoscope(request):
         date=today
     ).first()
     
-    # Yoksa ve kullanıcı istiyorsa oluştur
+    # Yoksa ve kullanıcı istiyorsa arka planda oluştur
     can_generate = daily_horoscope is None
+    job_key = f"user_daily_horoscope:{request.user.pk}:{today.isoformat()}"
+    pending_job = None
     
-    if request.method == 'POST' and can_generate:
+    if can_generate:
+        pending_job = AIJob.objects.filter(
+            user=request.user,
+            key=job_key,
+            status__in=AIJob.ACTIVE_STATUSES
+        ).first()
+    
+    if request.method == 'POST' and can_generate and not pending_job:
         try:
-            ai_service = ZodiacAIService()
-            horoscope_data = ai_service.generate_daily_horoscope(user_sign, today)
-            
-            # get_or_create kullan - race condition'ı önle
-            daily_horoscope, created = UserDailyHoroscope.objects.get_or_create(
-                user=request.user,
-                date=today,
-                defaults={
-                    'zodiac_sign': user_sign,
-                    **horoscope_data
-                }
+            pending_job = jobs.enqueue(
+                'zodiac.user_daily_horoscope',
+                payload={
+                    'user_id': request.user.pk,
+                    'sign_id': user_sign.pk,
+                    'date': today.isoformat(),
+                },
+                key=job_key,
+                user=request.user
             )
-            
-            if created:
-                messages.success(request, f'🌟 {user_sign.name} burcunuz için günlük yorum oluşturuldu!')
-                logger.info(f"Günlük yorum oluşturuldu: {request.user.username} - {user_sign.name}")
-            else:
-                messages.info(request, f'Bu tarih için zaten bir yorum var.')
+            messages.info(request, f'🌟 {user_sign.name} burcunuz için günlük yorum hazırlanıyor...')
+            return redirect('zodiac:my_daily_horoscope')
             
         except Exception as e:
             messages.error(request, f'Yorum oluşturulurken hata: {str(e)}')
@@ -70,6 +75,7 @@ def my_daily_horoscope(request):
         'user_sign': user_sign,
         'daily_horoscope': daily_horoscope,
         'can_generate': can_generate,
+        'pending_job': pending_job,
         'date': today,
     }
     return render(request, 'zodiac/my_daily_horoscope.html', context)